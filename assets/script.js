@@ -103,272 +103,220 @@ function initSearchFunctionality() {
     }
 }
 
-// Function to get articles database based on current language
-function getArticlesDatabase() {
-    const currentPath = window.location.pathname;
-    
-    // Spanish articles database
-    const spanishArticles = [
-    {
-        title: "Resistentes y con Estilo: Las Mejores Mochilas para Tu Día a Día 2025",
-        description: "Descubre por qué invertir en una mochila de alta calidad es esencial. Guía completa con las mejores mochilas resistentes y estilosas para el uso diario.",
-        category: "Mochilas",
-        url: "/articulos/resistentes-estilo-mejores-mochilas-dia-dia-2025.html",
-        image: "../photos/LOVEVOOK%20Laptop%20Backpack%20for%20Women%2015.6in%20Computer%20Backpacks%20Dark%20Green.jpg",
-        date: "30 Enero 2025",
-        tags: ["mochilas", "calidad", "resistente", "día a día", "durabilidad", "protección", "comodidad", "organización", "versatilidad", "LOVEVOOK", "SwissGear", "The North Face", "TSA", "FlexVent", "2025"]
-    },
-    {
-        title: "Los 10 Mejores Bolsos de Mano 2025",
-        description: "Descubre los bolsos más elegantes y funcionales del año. Desde opciones de lujo hasta alternativas asequibles.",
-        category: "Bolsos de Mano",
-                    url: "/articulos/como-elegir-bolso-mano-perfecto-2025.html",
-        image: "https://images.unsplash.com/photo-1548036328-c9fa89d128fa?w=400&h=250&fit=crop",
-        date: "15 Enero 2025",
-        tags: ["bolsos", "mano", "elegantes", "lujo", "funcionales", "2025"]
-    },
-    {
-        title: "Cómo Elegir el Bolso de Mano Perfecto para Cada Ocasión 2025",
-        description: "Guía completa para elegir el bolso ideal según la ocasión: bodas, cenas, oficina y viajes. Recomendaciones expertas con enlaces de compra.",
-        category: "Bolsos de Mano",
-        url: "/articulos/como-elegir-bolso-mano-perfecto-2025.html",
-        image: "https://images.unsplash.com/photo-1548036328-c9fa89d128fa?w=400&h=250&fit=crop",
-        date: "20 Enero 2025",
-        tags: ["bolsos", "mano", "guía", "ocasiones", "bodas", "cenas", "oficina", "viajes", "2025"]
-    },
-    {
-        title: "Mochilas para Laptop: Protección y Estilo 2025",
-        description: "Descubre las mejores mochilas para laptop con protección antirrobo, puertos USB y diseño TSA. Guía completa con reseñas detalladas.",
-        category: "Mochilas",
-        url: "/articulos/mochilas-para-laptop-proteccion-estilo-2025.html",
-        image: "../photos/VOLHER%20Laptop%20Backpack,Business%20Travel%20Anti%20Theft%20Slim%20Durable%20Laptops%20Backpack%20with%20USB%20Charging%20Port,Water%20Resistant.jpg",
-        date: "25 Enero 2025",
-        tags: ["mochilas", "laptop", "antirrobo", "USB", "TSA", "protección", "2025"]
-    },
-    {
-        title: "3 Tote Bags Populares en Amazon 2025",
-        description: "Descubre las 3 tote bags más populares en Amazon 2025. Guía completa con reseñas detalladas, comparativas y enlaces de compra.",
-        category: "Tote Bags",
-        url: "/articulos/3-tote-bags-populares-amazon-2025.html",
-        image: "../photos/BAGSMART%20Tote%20Bag%20for%20Women,%20Foldable%20Tote%20Bag%20With%20Zipper%20Travel%20Large%20Shoulder%20Bag%20Handbag%20for%20Work.jpg",
-        date: "30 Enero 2025",
-        tags: ["tote bags", "amazon", "populares", "compras", "sostenible", "2025"]
-    },
-    {
-        title: "Los 3 Mejores Bolsos de Mano para Bodas 2025: Elegancia y Estilo",
-        description: "Descubre los 3 mejores bolsos de mano para bodas 2025. Guía completa con reseñas detalladas, comparativas y enlaces de compra para encontrar el bolso perfecto para tu día especial.",
-        category: "Bolsos de Mano",
-        url: "/articulos/mejores-bolsos-mano-bodas-2025.html",
-        image: "../photos/CHARMING%20TAILOR%20Classic%20Satin%20Clutch%20Bag%20Handbag.jpg",
-        date: "30 Enero 2025",
-        tags: ["bolsos de mano", "bodas", "clutch", "elegante", "satin", "2025", "novia", "eventos"]
-    },
-    {
-        title: "3 Mochilas Profesionales Estilosas 2025: Elegancia y Funcionalidad",
-        description: "Descubre las 3 mochilas profesionales más estilosas para mujeres 2025. Guía completa con reseñas detalladas, comparativas y enlaces de compra para encontrar la mochila perfecta para tu trabajo y estilo.",
-        category: "Mochilas",
-        url: "/articulos/3-mochilas-profesionales-estilosas-2025.html",
-        image: "../photos/LOVEVOOK%20Anti%20Theft%20Slim%20Backpack%20for%20Women,%20Fit%2015.6%20Inch%20Laptop%20Beige-Khaqi.jpg",
-        date: "30 Enero 2025",
-        tags: ["mochilas", "profesionales", "estilosas", "laptop", "trabajo", "2025", "elegante", "funcional"]
-    },
-    {
-        title: "3 Bolsos de Pañales Funcionales para Mamás 2025: Organización y Estilo",
-        description: "Descubre los 3 mejores bolsos de pañales funcionales para mamás 2025. Guía completa con reseñas detalladas, comparativas y enlaces de compra para mantener todo organizado con tu bebé.",
-        category: "Tote Bags",
-        url: "/articulos/3-bolsos-panales-funcionales-mamas-2025.html",
-        image: "../photos/Diaper%20Bag%20Tote%20Large%20Tote%20Baby%20Bag%20Boy%20Diaper%20Bag%20Stylish%20Girl%20Diaper%20Ba%20Shoulder%20Mommy%20Bag.jpg",
-        date: "30 Enero 2025",
-        tags: ["bolsos de pañales", "mamás", "bebés", "organización", "funcional", "2025", "tote bags", "diaper bag"]
-    },
-    {
-        title: "3 Tote Bags Reutilizables para Compras 2025: Sostenibilidad y Estilo",
-        description: "Descubre las 3 mejores tote bags reutilizables para compras 2025. Guía completa con reseñas detalladas, comparativas y enlaces de compra para reducir tu huella ambiental mientras mantienes el estilo.",
-        category: "Tote Bags",
-        url: "/articulos/3-tote-bags-reutilizables-compras-2025.html",
-        image: "../photos/Nook%20Theory%20Reusable%20Insulated%20Grocery%20Bag%20-%20Leak%20Proof,%20X%20Large%20Insulated%20Cooler%20Bag%20-%20Insulated%20Shopping%20Bags%20for%20Groceries%20-%20Travel%20Cooler%20Bag%20for%20Frozen.jpg",
-        date: "30 Enero 2025",
-        tags: ["tote bags", "reutilizables", "compras", "sostenible", "ecológico", "2025", "grocery", "aisladas"]
-    },
+// Article catalogue for search and suggestions, generated per language by
+// tools/build_search_index.py and fetched the first time it is needed. The
+// files have content-hashed names (cached forever); the search manifest, which
+// is always revalidated, says which one is current
+const SEARCH_SHARDS_URL = '/search-shards/';
+let articlesDatabase = [];
+let articlesIndex = null;
+let articlesFuzzyIndex = null;
+let articlesDatabasePromise = null;
 
-    {
-        title: "Top 5 Carteras para Mujeres Profesionales 2025",
-        description: "Selección rápida con foco en durabilidad, organización y precio. Perfectas para la oficina y uso diario.",
-        category: "Carteras",
-        url: "/articulos/top-5-carteras-mujeres-profesionales-2025.html",
-        image: "/assets/images/toughergun-wallet.jpg",
-        date: "15 Enero 2025",
-        tags: ["carteras", "profesionales", "mujeres", "elegancia", "funcionalidad", "oficina", "2025"]
-    },
-    {
-        title: "Bolsos Casual Elegantes y Asequibles Perfectos para Invitadas de Boda 2025",
-        description: "Descubre los mejores bolsos casual elegantes y asequibles perfectos para invitadas de boda. Guía completa con reseñas detalladas y enlaces de compra para opciones elegantes y económicas.",
-        category: "Bolsos de Mano",
-        url: "/articulos/bolsos-casual-elegantes-asequibles-invitadas-bodas-2025.html",
-        image: "/photos/KKXIU Women Faux Leather Envelope Clutch Purse Foldover Bags.jpg",
-        date: "18 Septiembre 2025",
-        tags: ["bolsos de mano", "invitadas de boda", "asequibles", "elegantes", "casual", "clutch", "económicos", "2025"]
+function loadArticlesDatabase() {
+    if (!articlesDatabasePromise) {
+        const currentPath = window.location.pathname;
+        const language = currentPath.startsWith('/es/') || currentPath === '/es' ? 'es' : 'en';
+        articlesDatabasePromise = fetch(SEARCH_SHARDS_URL + 'manifest.json')
+            .then(response => response.ok ? response.json() : {})
+            .then(manifest => {
+                const entry = (manifest.articles || {})[language];
+                if (!entry) return {};
+                return fetch(SEARCH_SHARDS_URL + entry.file)
+                    .then(response => response.ok ? response.json() : {});
+            })
+            .catch(() => ({}))
+            .then(data => {
+                articlesDatabase = data.items || [];
+                articlesIndex = data.index || null;
+                articlesFuzzyIndex = data.fuzzy || null;
+                return articlesDatabase;
+            });
     }
-    ];
+    return articlesDatabasePromise;
+}
+
+// ===== RANKING (BM25F) =====
+// Mirrors rank() in tools/search_engine.py: every posting of the precomputed
+// inverted index carries its final BM25F score, so a query only sums the
+// scores of its terms and keeps the best k in a small heap
+const SEARCH_TOP_K = 20;
+const SEARCH_PREFIX_WEIGHT = 0.6;
+// Typo tolerance (fuzzy_terms() in tools/search_engine.py)
+const FUZZY_MIN_LENGTH = 4;
+const FUZZY_TWO_EDITS_LENGTH = 8;
+const FUZZY_GRAMS_PER_EDIT = 4;
+const FUZZY_EXPANSIONS = 3;
+const FUZZY_WEIGHT = 0.5;
+// Index terms are accent-folded and plural-stemmed (stem() in tools/search_engine.py),
+// so a query is normalised once here instead of the catalogue on every keystroke
+const STEM_MIN_LENGTH = 4;
+const STEM_KEEP_ENDINGS = ['ss', 'us', 'is'];
+const STEM_ES_AFTER = ['x', 'z', 'ch', 'sh', 'ss'];
+
+function foldSearchText(text) {
+    return text.toLowerCase().normalize('NFKD').replace(/\p{M}/gu, '');
+}
+
+function stemSearchTerm(term) {
+    if (Array.from(term).length < STEM_MIN_LENGTH || !/^\p{L}+$/u.test(term) || !term.endsWith('s')) return term;
+    if (term.endsWith('ies') && Array.from(term).length > STEM_MIN_LENGTH) return term.slice(0, -3) + 'y';
+    if (term.endsWith('iones')) return term.slice(0, -2);
+    if (term.endsWith('es') && STEM_ES_AFTER.some(end => term.slice(0, -2).endsWith(end))) return term.slice(0, -2);
+    if (STEM_KEEP_ENDINGS.some(end => term.endsWith(end))) return term;
+    return term.slice(0, -1);
+}
+
+function searchTokens(text) {
+    return (foldSearchText(text).match(/[\p{L}\p{N}_]+/gu) || []).map(stemSearchTerm);
+}
+
+// Ids of the items matching every query term as a word prefix (query_inverted_index())
+function matchSearch(index, query) {
+    let ids = null;
+    new Set(searchTokens(query)).forEach(term => {
+        const found = new Set();
+        expandSearchTerm(index, term).forEach(match => index.terms[match].forEach(id => found.add(id)));
+        ids = ids === null ? found : new Set([...ids].filter(id => found.has(id)));
+    });
+    return ids ? [...ids].sort((a, b) => a - b) : [];
+}
+
+function expandSearchTerm(index, term) {
+    const size = index.prefixLength || 2;
+    const bucket = term.length >= size
+        ? (index.prefixes[term.slice(0, size)] || [])
+        : Object.keys(index.terms);
+    return bucket.filter(t => t.startsWith(term));
+}
+
+// [id, score] pairs: higher score first, then lower id (newer item)
+function rankedBefore(a, b) {
+    return a[1] > b[1] || (a[1] === b[1] && a[0] < b[0]);
+}
 
-    // English articles database
-    const englishArticles = [
-        {
-            title: "How to Choose the Perfect Handbag 2025",
-            description: "Discover how to select the ideal bag according to the occasion. From special events to daily life, we guide you to find the perfect option that combines style, functionality and versatility.",
-            category: "Handbags",
-            url: "/articles/how-to-choose-perfect-handbag-2025.html",
-            image: "/photos/The Sak Sequoia Women's Hobo Handbag Purse.jpg",
-            date: "January 15, 2025",
-            tags: ["handbags", "guide", "occasions", "style", "functionality", "versatility", "2025"]
-        },
-        {
-            title: "3 Stylish Professional Backpacks 2025",
-            description: "Discover the best professional backpacks that combine elegance and functionality. Perfect for work, travel, and everyday use with modern designs and practical features.",
-            category: "Backpacks",
-            url: "/articles/3-stylish-professional-backpacks-2025.html",
-            image: "/photos/LOVEVOOK Laptop Backpack for Women 15.6in Computer Backpacks Dark Green.jpg",
-            date: "January 12, 2025",
-            tags: ["backpacks", "professional", "elegant", "functional", "work", "travel", "2025"]
-        },
-        {
-            title: "Top 5 Professional Women Wallets 2025",
-            description: "Choosing the right wallet not only adds style, it also provides organization and durability. Here we present our recommendations based on functionality, price and elegance.",
-            category: "Wallets",
-            url: "/articles/top-5-professional-women-wallets-2025.html",
-            image: "/photos/COACH Small Wristlet.jpg",
-            date: "January 15, 2025",
-            tags: ["wallets", "professional", "women", "elegance", "functionality", "office", "2025"]
-        },
-        {
-            title: "Best Durable and Stylish Backpacks 2025",
-            description: "Discover why investing in a high-quality backpack is essential. Complete guide with the best durable and stylish backpacks for daily use.",
-            category: "Backpacks",
-            url: "/articles/best-durable-stylish-backpacks-2025.html",
-            image: "/photos/LOVEVOOK Laptop Backpack for Women 15.6in Computer Backpacks Dark Green.jpg",
-            date: "January 30, 2025",
-            tags: ["backpacks", "quality", "durable", "daily use", "durability", "protection", "comfort", "organization", "versatility", "2025"]
-        },
-        {
-            title: "Best Lightweight Travel Backpacks 2025",
-            description: "Perfect for adventure and travel. Lightweight, spacious and with all the necessary compartments for your trips.",
-            category: "Backpacks",
-            url: "/articles/best-lightweight-travel-backpacks-2025.html",
-            image: "/photos/LOVEVOOK Laptop Backpack for Women 15.6in Computer Backpacks Dark Green.jpg",
-            date: "January 25, 2025",
-            tags: ["backpacks", "travel", "lightweight", "adventure", "spacious", "compartments", "2025"]
-        },
-        {
-            title: "Best Wedding Handbags 2025",
-            description: "Discover the 3 best handbags for weddings 2025. Complete guide with detailed reviews, comparisons and purchase links to find the perfect bag for your special day.",
-            category: "Handbags",
-            url: "/articles/best-wedding-handbags-2025.html",
-            image: "/photos/CHARMING TAILOR Classic Satin Clutch Bag Handbag.jpg",
-            date: "January 30, 2025",
-            tags: ["handbags", "weddings", "clutch", "elegant", "satin", "2025", "bride", "events"]
-        },
-        {
-            title: "Fun and Unique Gift Wallets 2025",
-            description: "Perfect gifts for any occasion. Unique and fun wallet designs that will surprise your loved ones.",
-            category: "Wallets",
-            url: "/articles/fun-unique-gift-wallets-2025.html",
-            image: "/photos/COACH Small Wristlet.jpg",
-            date: "January 20, 2025",
-            tags: ["wallets", "gifts", "unique", "fun", "designs", "surprise", "2025"]
-        },
-        {
-            title: "Minimalist Daily Bag 2025",
-            description: "The perfect balance between style and functionality. Minimalist designs for everyday use.",
-            category: "Handbags",
-            url: "/articles/minimalist-daily-bag-2025.html",
-            image: "/photos/The Sak Sequoia Women's Hobo Handbag Purse.jpg",
-            date: "January 18, 2025",
-            tags: ["handbags", "minimalist", "daily", "style", "functionality", "design", "2025"]
-        },
-        {
-            title: "Travel Light Adventure Bags 2025",
-            description: "Essential bags for your adventures. Light, resistant and with all the necessary features for outdoor activities.",
-            category: "Backpacks",
-            url: "/articles/travel-light-adventure-bags-2025.html",
-            image: "/photos/LOVEVOOK Laptop Backpack for Women 15.6in Computer Backpacks Dark Green.jpg",
-            date: "January 22, 2025",
-            tags: ["backpacks", "travel", "adventure", "light", "resistant", "outdoor", "activities", "2025"]
-        },
-        {
-            title: "Laptop Backpacks: Protection and Style 2025",
-            description: "Discover the best laptop backpacks with anti-theft protection, USB ports and TSA design. Complete guide with detailed reviews.",
-            category: "Backpacks",
-            url: "/articles/laptop-backpacks-protection-style-2025.html",
-            image: "/photos/VOLHER Laptop Backpack,Business Travel Anti Theft Slim Durable Laptops Backpack with USB Charging Port,Water Resistant.jpg",
-            date: "January 25, 2025",
-            tags: ["backpacks", "laptop", "anti-theft", "USB", "TSA", "protection", "2025"]
-        },
-        {
-            title: "3 Popular Amazon Tote Bags 2025",
-            description: "Discover the 3 most popular tote bags on Amazon 2025. Complete guide with detailed reviews, comparisons and purchase links.",
-            category: "Tote Bags",
-            url: "/articles/3-popular-amazon-tote-bags-2025.html",
-            image: "/photos/BAGSMART Tote Bag for Women, Foldable Tote Bag With Zipper Travel Large Shoulder Bag Handbag for Work.jpg",
-            date: "January 30, 2025",
-            tags: ["tote bags", "amazon", "popular", "shopping", "sustainable", "2025"]
-        },
-        {
-            title: "3 Functional Diaper Bags for Moms 2025",
-            description: "Discover the 3 best functional diaper bags for moms 2025. Complete guide with detailed reviews, comparisons and purchase links to keep everything organized with your baby.",
-            category: "Tote Bags",
-            url: "/articles/3-functional-diaper-bags-moms-2025.html",
-            image: "/photos/Diaper Bag Tote Large Tote Baby Bag Boy Diaper Bag Stylish Girl Diaper Ba Shoulder Mommy Bag.jpg",
-            date: "January 30, 2025",
-            tags: ["diaper bags", "moms", "babies", "organization", "functional", "2025", "tote bags"]
-        },
-        {
-            title: "3 Reusable Shopping Tote Bags 2025",
-            description: "Discover the 3 best reusable tote bags for shopping 2025. Complete guide with detailed reviews, comparisons and purchase links to reduce your environmental footprint while maintaining style.",
-            category: "Tote Bags",
-            url: "/articles/3-reusable-shopping-tote-bags-2025.html",
-            image: "/photos/Nook Theory Reusable Insulated Grocery Bag - Leak Proof, X Large Insulated Cooler Bag - Insulated Shopping Bags for Groceries - Travel Cooler Bag for Frozen.jpg",
-            date: "January 30, 2025",
-            tags: ["tote bags", "reusable", "shopping", "sustainable", "eco-friendly", "2025", "grocery", "insulated"]
-        },
-        {
-            title: "3 RFID Security Wallets 2025",
-            description: "Protect your cards with RFID blocking technology. Secure and stylish wallets for modern life.",
-            category: "Wallets",
-            url: "/articles/3-rfid-security-wallets-2025.html",
-            image: "/photos/COACH Small Wristlet.jpg",
-            date: "January 28, 2025",
-            tags: ["wallets", "RFID", "security", "protection", "cards", "technology", "2025"]
-        },
-        {
-            title: "3 Wristlet Wallets for Women 2025",
-            description: "Compact and elegant wristlet wallets perfect for essentials. Small but powerful for your daily needs.",
-            category: "Wallets",
-            url: "/articles/3-wristlet-wallets-women-2025.html",
-            image: "/photos/COACH Small Wristlet.jpg",
-            date: "January 26, 2025",
-            tags: ["wallets", "wristlet", "women", "compact", "elegant", "essentials", "2025"]
-        },
-        {
-            title: "Affordable & Elegant Casual Handbags Perfect for Wedding Guest 2025",
-            description: "Discover the best affordable and elegant casual handbags perfect for wedding guests. Complete guide with detailed reviews and purchase links for stylish yet budget-friendly options.",
-            category: "Handbags",
-            url: "/articles/affordable-elegant-casual-handbags-wedding-guest-2025.html",
-            image: "/photos/Y2k Shoulder Bag Red Patent Leather Purse For Women Small Vintage Handbag Burgundy Hobo Bags Faux Leather Underarm1.jpg",
-            date: "September 18, 2025",
-            tags: ["handbags", "wedding guest", "affordable", "elegant", "casual", "clutch", "budget-friendly", "2025"]
+function topK(totals, k) {
+    // Min-heap whose root is the weakest result kept so far
+    const heap = [];
+    totals.forEach((score, id) => {
+        const entry = [id, score];
+        if (heap.length < k) {
+            heap.push(entry);
+            let i = heap.length - 1;
+            while (i > 0) {
+                const parent = (i - 1) >> 1;
+                if (!rankedBefore(heap[parent], heap[i])) break;
+                [heap[parent], heap[i]] = [heap[i], heap[parent]];
+                i = parent;
+            }
+        } else if (k > 0 && rankedBefore(entry, heap[0])) {
+            heap[0] = entry;
+            let i = 0;
+            for (;;) {
+                const left = 2 * i + 1;
+                const right = left + 1;
+                let weakest = i;
+                if (left < heap.length && rankedBefore(heap[weakest], heap[left])) weakest = left;
+                if (right < heap.length && rankedBefore(heap[weakest], heap[right])) weakest = right;
+                if (weakest === i) break;
+                [heap[weakest], heap[i]] = [heap[i], heap[weakest]];
+                i = weakest;
+            }
         }
-    ];
+    });
+    return heap.sort((a, b) => rankedBefore(a, b) ? -1 : 1);
+}
 
-    // Return appropriate database based on current path
-    if (currentPath.startsWith('/es/') || currentPath === '/es' || currentPath === '/es/') {
-        return spanishArticles;
-    } else {
-        return englishArticles;
+// Trigrams of a term padded with ^ and $ ("^os", "osp", ..., "ey$")
+function searchTrigrams(term) {
+    const padded = Array.from('^' + term + '$');
+    const grams = [];
+    for (let i = 0; i + 3 <= padded.length; i++) grams.push(padded.slice(i, i + 3).join(''));
+    return grams;
+}
+
+// Optimal string alignment distance (a transposition is one edit), capped at limit + 1
+function editDistance(a, b, limit) {
+    a = Array.from(a);
+    b = Array.from(b);
+    if (Math.abs(a.length - b.length) > limit) return limit + 1;
+    let previous2 = null;
+    let previous = Array.from({ length: b.length + 1 }, (_, j) => j);
+    for (let i = 1; i <= a.length; i++) {
+        const current = [i];
+        let rowMin = i;
+        for (let j = 1; j <= b.length; j++) {
+            const cost = a[i - 1] === b[j - 1] ? 0 : 1;
+            let value = Math.min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost);
+            if (previous2 && j > 1 && a[i - 1] === b[j - 2] && a[i - 2] === b[j - 1]) {
+                value = Math.min(value, previous2[j - 2] + 1);
+            }
+            current.push(value);
+            rowMin = Math.min(rowMin, value);
+        }
+        if (rowMin > limit) return limit + 1;
+        previous2 = previous;
+        previous = current;
     }
+    return Math.min(previous[b.length], limit + 1);
 }
 
-// Get the articles database
-const articlesDatabase = getArticlesDatabase();
+// Indexed terms within one edit (two for long terms) of a query term, closest first
+// Only terms of the index being searched (a shard may hold a subset of the vocabulary)
+function fuzzySearchTerms(fuzzy, term, indexed) {
+    const length = Array.from(term).length;
+    if (length < FUZZY_MIN_LENGTH) return [];
+    const edits = length >= FUZZY_TWO_EDITS_LENGTH ? 2 : 1;
+    const grams = new Set(searchTrigrams(term));
+    const shared = new Map();
+    grams.forEach(gram => {
+        (fuzzy.trigrams[gram] || []).forEach(id => shared.set(id, (shared.get(id) || 0) + 1));
+    });
+    const minShared = Math.max(1, grams.size - FUZZY_GRAMS_PER_EDIT * edits);
+    const matches = [];
+    shared.forEach((count, id) => {
+        const candidate = fuzzy.terms[id];
+        if (count < minShared || candidate === term) return;
+        if (indexed && !Object.prototype.hasOwnProperty.call(indexed, candidate)) return;
+        const distance = editDistance(term, candidate, edits);
+        if (distance <= edits) matches.push([candidate, distance]);
+    });
+    matches.sort((a, b) => a[1] - b[1] || (a[0] < b[0] ? -1 : a[0] > b[0] ? 1 : 0));
+    return matches.slice(0, FUZZY_EXPANSIONS);
+}
+
+// Whether a query has a term no indexed word starts with (worth loading the fuzzy index)
+function searchNeedsFuzzy(index, query) {
+    return searchTokens(query).some(term =>
+        Array.from(term).length >= FUZZY_MIN_LENGTH && expandSearchTerm(index, term).length === 0);
+}
+
+function addBestScores(best, ids, scores, factor) {
+    for (let i = 0; i < ids.length; i++) {
+        const score = scores[i] * factor;
+        if (score > (best.get(ids[i]) || 0)) best.set(ids[i], score);
+    }
+}
+
+function rankSearch(index, query, k, fuzzy) {
+    const totals = new Map();
+    new Set(searchTokens(query)).forEach(term => {
+        const best = new Map();
+        expandSearchTerm(index, term).forEach(match => {
+            addBestScores(best, index.terms[match], index.scores[match], match === term ? 1 : SEARCH_PREFIX_WEIGHT);
+        });
+        // Terms matching nothing are replaced by their closest corrections
+        if (best.size === 0 && fuzzy) {
+            fuzzySearchTerms(fuzzy, term, index.terms).forEach(([match]) => {
+                addBestScores(best, index.terms[match], index.scores[match], FUZZY_WEIGHT);
+            });
+        }
+        best.forEach((score, id) => totals.set(id, (totals.get(id) || 0) + score));
+    });
+    const hits = topK(totals, k);
+    hits.total = totals.size;
+    return hits;
+}
 
 // Popular search terms based on language
 function getPopularSearchTerms() {
@@ -449,30 +397,12 @@ function getPopularSearchTerms() {
 const popularSearchTerms = getPopularSearchTerms();
 
 function performSearch(searchTerm) {
-    const currentDatabase = getArticlesDatabase();
-    const searchResults = currentDatabase.filter(article => {
-        const searchableText = [
-            article.title.toLowerCase(),
-            article.description.toLowerCase(),
-            article.category.toLowerCase(),
-            ...article.tags.map(tag => tag.toLowerCase())
-        ].join(' ');
-        
-        // Búsqueda exacta
-        if (searchableText.includes(searchTerm)) {
-            return true;
-        }
-        
-        // Búsqueda por palabras individuales
-        const searchWords = searchTerm.split(' ').filter(word => word.length > 2);
-        const textWords = searchableText.split(' ');
-        
-        return searchWords.some(searchWord => 
-            textWords.some(textWord => textWord.includes(searchWord))
-        );
+    loadArticlesDatabase().then(articles => {
+        const results = articlesIndex && articlesIndex.scores && articlesIndex.count === articles.length
+            ? rankSearch(articlesIndex, searchTerm, SEARCH_TOP_K, articlesFuzzyIndex).map(([id]) => articles[id])
+            : [];
+        displaySearchResults(results, searchTerm);
     });
-    
-    displaySearchResults(searchResults, searchTerm);
 }
 
 function displaySearchResults(results, searchTerm) {
@@ -521,8 +451,7 @@ function showAlternativeArticles(searchTerm) {
     const searchTermSpan = document.getElementById('searchTerm');
     
     // Obtener artículos alternativos con puntuación de relevancia
-    const currentDatabase = getArticlesDatabase();
-    const alternativeArticles = currentDatabase.map(article => {
+    const alternativeArticles = articlesDatabase.map(article => {
         const searchableText = [
             article.title.toLowerCase(),
             article.description.toLowerCase(),
@@ -557,7 +486,7 @@ function showAlternativeArticles(searchTerm) {
     
     // Si no hay artículos relacionados, mostrar todos los artículos
     if (alternativeArticles.length === 0) {
-        alternativeArticles.push(...currentDatabase.slice(0, 4));
+        alternativeArticles.push(...articlesDatabase.slice(0, 4));
     }
     
     searchResultsGrid.innerHTML = `
@@ -614,6 +543,11 @@ function showSearchSuggestions(searchTerm) {
     const searchSuggestions = document.getElementById('searchSuggestions');
     if (!searchSuggestions) return;
     
+    // El catálogo de artículos se carga la primera vez que se usa
+    loadArticlesDatabase().then(() => renderSearchSuggestions(searchSuggestions, searchTerm));
+}
+
+function renderSearchSuggestions(searchSuggestions, searchTerm) {
     // Generar sugerencias
     const suggestions = generateSuggestions(searchTerm);
     
@@ -660,30 +594,38 @@ function generateSuggestions(searchTerm) {
         terms: []
     };
     
-    // Buscar artículos que coincidan
-    const currentDatabase = getArticlesDatabase();
-    currentDatabase.forEach(article => {
-        const searchableText = [
-            article.title.toLowerCase(),
-            article.description.toLowerCase(),
-            article.category.toLowerCase(),
-            ...article.tags.map(tag => tag.toLowerCase())
-        ].join(' ');
-        
-        if (searchableText.includes(searchTerm)) {
-            suggestions.articles.push(article);
-        }
-    });
+    // Buscar artículos que coincidan (en el índice, sin recorrer el catálogo)
+    const indexed = articlesIndex && articlesIndex.count === articlesDatabase.length;
+    if (indexed) {
+        suggestions.articles = matchSearch(articlesIndex, searchTerm).map(id => articlesDatabase[id]);
+    } else {
+        articlesDatabase.forEach(article => {
+            const searchableText = [
+                article.title.toLowerCase(),
+                article.description.toLowerCase(),
+                article.category.toLowerCase(),
+                ...article.tags.map(tag => tag.toLowerCase())
+            ].join(' ');
+            
+            if (searchableText.includes(searchTerm)) {
+                suggestions.articles.push(article);
+            }
+        });
+    }
     
     // Buscar términos populares que coincidan
+    const foldedTerm = foldSearchText(searchTerm);
     popularSearchTerms.forEach(term => {
-        if (term.toLowerCase().includes(searchTerm) && !suggestions.terms.includes(term)) {
+        if (foldSearchText(term).includes(foldedTerm) && !suggestions.terms.includes(term)) {
             suggestions.terms.push(term);
         }
     });
     
     // Si no hay sugerencias de artículos, mostrar artículos relacionados
-    if (suggestions.articles.length === 0) {
+    if (suggestions.articles.length === 0 && indexed) {
+        suggestions.articles = rankSearch(articlesIndex, searchTerm, 3, articlesFuzzyIndex)
+            .map(([id]) => articlesDatabase[id]);
+    } else if (suggestions.articles.length === 0) {
         const searchWords = searchTerm.split(' ').filter(word => word.length > 2);
         articlesDatabase.forEach(article => {
             const searchableText = [
@@ -2,122 +2,36 @@
 
 import re
 import os
+import sys
 from datetime import datetime
+from urllib.parse import urlsplit
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tools'))
+
+from head_meta import check_alternate_graph, extract_head_meta
+from html_corpus import get_corpus
+from netlify_redirects import load_redirect_table
+from sitemap_parser import iter_sitemap_urls
+
+SITEMAP_PATH = 'sitemap.xml'
+
+RE_ROBOTS_NOINDEX = re.compile(
+    r'<meta\b[^>]*name=["\']robots["\'][^>]*content=["\'][^"\']*noindex|'
+    r'<meta\b[^>]*content=["\'][^"\']*noindex[^"\']*["\'][^>]*name=["\']robots["\']',
+    re.IGNORECASE
+)
 
 # A) INVENTORY PAGES
 def get_html_files():
-    """Collect all HTML files and convert to final URLs"""
+    """Collect all indexable HTML files from the site tree as (directory, filename) pairs"""
     html_files = []
     
-    # Root level files
-    root_files = [
-        'index.html',
-        'privacy-policy.html', 
-        'affiliate-disclosure.html'
-    ]
-    
-    # Articles
-    articles = [
-        '3-functional-diaper-bags-moms-2025.html',
-        '3-functional-university-tote-bags-2025.html',
-        '3-popular-amazon-tote-bags-2025.html',
-        '3-reusable-shopping-tote-bags-2025.html',
-        '3-rfid-security-wallets-2025.html',
-        '3-stylish-professional-backpacks-2025.html',
-        '3-wristlet-wallets-women-2025.html',
-        'affordable-elegant-casual-handbags-wedding-guest-2025.html',
-        'backpacks.html',
-        'best-durable-stylish-backpacks-2025.html',
-        'best-lightweight-travel-backpacks-2025.html',
-        'best-wedding-handbags-2025.html',
-        'fun-unique-gift-wallets-2025.html',
-        'handbags.html',
-        'how-to-choose-perfect-handbag-2025.html',
-        'index.html',
-        'laptop-backpacks-protection-style-2025.html',
-        'minimalist-daily-bag-2025.html',
-        'top-5-professional-women-wallets-2025.html',
-        'tote-bags.html',
-        'travel-light-adventure-bags-2025.html',
-        'wallets.html'
-    ]
-    
-    # Categories
-    categories = [
-        'backpacks/index.html',
-        'handbags/index.html', 
-        'tote-bags/index.html',
-        'wallets/index.html',
-        'index.html'
-    ]
-    
-    # Spanish files
-    es_files = [
-        'index.html',
-        'politica-privacidad.html',
-        'aviso-afiliados.html'
-    ]
-    
-    es_articles = [
-        '3-bolsos-panales-funcionales-mamas-2025.html',
-        '3-carteras-rfid-seguridad-2025.html',
-        '3-carteras-wristlet-mujeres-2025.html',
-        '3-mochilas-profesionales-estilosas-2025.html',
-        '3-tote-bags-funcionales-universidad-2025.html',
-        '3-tote-bags-populares-amazon-2025.html',
-        '3-tote-bags-reutilizables-compras-2025.html',
-        'best-durable-stylish-backpacks-2025.html',
-        'bolso-minimalista-dia-dia-2025.html',
-        'bolsos-casual-elegantes-asequibles-invitadas-bodas-2025.html',
-        'bolsos-de-mano.html',
-        'carteras-divertidas-unicas-regalo-2025.html',
-        'carteras.html',
-        'como-elegir-bolso-mano-perfecto-2025.html',
-        'index.html',
-        'las-mejores-mochilas-mano-viajar-ligero-2025.html',
-        'mejores-bolsos-mano-bodas-2025.html',
-        'mochilas-para-laptop-proteccion-estilo-2025.html',
-        'mochilas.html',
-        'resistentes-estilo-mejores-mochilas-dia-dia-2025.html',
-        'top-5-carteras-mujeres-profesionales-2025.html',
-        'tote-bags.html',
-        'viajar-ligera-bolsos-aventureras-2025.html'
-    ]
-    
-    es_categories = [
-        'bolsos-de-mano/index.html',
-        'carteras/index.html',
-        'mochilas/index.html',
-        'tote-bags/index.html',
-        'index.html'
-    ]
-    
-    # Quiz
-    quiz_files = [
-        'quiz/bag-personality/index.html'
-    ]
-    
-    # Build inventory
-    for file in root_files:
-        html_files.append(('', file))
-    
-    for file in articles:
-        html_files.append(('articles/', file))
-    
-    for file in categories:
-        html_files.append(('categories/', file))
-    
-    for file in es_files:
-        html_files.append(('es/', file))
-    
-    for file in es_articles:
-        html_files.append(('es/articulos/', file))
-    
-    for file in es_categories:
-        html_files.append(('es/categorias/', file))
-    
-    for file in quiz_files:
-        html_files.append(('', file))
+    for doc in get_corpus():
+        # Pages that ask not to be indexed do not belong in the sitemap
+        if RE_ROBOTS_NOINDEX.search(doc.text):
+            continue
+        parent = doc.path.parent.as_posix()
+        html_files.append(('' if parent == '.' else parent + '/', doc.path.name))
     
     return html_files
 
@@ -142,32 +56,41 @@ def classify_url(url):
         return 'EN'
 
 # B) PARSE SITEMAP
-def parse_sitemap():
-    """Parse sitemap.xml and extract URLs"""
-    sitemap_urls = []
-    
-    with open('sitemap.xml', 'r') as f:
-        content = f.read()
-    
-    # Extract all <loc> URLs
-    pattern = r'<loc>(https://affordable-handbags\.com[^<]+)</loc>'
-    matches = re.findall(pattern, content)
-    
-    for url in matches:
-        sitemap_urls.append(url)
-    
-    return sitemap_urls
+def parse_sitemap(path=SITEMAP_PATH):
+    """Stream URLs from sitemap.xml (following sitemap index files)"""
+    return iter_sitemap_urls(path)
 
 # C) COMPARE
-def compare_inventory_sitemap(inventory_urls, sitemap_urls):
-    """Compare inventory vs sitemap"""
-    inventory_set = set(inventory_urls)
-    sitemap_set = set(sitemap_urls)
-    
-    missing_from_sitemap = inventory_set - sitemap_set
-    stale_in_sitemap = sitemap_set - inventory_set
+def compare_inventory_sitemap(inventory_urls, sitemap_urls, redirects=None):
+    """Compare inventory vs sitemap in one pass over the sitemap stream.
     
-    return missing_from_sitemap, stale_in_sitemap
+    Returns (missing_from_sitemap, stale_in_sitemap, counts) where counts has
+    the total/English/Spanish/duplicate tallies of the sitemap and, when a
+    compiled redirect table is given, the sitemap URLs that redirect.
+    """
+    inventory_set = set(inventory_urls)
+    seen = set()
+    stale_in_sitemap = set()
+    counts = {'total': 0, 'EN': 0, 'ES': 0, 'duplicates': 0, 'redirecting': []}
+    
+    for url in sitemap_urls:
+        counts['total'] += 1
+        counts[classify_url(url)] += 1
+        if url in seen:
+            counts['duplicates'] += 1
+            continue
+        seen.add(url)
+        if url not in inventory_set:
+            stale_in_sitemap.add(url)
+        if redirects is not None:
+            hit = redirects.match(urlsplit(url).path)
+            # Unforced rules only fire when no page exists at the URL
+            if hit and hit[0].is_redirect and (hit[0].force or url not in inventory_set):
+                counts['redirecting'].append((url, hit[1]))
+    
+    missing_from_sitemap = inventory_set - seen
+    
+    return missing_from_sitemap, stale_in_sitemap, counts
 
 def main():
     print("=== SEO AUDIT FOR BILINGUAL STATIC SITE ===\n")
@@ -178,11 +101,18 @@ def main():
     
     html_files = get_html_files()
     inventory_urls = []
+    seen_urls = set()
+    page_files = {}
     english_urls = []
     spanish_urls = []
     
     for path, file in html_files:
         final_url = convert_to_final_url(path, file)
+        # foo.html and foo/index.html publish the same URL
+        if final_url in seen_urls:
+            continue
+        seen_urls.add(final_url)
+        page_files[final_url] = path + file
         inventory_urls.append(final_url)
         
         if classify_url(final_url) == 'EN':
@@ -191,29 +121,29 @@ def main():
             spanish_urls.append(final_url)
     
     print(f"Total HTML files: {len(html_files)}")
+    print(f"Unique page URLs: {len(inventory_urls)}")
     print(f"English URLs: {len(english_urls)}")
     print(f"Spanish URLs: {len(spanish_urls)}")
     print()
     
-    # B) PARSE SITEMAP
+    # B + C) PARSE SITEMAP AND COMPARE (single streaming pass)
     print("B) PARSE SITEMAP")
     print("-" * 50)
     
-    sitemap_urls = parse_sitemap()
-    sitemap_english = [url for url in sitemap_urls if '/es/' not in url]
-    sitemap_spanish = [url for url in sitemap_urls if '/es/' in url]
+    missing_from_sitemap, stale_in_sitemap, sitemap_counts = compare_inventory_sitemap(
+        inventory_urls, parse_sitemap(), load_redirect_table(['netlify.toml'])
+    )
     
-    print(f"Sitemap total URLs: {len(sitemap_urls)}")
-    print(f"Sitemap English URLs: {len(sitemap_english)}")
-    print(f"Sitemap Spanish URLs: {len(sitemap_spanish)}")
+    print(f"Sitemap total URLs: {sitemap_counts['total']}")
+    print(f"Sitemap English URLs: {sitemap_counts['EN']}")
+    print(f"Sitemap Spanish URLs: {sitemap_counts['ES']}")
+    print(f"Duplicate sitemap entries: {sitemap_counts['duplicates']}")
     print()
     
     # C) COMPARE
     print("C) COMPARE INVENTORY vs SITEMAP")
     print("-" * 50)
     
-    missing_from_sitemap, stale_in_sitemap = compare_inventory_sitemap(inventory_urls, sitemap_urls)
-    
     print(f"Missing from sitemap: {len(missing_from_sitemap)}")
     if missing_from_sitemap:
         print("Sample missing URLs:")
@@ -228,30 +158,42 @@ def main():
             print(f"  - {url}")
     print()
     
+    print(f"Sitemap URLs that redirect: {len(sitemap_counts['redirecting'])}")
+    for url, target in sitemap_counts['redirecting'][:5]:
+        print(f"  - {url} -> {target}")
+    print()
+    
     # D) CANONICAL + HREFLANG CHECK
     print("D) CANONICAL + HREFLANG CHECK")
     print("-" * 50)
     
-    # Sample a few English pages for canonical/hreflang check
-    sample_english = [
-        'articles/wallets.html',
-        'articles/handbags.html', 
-        'index.html'
-    ]
-    
-    for file in sample_english:
-        print(f"Checking: {file}")
-        # This would require parsing HTML files - simplified for now
-        print(f"  - Would check canonical and hreflang tags")
+    # One head-only parse per page, then a check of the whole EN<->ES graph
+    corpus = get_corpus()
+    head_meta = {url: extract_head_meta(corpus.get(path).text) for url, path in page_files.items()}
+    head_issues = check_alternate_graph(head_meta)
+    
+    issue_counts = {}
+    for issue in head_issues:
+        issue_counts[issue['type']] = issue_counts.get(issue['type'], 0) + 1
+    
+    print(f"Pages checked: {len(head_meta)}")
+    print(f"Pages with hreflang alternates: {sum(1 for meta in head_meta.values() if meta['alternates'])}")
+    if not head_issues:
+        print("✅ Canonicals, og:url and hreflang pairs are consistent")
+    for kind, count in sorted(issue_counts.items()):
+        print(f"{kind}: {count}")
+        for issue in [i for i in head_issues if i['type'] == kind][:5]:
+            print(f"  - {issue['url']}: {issue['detail']}")
     print()
     
     # E) SUMMARY
     print("E) SUMMARY")
     print("-" * 50)
     print(f"Total inventory URLs: {len(inventory_urls)}")
-    print(f"Total sitemap URLs: {len(sitemap_urls)}")
+    print(f"Total sitemap URLs: {sitemap_counts['total']}")
     print(f"Missing from sitemap: {len(missing_from_sitemap)}")
     print(f"Stale in sitemap: {len(stale_in_sitemap)}")
+    print(f"Canonical/hreflang issues: {len(head_issues)}")
     print()
     
     # Show some examples
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Aho-Corasick Multi-Pattern Matcher
+
+Finds every occurrence of a set of patterns in one pass over the text, so the
+cost of scanning a page depends on the page length rather than on how many
+patterns (brands, styles, price phrases, ...) we look for.
+
+Usage:
+    matcher = AhoCorasick({"osprey": "osprey", "under $100": "under 100"})
+    matcher.find_values(page_text.lower())   # -> {"osprey", ...}
+"""
+
+from collections import deque
+from typing import Dict, Iterator, List, Set, Tuple
+
+
+class AhoCorasick:
+    """Pattern automaton compiled into a DFA (one dict lookup per character)."""
+
+    def __init__(self, patterns: Dict[str, str]):
+        """patterns maps each pattern string to the value reported when it matches."""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._output: List[Tuple[str, ...]] = [()]
+        for pattern, value in patterns.items():
+            if pattern:
+                self._add(pattern, value)
+        self._compile()
+
+    def _add(self, pattern: str, value: str):
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._output.append(())
+            state = nxt
+        if value not in self._output[state]:
+            self._output[state] += (value,)
+
+    def _compile(self):
+        """Compute failure links and fold them into the transition table."""
+        fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in list(self._goto[state].items()):
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in self._goto[f]:
+                    f = fail[f]
+                fail[nxt] = self._goto[f].get(ch, 0) if self._goto[f].get(ch) != nxt else 0
+                self._output[nxt] += tuple(v for v in self._output[fail[nxt]] if v not in self._output[nxt])
+            # Missing transitions follow the failure link (BFS order keeps fail states complete)
+            if state:
+                for ch, nxt in self._goto[fail[state]].items():
+                    self._goto[state].setdefault(ch, nxt)
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, str]]:
+        """Yield (end_index, value) for every pattern occurrence in text."""
+        goto = self._goto
+        output = self._output
+        state = 0
+        for i, ch in enumerate(text):
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                for value in output[state]:
+                    yield i, value
+
+    def find_values(self, text: str) -> Set[str]:
+        """Return the set of values whose patterns occur anywhere in text."""
+        goto = self._goto
+        output = self._output
+        found: Set[str] = set()
+        state = 0
+        for ch in text:
+            state = goto[state].get(ch, 0)
+            if output[state]:
+                found.update(output[state])
+        return found
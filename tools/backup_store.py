@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""
+Content-Addressed Backup Store
+
+Keeps one copy of every distinct file version under .backups/objects/, named
+by its SHA-256, plus an append-only index.jsonl recording which file was
+backed up, when, and by which tool. Replaces the per-page .bak_* copies.
+
+Usage:
+    python3 tools/backup_store.py list [PATH]
+    python3 tools/backup_store.py restore PATH [--hash SHA256]
+
+Environment variables:
+    BACKUP_DIR: Backup store location (default: .backups)
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+DEFAULT_BACKUP_DIR = os.environ.get("BACKUP_DIR", ".backups")
+
+
+class BackupStore:
+    def __init__(self, root: str = DEFAULT_BACKUP_DIR):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.index_path = self.root / "index.jsonl"
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / digest
+
+    def save(self, path, data: bytes, tool: str = "") -> str:
+        """Store a file version (once per distinct content) and record it in the index."""
+        digest = hashlib.sha256(data).hexdigest()
+        obj = self.object_path(digest)
+        if not obj.exists():
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            tmp = obj.with_name(obj.name + f".tmp{os.getpid()}")
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            os.replace(tmp, obj)
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        record = {
+            "time": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "path": Path(path).as_posix(),
+            "sha256": digest,
+            "tool": tool,
+        }
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + "\n")
+        return digest
+
+    def entries(self, path=None) -> List[dict]:
+        """Return index records, oldest first, optionally for one path."""
+        if not self.index_path.exists():
+            return []
+        wanted = Path(path).as_posix() if path else None
+        records = []
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if wanted is None or record["path"] == wanted:
+                    records.append(record)
+        return records
+
+    def load(self, digest: str) -> bytes:
+        with open(self.object_path(digest), 'rb') as f:
+            return f.read()
+
+    def restore(self, path, digest: Optional[str] = None) -> str:
+        """Restore a file to a stored version (the latest one by default)."""
+        if digest is None:
+            records = self.entries(path)
+            if not records:
+                raise KeyError(f"No backups recorded for {path}")
+            digest = records[-1]["sha256"]
+        data = self.load(digest)
+        target = Path(path)
+        tmp = target.with_name(f".{target.name}.tmp{os.getpid()}")
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, target)
+        return digest
+
+
+def main():
+    """Command-line access to the backup store."""
+    parser = argparse.ArgumentParser(description="Inspect or restore content-addressed backups")
+    parser.add_argument('--store', default=DEFAULT_BACKUP_DIR, help='Backup store directory (default: .backups)')
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    list_parser = sub.add_parser('list', help='List recorded backups')
+    list_parser.add_argument('path', nargs='?', help='Only show backups of this file')
+
+    restore_parser = sub.add_parser('restore', help='Restore a file from the store')
+    restore_parser.add_argument('path', help='File to restore')
+    restore_parser.add_argument('--hash', help='Version to restore (default: latest backup)')
+
+    args = parser.parse_args()
+    store = BackupStore(args.store)
+
+    if args.command == 'list':
+        records = store.entries(args.path)
+        for record in records:
+            print(f"{record['time']}  {record['sha256'][:12]}  {record['tool'] or '-':<20} {record['path']}")
+        print(f"\n{len(records)} backup(s) recorded")
+    else:
+        try:
+            digest = store.restore(args.path, args.hash)
+        except (KeyError, OSError) as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        print(f"✅ Restored {args.path} from {digest[:12]}")
+
+
+if __name__ == "__main__":
+    main()
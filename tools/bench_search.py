@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Search Benchmark
+
+Measures query latency of the search strategies over the real index scaled up
+to larger synthetic catalogues (each copy of an item gets a distinct URL and a
+rotated tag list):
+1. scan    - the linear match() scan of search/index.html (every item, every term)
+2. boolean - inverted index posting-list intersection (query_inverted_index)
+3. bm25f   - precomputed BM25F scores summed per posting, heap top-k (rank)
+Index build time and serialized index size are reported per catalogue size.
+
+With --fuzzy, the typo index is measured instead: real vocabulary terms get
+one random edit (deletion, insertion, substitution or transposition) and
+fuzzy_terms() must return the original among its corrections. The vocabulary
+is padded with synthetic words up to each size (10k articles have roughly
+30-50k distinct terms); recall and correction latency are reported.
+
+Usage:
+    python3 tools/bench_search.py [--sizes 100,1000,10000] [--repeat N] [--top-k K] [--json]
+    python3 tools/bench_search.py --fuzzy [--vocabulary 1000,10000,50000] [--samples N] [--json]
+"""
+
+import json
+import time
+import random
+import string
+import argparse
+import statistics
+from typing import Callable, Dict, List
+
+from build_search_index import INDEX_PATH
+from search_engine import (FUZZY_MIN_LENGTH, TOP_K, build_fuzzy_index, build_inverted_index, fuzzy_terms,
+                           item_text, query_inverted_index, rank)
+
+QUERIES = ["osprey", "osp", "backpack", "travel wallet", "tote bag", "mochilas", "carteras rfid",
+           "wedding clutch", "laptop backpack women", "zzz"]
+
+
+def scale_items(items: List[dict], size: int) -> List[dict]:
+    """A catalogue of `size` items cycling through the real ones."""
+    scaled = []
+    for n in range(size):
+        item = dict(items[n % len(items)])
+        copy = n // len(items)
+        if copy:
+            tags = item.get('tags', [])
+            item['url'] = f"{item['url']}?copy={copy}"
+            item['tags'] = tags[copy % len(tags):] + tags[:copy % len(tags)] if tags else []
+        scaled.append(item)
+    return scaled
+
+
+def scan(items: List[dict], q: str) -> List[dict]:
+    """Python port of match() in search/index.html."""
+    terms = q.lower().split()
+    return [it for it in items if all(term in item_text(it).lower() for term in terms)]
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    samples = sorted(samples)
+    return {
+        'p50': statistics.median(samples),
+        'p95': samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        'max': samples[-1],
+    }
+
+
+def time_queries(run: Callable[[str], list], repeat: int) -> Dict[str, float]:
+    """Latency of every query, repeated; returns p50/p95/max in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        for q in QUERIES:
+            start = time.perf_counter()
+            run(q)
+            samples.append((time.perf_counter() - start) * 1000)
+    return percentiles(samples)
+
+
+def misspell(term: str, rng: random.Random) -> str:
+    """The term with one random edit."""
+    i = rng.randrange(len(term))
+    kind = rng.choice(('delete', 'insert', 'substitute', 'transpose'))
+    if kind == 'delete':
+        return term[:i] + term[i + 1:]
+    if kind == 'insert':
+        return term[:i] + rng.choice(string.ascii_lowercase) + term[i:]
+    if kind == 'substitute':
+        return term[:i] + rng.choice([c for c in string.ascii_lowercase if c != term[i]]) + term[i + 1:]
+    i = min(i, len(term) - 2)
+    return term[:i] + term[i + 1] + term[i] + term[i + 2:]
+
+
+def synthetic_vocabulary(terms: List[str], size: int, rng: random.Random) -> List[str]:
+    """The real terms plus made-up words (real stems with random endings) up to `size` terms."""
+    vocabulary = set(terms)
+    stems = [t for t in terms if len(t) >= FUZZY_MIN_LENGTH] or ['bolso']
+    while len(vocabulary) < size:
+        stem = rng.choice(stems)
+        ending = ''.join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(1, 5)))
+        vocabulary.add(stem[:rng.randint(2, len(stem))] + ending)
+    return sorted(vocabulary)
+
+
+def fuzzy_benchmark(terms: List[str], sizes: List[int], samples: int = 300, seed: int = 7) -> List[dict]:
+    rng = random.Random(seed)
+    real = sorted(t for t in terms if len(t) >= FUZZY_MIN_LENGTH and t.isalpha())
+    results = []
+    for size in sizes:
+        vocabulary = synthetic_vocabulary(real, size, rng)
+        start = time.perf_counter()
+        fuzzy = build_fuzzy_index(vocabulary)
+        build_ms = (time.perf_counter() - start) * 1000
+        known = set(fuzzy['terms'])
+
+        found = first = tested = 0
+        latencies = []
+        while tested < samples:
+            original = rng.choice(real)
+            typo = misspell(original, rng)
+            if typo in known or len(typo) < FUZZY_MIN_LENGTH:
+                continue
+            tested += 1
+            start = time.perf_counter()
+            corrections = [term for term, _ in fuzzy_terms(fuzzy, typo)]
+            latencies.append((time.perf_counter() - start) * 1000)
+            found += original in corrections
+            first += bool(corrections) and corrections[0] == original
+        results.append({
+            'size': len(fuzzy['terms']),
+            'build_ms': build_ms,
+            'index_bytes': len(json.dumps(fuzzy, ensure_ascii=False, separators=(',', ':')).encode('utf-8')),
+            'recall': found / tested,
+            'recall_at_1': first / tested,
+            'latency': percentiles(latencies),
+        })
+    return results
+
+
+def benchmark(items: List[dict], sizes: List[int], repeat: int = 5, k: int = TOP_K) -> List[dict]:
+    results = []
+    for size in sizes:
+        catalogue = scale_items(items, size)
+        start = time.perf_counter()
+        index = build_inverted_index(catalogue)
+        build_ms = (time.perf_counter() - start) * 1000
+        results.append({
+            'size': size,
+            'build_ms': build_ms,
+            'index_bytes': len(json.dumps(index, ensure_ascii=False, separators=(',', ':')).encode('utf-8')),
+            'scan': time_queries(lambda q: scan(catalogue, q), repeat),
+            'boolean': time_queries(lambda q: query_inverted_index(index, q), repeat),
+            'bm25f': time_queries(lambda q: rank(index, q, k), repeat),
+        })
+    return results
+
+
+def print_results(results: List[dict]):
+    print(f"{'items':>7}{'build':>10}{'index':>11}   {'strategy':<9}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    for row in results:
+        for n, strategy in enumerate(('scan', 'boolean', 'bm25f')):
+            lead = (f"{row['size']:>7}{row['build_ms']:>8.0f}ms{row['index_bytes'] / 1024:>9.0f}KB"
+                    if n == 0 else ' ' * 28)
+            t = row[strategy]
+            print(f"{lead}   {strategy:<9}{t['p50']:>9.3f}{t['p95']:>9.3f}{t['max']:>9.3f}")
+
+
+def print_fuzzy_results(results: List[dict]):
+    print(f"{'terms':>7}{'build':>10}{'index':>11}{'recall':>9}{'@1':>8}{'p50 ms':>9}{'p95 ms':>9}{'max ms':>9}")
+    for row in results:
+        t = row['latency']
+        print(f"{row['size']:>7}{row['build_ms']:>8.0f}ms{row['index_bytes'] / 1024:>9.0f}KB"
+              f"{row['recall']:>9.1%}{row['recall_at_1']:>8.1%}{t['p50']:>9.3f}{t['p95']:>9.3f}{t['max']:>9.3f}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark search strategies")
+    parser.add_argument('--sizes', default='100,1000,10000', help='Comma-separated catalogue sizes')
+    parser.add_argument('--repeat', type=int, default=5, help='Times each query is run')
+    parser.add_argument('--top-k', type=int, default=TOP_K, help='Results kept by the ranked search')
+    parser.add_argument('--fuzzy', action='store_true', help='Benchmark typo correction instead')
+    parser.add_argument('--vocabulary', default='1000,10000,50000', help='Comma-separated vocabulary sizes (--fuzzy)')
+    parser.add_argument('--samples', type=int, default=300, help='Misspelled terms tried per size (--fuzzy)')
+    parser.add_argument('--json', action='store_true', help='Print results as JSON')
+    args = parser.parse_args()
+
+    with open(INDEX_PATH, 'r', encoding='utf-8') as f:
+        items = json.load(f)
+    if args.fuzzy:
+        terms = list(build_inverted_index(items)['terms'])
+        results = fuzzy_benchmark(terms, [int(s) for s in args.vocabulary.split(',')], args.samples)
+        if args.json:
+            print(json.dumps(results, indent=2))
+            return
+        print("=== FUZZY SEARCH BENCHMARK ===")
+        print(f"{args.samples} misspelled terms per vocabulary size, one edit each\n")
+        print_fuzzy_results(results)
+        return
+    results = benchmark(items, [int(s) for s in args.sizes.split(',')], args.repeat, args.top_k)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print("=== SEARCH BENCHMARK ===")
+    print(f"{len(items)} indexed items, {len(QUERIES)} queries x {args.repeat}\n")
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
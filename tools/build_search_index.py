@@ -3,21 +3,132 @@
 Build Search Index
 
 This script scans HTML files and builds a search index JSON file.
+
+Usage:
+    python3 tools/build_search_index.py [--incremental] [--compress] [--jobs N] [--quiet]
+
+With --incremental, a sidecar manifest of per-file mtimes, sizes and content
+hashes is kept in .build-cache/, and only new or changed pages are re-extracted.
+Unchanged entries are reused and deleted pages are dropped from the index.
+Cached entries are keyed on EXTRACTOR_VERSION and a hash of the tag
+vocabulary, so editing either re-extracts every page. The build is skipped
+only when nothing changed and every output file (see output_paths) exists.
+
+With --jobs N, extraction fans out across N worker processes; results are
+merged back in file order so the output is identical to a serial run.
+--quiet skips the per-file progress output.
+
+Alongside search-index.json, a compact inverted index (term -> item ids plus
+prefix buckets, see tools/search_engine.py) is written to
+search-inverted-index.json so queries can intersect posting lists instead of
+scanning every item.
+
+The index is also split into per-language and per-language-and-category
+shards, each holding its items and their inverted index. Shards and a copy of
+the full index are written under search-shards/data/ with content-hashed
+names (en.1a2b3c4d.json), so they can be cached forever; the small
+search-shards/manifest.json the search page reads maps each shard to its
+current file (tools/check_search_manifest.py verifies it). A trigram index of
+the vocabulary (see tools/search_engine.py) is written the same way; the page
+fetches it only to correct misspelled query terms.
+
+Article pages also go into per-language card lists with their own ranking
+and typo indexes, written next to the shards (search-shards/data/articles.en.1a2b3c4d.json)
+and listed under "articles" in the manifest; assets/script.js fetches the one
+for the page language the first time search or suggestions are used. All JSON output is minified; --compress
+also writes .gz siblings (and .br siblings when the optional brotli module is
+installed) through tools/precompress.py.
+
+Brand, style and price tags come from tools/data/search-tags.json (override
+with SEARCH_TAGS_VOCABULARY=path) and are matched with a single Aho-Corasick
+pass over each page.
 """
 
 import os
 import re
+import json
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from html import unescape
+from urllib.parse import quote
 
-def extract_article_data(file_path):
-    """Extract article data from an HTML file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-    except Exception as e:
-        print(f"❌ Error reading {file_path}: {e}")
-        return None
+from aho_corasick import AhoCorasick
+from fingerprint_assets import HASH_LENGTH, fingerprinted_name
+from html_corpus import atomic_write_text, get_corpus
+import link_graph
+from precompress import write_compressed
+from search_engine import build_fuzzy_index, build_inverted_index
+
+INDEX_PATH = 'search-index.json'
+INVERTED_INDEX_PATH = 'search-inverted-index.json'
+SHARDS_DIR = 'search-shards'
+SHARDS_VERSION = 2
+# Content-hashed shard and full-index files, relative to SHARDS_DIR (served immutable, see netlify.toml)
+SHARDS_DATA_DIR = 'data'
+MANIFEST_PATH = os.path.join('.build-cache', 'search-index.manifest.json')
+# Per-language article catalogue loaded by assets/script.js for search and suggestions
+MONTH_NAMES = {
+    'en': ["January", "February", "March", "April", "May", "June", "July",
+           "August", "September", "October", "November", "December"],
+    'es': ["Enero", "Febrero", "Marzo", "Abril", "Mayo", "Junio", "Julio",
+           "Agosto", "Septiembre", "Octubre", "Noviembre", "Diciembre"],
+}
+
+# Bump when extract_article_data() changes so cached entries are re-extracted
+EXTRACTOR_VERSION = 4
+
+# Brand/style/price tag vocabulary (see load_tag_vocabulary)
+TAGS_VOCABULARY_PATH = os.environ.get(
+    "SEARCH_TAGS_VOCABULARY",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'search-tags.json')
+)
+
+_TAG_MATCHERS = {}
+
+def load_tag_vocabulary(path=TAGS_VOCABULARY_PATH):
+    """Load tag groups from a JSON data file.
+    
+    Each top-level group is either a list of keywords (each keyword is its own
+    tag, e.g. "brands") or an object mapping a tag to the phrases that imply it
+    (e.g. "price": {"affordable": ["affordable", "budget"]}). Returns
+    (patterns, tag_rank): phrase -> tag, and tag -> position in the vocabulary.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        groups = json.load(f)
+    
+    patterns = {}
+    tag_rank = {}
+    for group in groups.values():
+        if isinstance(group, dict):
+            entries = group.items()
+        else:
+            entries = ((keyword, [keyword]) for keyword in group)
+        for tag, phrases in entries:
+            tag_rank.setdefault(tag, len(tag_rank))
+            for phrase in phrases:
+                patterns.setdefault(phrase.lower(), tag)
+    return patterns, tag_rank
+
+def get_tag_matcher(path=None):
+    """Return (matcher, tag_rank) for a vocabulary file, compiled once per process."""
+    path = path or TAGS_VOCABULARY_PATH
+    if path not in _TAG_MATCHERS:
+        patterns, tag_rank = load_tag_vocabulary(path)
+        _TAG_MATCHERS[path] = (AhoCorasick(patterns), tag_rank)
+    return _TAG_MATCHERS[path]
+
+def extract_article_data(file_path, content=None):
+    """Extract article data from an HTML file (content may be passed in pre-read)."""
+    if content is None:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            print(f"❌ Error reading {file_path}: {e}")
+            return None
     
     # Extract title
     title_match = re.search(r'<title>(.*?)</title>', content, re.IGNORECASE)
@@ -27,7 +138,11 @@ def extract_article_data(file_path):
     desc_match = re.search(r'<meta name="description" content="(.*?)"', content, re.IGNORECASE)
     description = desc_match.group(1).strip() if desc_match else ""
     
-    # Extract date from article-meta or use file modification time
+    # Article pages (og:type "article") also carry a lead image, a publish date and a category badge
+    is_article = re.search(r'<meta property="og:type" content="article"', content, re.IGNORECASE) is not None
+    published_match = re.search(r'"datePublished":\s*"(\d{4}-\d{2}-\d{2})', content)
+    
+    # Extract date from article-meta, the article's publish date or use file modification time
     date_match = re.search(r'<span class="article-meta">(.*?)</span>', content, re.IGNORECASE)
     if date_match:
         date_str = date_match.group(1).strip()
@@ -40,6 +155,8 @@ def extract_article_data(file_path):
                 date = "2025-01-01"  # Default fallback
         except:
             date = "2025-01-01"
+    elif is_article and published_match:
+        date = published_match.group(1)
     else:
         # Use file modification time
         try:
@@ -50,50 +167,36 @@ def extract_article_data(file_path):
     
     # Determine category based on path
     category = "General"
-    if "/articles/handbags" in str(file_path):
+    site_path = "/" + Path(file_path).as_posix().lstrip("/")
+    if "/articles/handbags" in site_path:
         category = "Handbags"
-    elif "/articles/backpacks" in str(file_path):
+    elif "/articles/backpacks" in site_path:
         category = "Backpacks"
-    elif "/articles/wallets" in str(file_path):
+    elif "/articles/wallets" in site_path:
         category = "Wallets"
-    elif "/articles/tote-bags" in str(file_path):
+    elif "/articles/tote-bags" in site_path:
         category = "Tote Bags"
-    elif "/categories/" in str(file_path):
-        if "handbags" in str(file_path):
+    elif "/categories/" in site_path:
+        if "handbags" in site_path:
             category = "Handbags"
-        elif "backpacks" in str(file_path):
+        elif "backpacks" in site_path:
             category = "Backpacks"
-        elif "wallets" in str(file_path):
+        elif "wallets" in site_path:
             category = "Wallets"
-        elif "tote-bags" in str(file_path):
+        elif "tote-bags" in site_path:
             category = "Tote Bags"
     
-    # Generate tags based on content
-    tags = []
-    content_lower = content.lower()
-    
-    # Brand tags
-    brands = ["coach", "osprey", "tory burch", "valentino", "gucci", "prada", "louis vuitton", "bottega veneta"]
-    for brand in brands:
-        if brand in content_lower:
-            tags.append(brand)
-    
-    # Style tags
-    styles = ["crossbody", "tote", "backpack", "wallet", "clutch", "hobo", "satchel", "messenger", "laptop", "work", "travel", "hiking", "professional", "casual", "elegant", "minimalist"]
-    for style in styles:
-        if style in content_lower:
-            tags.append(style)
-    
-    # Price tags
-    if "affordable" in content_lower or "budget" in content_lower:
-        tags.append("affordable")
-    if "under 100" in content_lower or "under $100" in content_lower:
-        tags.append("under 100")
-    if "luxury" in content_lower or "expensive" in content_lower:
-        tags.append("luxury")
-    
-    # Remove duplicates and limit tags
-    tags = list(set(tags))[:10]
+    if category == "General" and is_article:
+        badge_match = re.search(r'<span class="article-category">(.*?)</span>', content, re.IGNORECASE)
+        if badge_match:
+            category = unescape(badge_match.group(1).strip())
+    
+    # Generate tags based on content (one pass over the page for the whole vocabulary)
+    matcher, tag_rank = get_tag_matcher()
+    found = matcher.find_values(content.lower())
+    
+    # Keep vocabulary order and limit tags
+    tags = sorted(found, key=tag_rank.__getitem__)[:10]
     
     # Generate URL
     url = str(file_path).replace("\\", "/")
@@ -102,7 +205,7 @@ def extract_article_data(file_path):
     if not url.startswith("/"):
         url = "/" + url
     
-    return {
+    entry = {
         "title": title,
         "url": url,
         "category": category,
@@ -110,52 +213,350 @@ def extract_article_data(file_path):
         "date": date,
         "excerpt": description
     }
+    image_match = re.search(r'<meta property="og:image" content="(.*?)"', content, re.IGNORECASE)
+    if is_article and image_match:
+        image = unescape(image_match.group(1).strip())
+        local = link_graph.site_path(url, image)
+        entry["image"] = quote(local) if local else image
+    return entry
 
 def find_article_files():
     """Find all article and category HTML files."""
-    files = []
+    # Backups, tools, scripts and node_modules are excluded by the shared corpus
+    return list(get_corpus())
+
+def vocabulary_hash(path=None):
+    """Content hash of the tag vocabulary file, or None if it cannot be read."""
+    try:
+        with open(path or TAGS_VOCABULARY_PATH, 'rb') as f:
+            return hashlib.sha1(f.read()).hexdigest()
+    except OSError:
+        return None
+
+def manifest_key(vocabulary_path=None):
+    """What cached entries depend on besides their page: the extractor and the tag vocabulary."""
+    return {"version": EXTRACTOR_VERSION, "vocabulary": vocabulary_hash(vocabulary_path)}
+
+def load_manifest(path=MANIFEST_PATH, vocabulary_path=None):
+    """Load the incremental build manifest, or an empty one if missing/stale."""
+    key = manifest_key(vocabulary_path)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return dict(key, files={})
+    if any(manifest.get(name) != value for name, value in key.items()):
+        return dict(key, files={})
+    return manifest
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    """Write the incremental build manifest."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write_text(Path(path), json.dumps(manifest, ensure_ascii=False, separators=(',', ':')))
+
+def extract_file(paths):
+    """Read, hash and extract one file; used directly and as the process pool worker."""
+    full_path, rel_path = paths
+    with open(full_path, 'rb') as f:
+        data = f.read()
+    return hashlib.sha1(data).hexdigest(), extract_article_data(rel_path, data.decode('utf-8', errors='ignore'))
+
+def iter_extracted(docs, jobs=1):
+    """Yield (doc, sha1, entry) in input order, fanning out to a process pool if jobs > 1."""
+    if jobs > 1 and len(docs) > 1:
+        chunksize = max(1, len(docs) // (jobs * 4))
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = executor.map(
+                extract_file,
+                [(str(doc.full_path), str(doc.path)) for doc in docs],
+                chunksize=chunksize
+            )
+            for doc, (digest, article_data) in zip(docs, results):
+                yield doc, digest, article_data
+    else:
+        for doc in docs:
+            yield doc, doc.digest, extract_article_data(doc.path, doc.lenient_text)
+
+def collect_entries(files, manifest, incremental=False, log=print, jobs=1):
+    """Extract index entries, reusing manifest entries for unchanged files.
+    
+    Returns (new_manifest, stats). A file is considered unchanged when its
+    mtime and size match the manifest, or failing that when its content hash
+    does; only the remaining files are read and re-extracted, across `jobs`
+    worker processes. Results are merged in input order, so the output does
+    not depend on the number of jobs.
+    """
+    previous = manifest.get("files", {}) if incremental else {}
+    current = {}
+    pending = []
+    stats = {'added': 0, 'changed': 0, 'unchanged': 0, 'removed': 0, 'failed': 0}
+    
+    for doc in files:
+        key = doc.path.as_posix()
+        st = doc.stat()
+        prev = previous.get(key)
+        
+        if prev and prev['mtime'] == st.st_mtime_ns and prev['size'] == st.st_size:
+            current[key] = prev
+            stats['unchanged'] += 1
+            continue
+        
+        if prev and prev['sha1'] == doc.digest:
+            current[key] = dict(prev, mtime=st.st_mtime_ns, size=st.st_size)
+            stats['unchanged'] += 1
+            continue
+        
+        # Reserve the slot so the manifest keeps the corpus order
+        current[key] = None
+        pending.append((doc, st, prev))
     
-    # Scan all HTML files recursively, excluding backup files and tools
-    for file_path in Path(".").rglob("*.html"):
-        if (not file_path.name.startswith('.') and 
-            '.bak_' not in str(file_path) and
-            'tools' not in str(file_path) and
-            'scripts' not in str(file_path) and
-            'node_modules' not in str(file_path)):
-            files.append(file_path)
+    extracted = iter_extracted([doc for doc, _, _ in pending], jobs)
+    for (doc, st, prev), (_, digest, article_data) in zip(pending, extracted):
+        log(f"Processing {doc.path}...")
+        if article_data:
+            log(f"  ✅ {article_data['title']}")
+        else:
+            log(f"  ❌ Failed to extract data")
+            stats['failed'] += 1
+        
+        stats['changed' if prev else 'added'] += 1
+        current[doc.path.as_posix()] = {
+            "mtime": st.st_mtime_ns,
+            "size": st.st_size,
+            "sha1": digest,
+            "entry": article_data,
+        }
     
-    return files
+    stats['removed'] = len(set(previous) - set(current))
+    return dict(manifest_key(), files=current), stats
+
+def articles_from_manifest(manifest):
+    """Return index entries from a manifest, newest first."""
+    articles = [f["entry"] for f in manifest["files"].values() if f["entry"]]
+    articles.sort(key=lambda x: x['date'], reverse=True)
+    return articles
+
+def to_json(data) -> str:
+    """Serialize minified JSON."""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+def write_json(path, data, compress=False) -> int:
+    """Write minified JSON (plus .gz/.br siblings if compress) and return its size."""
+    text = to_json(data)
+    atomic_write_text(Path(path), text)
+    raw = text.encode('utf-8')
+    if compress:
+        write_compressed(str(path), raw)
+    return len(raw)
+
+def item_language(item) -> str:
+    """Language of an index item, from its URL."""
+    return 'es' if item['url'].startswith('/es/') else 'en'
+
+def category_slug(category: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', category.lower()).strip('-') or 'general'
+
+def build_shards(articles):
+    """Group items into language and language/category shards (keys like 'en', 'en/handbags')."""
+    shards = {}
+    for item in articles:
+        lang = item_language(item)
+        shards.setdefault(lang, []).append(item)
+        shards.setdefault(f"{lang}/{category_slug(item['category'])}", []).append(item)
+    return shards
+
+def load_shards_manifest(out_dir=SHARDS_DIR):
+    """Read search-shards/manifest.json, or {} if missing or from an older layout."""
+    try:
+        with open(os.path.join(out_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest if manifest.get("version") == SHARDS_VERSION else {}
+
+def manifest_files(manifest):
+    """Data files (relative to the shards directory) referenced by a shards manifest."""
+    entries = [manifest.get(key) for key in ("index", "inverted", "fuzzy")]
+    entries += list(manifest.get("shards", {}).values()) + list(manifest.get("articles", {}).values())
+    return {entry["file"] for entry in entries if entry}
+
+def write_hashed_json(out_dir, name, data, compress=False):
+    """Write minified JSON to <out_dir>/data/<name>.<hash>.json and return its manifest entry."""
+    text = to_json(data)
+    raw = text.encode('utf-8')
+    digest = hashlib.sha1(raw).hexdigest()
+    file_name = f"{SHARDS_DATA_DIR}/{fingerprinted_name(name + '.json', digest)}"
+    path = os.path.join(out_dir, file_name)
+    atomic_write_text(Path(path), text)
+    if compress:
+        write_compressed(path, raw)
+    return {"file": file_name, "hash": digest[:HASH_LENGTH], "bytes": len(raw)}
+
+def write_shards(articles, out_dir=SHARDS_DIR, compress=False, inverted=None):
+    """Write content-hashed shard and full-index files plus manifest.json.
+    
+    Data files never change once written, so they can be cached forever; only
+    the small manifest is revalidated. Files of the previous build are kept
+    for pages still holding the old manifest, older ones are removed.
+    """
+    previous = load_shards_manifest(out_dir)
+    os.makedirs(os.path.join(out_dir, SHARDS_DATA_DIR), exist_ok=True)
+    if inverted is None:
+        inverted = build_inverted_index(articles)
+    manifest = {
+        "version": SHARDS_VERSION,
+        "index": dict(write_hashed_json(out_dir, 'index', articles, compress), count=len(articles)),
+        "inverted": write_hashed_json(out_dir, 'inverted', inverted, compress),
+        "fuzzy": write_hashed_json(out_dir, 'fuzzy', build_fuzzy_index(inverted["terms"]), compress),
+        "shards": {},
+    }
+    
+    for key, items in sorted(build_shards(articles).items()):
+        entry = write_hashed_json(
+            out_dir,
+            key.replace('/', '.'),
+            {"items": items, "index": build_inverted_index(items)},
+            compress
+        )
+        manifest["shards"][key] = dict(entry, count=len(items))
+    manifest["articles"] = write_article_modules(articles, out_dir, compress)
+    
+    keep = manifest_files(manifest) | manifest_files(previous)
+    for name in os.listdir(out_dir):
+        # Unhashed shards from the old layout
+        if os.path.isfile(os.path.join(out_dir, name)) and re.sub(r'[.](gz|br)$', '', name) != 'manifest.json':
+            os.remove(os.path.join(out_dir, name))
+    for name in os.listdir(os.path.join(out_dir, SHARDS_DATA_DIR)):
+        if f"{SHARDS_DATA_DIR}/{re.sub(r'[.](gz|br)$', '', name)}" not in keep:
+            os.remove(os.path.join(out_dir, SHARDS_DATA_DIR, name))
+    
+    write_json(os.path.join(out_dir, 'manifest.json'), manifest, compress)
+    return manifest
+
+def output_paths(root="."):
+    """Every file a build writes under root, including the hashed files of the current shards manifest."""
+    paths = [INDEX_PATH, INVERTED_INDEX_PATH, os.path.join(SHARDS_DIR, 'manifest.json')]
+    manifest = load_shards_manifest(os.path.join(root, SHARDS_DIR))
+    paths += [os.path.join(SHARDS_DIR, name) for name in sorted(manifest_files(manifest))]
+    return [os.path.join(root, path) for path in paths]
+
+def outputs_exist(root="."):
+    """Whether every output of the last build is still on disk."""
+    return all(os.path.exists(path) for path in output_paths(root))
+
+def display_date(date: str, lang: str) -> str:
+    """Format a YYYY-MM-DD date the way article cards show it ("January 30, 2025" / "30 Enero 2025")."""
+    try:
+        parsed = datetime.strptime(date, "%Y-%m-%d")
+    except ValueError:
+        return date
+    month = MONTH_NAMES[lang][parsed.month - 1]
+    return f"{parsed.day} {month} {parsed.year}" if lang == 'es' else f"{month} {parsed.day}, {parsed.year}"
+
+def build_article_modules(articles):
+    """Article cards and their ranking and typo indexes per language ({'en': {"items", "index", "fuzzy"}, ...}).
+    
+    Only items with a lead image are articles; /articles/x.html and
+    /articles/x/index.html are the same article and get one card.
+    """
+    sources = {lang: [] for lang in MONTH_NAMES}
+    seen = set()
+    for item in articles:
+        key = re.sub(r'(/index)?\.html$', '', item['url'])
+        if not item.get('image') or key in seen:
+            continue
+        seen.add(key)
+        sources[item_language(item)].append(item)
+    
+    modules = {}
+    for lang, items in sources.items():
+        cards = [{
+            "title": item['title'].rsplit(' | ', 1)[0],
+            "description": item['excerpt'],
+            "category": item['category'],
+            "url": item['url'],
+            "image": item['image'],
+            "date": display_date(item['date'], lang),
+            "tags": item['tags'],
+        } for item in items]
+        index = build_inverted_index(items)
+        modules[lang] = {"items": cards, "index": index, "fuzzy": build_fuzzy_index(index["terms"])}
+    return modules
+
+def write_article_modules(articles, out_dir=SHARDS_DIR, compress=False):
+    """Write a content-hashed articles.<lang> file per language; returns their manifest entries by language."""
+    os.makedirs(os.path.join(out_dir, SHARDS_DATA_DIR), exist_ok=True)
+    entries = {}
+    for lang, module in build_article_modules(articles).items():
+        entry = write_hashed_json(out_dir, f'articles.{lang}', module, compress)
+        entries[lang] = dict(entry, count=len(module['items']))
+    return entries
+
+def write_outputs(articles, compress=False):
+    """Write search-index.json, its inverted index and the search shards (with the article modules)."""
+    write_json(INDEX_PATH, articles, compress)
+    inverted = build_inverted_index(articles)
+    write_json(INVERTED_INDEX_PATH, inverted, compress)
+    write_shards(articles, compress=compress, inverted=inverted)
+    return inverted
 
 def main():
     """Main execution."""
+    parser = argparse.ArgumentParser(description="Build search-index.json from the site's HTML pages")
+    parser.add_argument(
+        '--incremental',
+        action='store_true',
+        help='Only re-extract pages that are new or changed since the last build'
+    )
+    parser.add_argument(
+        '--compress',
+        action='store_true',
+        help='Also write precompressed .gz (and .br, if brotli is installed) siblings'
+    )
+    parser.add_argument(
+        '--jobs', '-j',
+        type=int,
+        default=1,
+        help='Number of worker processes for extraction (0 = one per CPU, default: 1)'
+    )
+    parser.add_argument(
+        '--quiet', '-q',
+        action='store_true',
+        help='Do not print per-file progress'
+    )
+    args = parser.parse_args()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    
     print("=== BUILDING SEARCH INDEX ===")
     print("Scanning HTML files and building search index...")
     print()
     
     files = find_article_files()
-    print(f"Found {len(files)} files to process:")
+    print(f"Found {len(files)} files to process{'' if args.quiet else ':'}")
     print()
     
-    articles = []
+    log = (lambda message: None) if args.quiet else print
+    manifest = load_manifest() if args.incremental else {"files": {}}
+    new_manifest, stats = collect_entries(
+        files, manifest, incremental=args.incremental, log=log, jobs=jobs
+    )
+    articles = articles_from_manifest(new_manifest)
     
-    for file_path in files:
-        print(f"Processing {file_path}...")
-        article_data = extract_article_data(file_path)
-        if article_data:
-            articles.append(article_data)
-            print(f"  ✅ {article_data['title']}")
-        else:
-            print(f"  ❌ Failed to extract data")
-    
-    # Sort by date (newest first)
-    articles.sort(key=lambda x: x['date'], reverse=True)
+    if args.incremental:
+        print(f"Added: {stats['added']}, changed: {stats['changed']}, "
+              f"unchanged: {stats['unchanged']}, removed: {stats['removed']}")
+        if not (stats['added'] or stats['changed'] or stats['removed']) and outputs_exist():
+            save_manifest(new_manifest)
+            print(f"\n✅ {INDEX_PATH} is up to date")
+            return
     
     # Write JSON file
-    import json
     try:
-        with open('search-index.json', 'w', encoding='utf-8') as f:
-            json.dump(articles, f, indent=2, ensure_ascii=False)
-        print(f"\n✅ Search index written to search-index.json")
+        inverted = write_outputs(articles, compress=args.compress)
+        save_manifest(new_manifest)
+        print(f"\n✅ Search index written to {INDEX_PATH}")
+        print(f"✅ Inverted index written to {INVERTED_INDEX_PATH} ({len(inverted['terms'])} terms)")
+        print(f"✅ Search shards and article modules written to {SHARDS_DIR}/")
         print(f"📊 Total articles indexed: {len(articles)}")
         
         # Show some sample entries
@@ -164,7 +565,7 @@ def main():
             print(f"  {i+1}. {article['title']} ({article['category']})")
         
     except Exception as e:
-        print(f"❌ Error writing search-index.json: {e}")
+        print(f"❌ Error writing {INDEX_PATH}: {e}")
 
 if __name__ == "__main__":
     main()
@@ -2,103 +2,50 @@
 """
 Check Article Links
 
-This script checks for broken article links across all HTML files.
+This script checks for broken article links across all HTML files. Links are
+resolved the way Netlify serves them (redirects, then pretty URLs) using the
+cached site link graph (tools/link_graph.py).
 """
 
-import os
-import re
-from pathlib import Path
+from link_graph import LinkGraph
 
 def check_article_links():
     """Check for broken article links in all HTML files."""
     print("=== CHECKING ARTICLE LINKS ===")
     
-    # Find all HTML files
-    html_files = []
-    for root, dirs, files in os.walk("."):
-        dirs[:] = [d for d in dirs if d not in {'.git', 'node_modules', 'dist', 'build', '.next', 'out', 'tools', 'scripts'}]
-        for file in files:
-            if file.endswith('.html') and not file.startswith('.') and '.bak_' not in file:
-                html_files.append(Path(root) / file)
+    graph = LinkGraph().build()
     
-    print(f"Found {len(html_files)} HTML files to check")
+    print(f"Found {len(graph.pages)} HTML files to check")
     print()
     
     broken_links = []
+    other_broken = []
     
-    for file_path in html_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            print(f"❌ Error reading {file_path}: {e}")
-            continue
-        
-        # Find article links with directory-style URLs
-        article_links = re.findall(r'href="(/articles/[^"]+/)"', content)
-        
-        for link in article_links:
-            # Convert directory-style URL to file-style URL
-            expected_file = link.rstrip('/') + '.html'
-            file_exists = os.path.exists(expected_file.lstrip('/'))
-            
-            if not file_exists:
-                broken_links.append({
-                    'file': str(file_path),
-                    'link': link,
-                    'expected': expected_file
-                })
+    for item in graph.broken_links():
+        if '/articles/' in item['href'] or '/articulos/' in item['href']:
+            broken_links.append(item)
+        else:
+            other_broken.append(item)
     
     if broken_links:
         print("❌ BROKEN ARTICLE LINKS FOUND:")
         print()
         for item in broken_links:
-            print(f"File: {item['file']}")
-            print(f"  Broken link: {item['link']}")
-            print(f"  Should be: {item['expected']}")
+            print(f"File: {item['page']}")
+            print(f"  Broken link: {item['href']} ({item['status']})")
             print()
     else:
         print("✅ No broken article links found!")
     
-    # Check for other common link patterns
-    print("\n=== CHECKING OTHER LINK PATTERNS ===")
-    
-    other_broken = []
-    
-    for file_path in html_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-        except Exception as e:
-            continue
-        
-        # Check for other directory-style links
-        patterns = [
-            (r'href="(/quiz/[^"]+/)"', 'quiz'),
-            (r'href="(/about/[^"]+/)"', 'about'),
-            (r'href="(/contact/[^"]+/)"', 'contact'),
-            (r'href="(/terms/[^"]+/)"', 'terms')
-        ]
-        
-        for pattern, category in patterns:
-            links = re.findall(pattern, content)
-            for link in links:
-                expected_file = link.rstrip('/') + '/index.html'
-                file_exists = os.path.exists(expected_file.lstrip('/'))
-                
-                if not file_exists:
-                    other_broken.append({
-                        'file': str(file_path),
-                        'link': link,
-                        'category': category
-                    })
+    # Everything else: quiz, about, contact, assets, ...
+    print("\n=== CHECKING OTHER LINKS ===")
     
     if other_broken:
         print("❌ OTHER BROKEN LINKS FOUND:")
         print()
         for item in other_broken:
-            print(f"File: {item['file']}")
-            print(f"  {item['category']} link: {item['link']}")
+            print(f"File: {item['page']}")
+            print(f"  Broken link: {item['href']} ({item['status']})")
             print()
     else:
         print("✅ No other broken links found!")
@@ -108,7 +55,7 @@ def check_article_links():
     print(f"Total other broken links: {len(other_broken)}")
     
     if broken_links or other_broken:
-        print("\n💡 TIP: Directory-style URLs (ending with /) need to be changed to file-style URLs (.html)")
+        print("\n💡 TIP: Run python3 tools/link_graph.py redirects to see how each link is resolved")
     else:
         print("\n🎉 All links are working correctly!")
 
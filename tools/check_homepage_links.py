@@ -2,27 +2,23 @@
 """
 Simple Link Checker for Homepage
 
-This script checks if all the links on the homepage point to existing files.
+This script checks if all the links on the homepage point to existing files,
+following netlify.toml redirects (see tools/link_graph.py).
 """
 
-import os
-import re
-from pathlib import Path
+from link_graph import LinkGraph
 
 def check_homepage_links():
     """Check all links in the homepage."""
     print("=== HOMEPAGE LINK CHECKER ===")
     
-    try:
-        with open('index.html', 'r', encoding='utf-8') as f:
-            content = f.read()
-    except FileNotFoundError:
+    graph = LinkGraph().build()
+    if 'index.html' not in graph.edges:
         print("❌ index.html not found")
         return False
     
-    # Find all href links
-    href_pattern = r'href="([^"]+)"'
-    links = re.findall(href_pattern, content)
+    internal = {edge['href']: edge for edge in graph.edges['index.html']}
+    links = [href for attr, href in graph.pages['index.html']['links'] if attr == 'href']
     
     print(f"Found {len(links)} links to check:")
     print()
@@ -31,46 +27,20 @@ def check_homepage_links():
     working_links = []
     
     for link in links:
-        if link.startswith('http'):
-            # External link - skip for now
+        edge = internal.get(link)
+        if edge is None:
+            # External, anchor or mailto link - skip
             working_links.append(link)
-            print(f"🌐 {link} (external)")
-            continue
-            
-        if link.startswith('#'):
-            # Anchor link - skip
+            print(f"🌐 {link} (not a site page)")
+        elif edge['status'] == 'ok':
             working_links.append(link)
-            print(f"🔗 {link} (anchor)")
-            continue
-            
-        if link.startswith('/'):
-            # Absolute path
-            file_path = link[1:]  # Remove leading slash
-        else:
-            # Relative path
-            file_path = link
-            
-        # Handle query parameters
-        if '?' in file_path:
-            file_path = file_path.split('?')[0]
-            
-        # Special case for root path
-        if file_path == '':
-            file_path = 'index.html'
-            
-        # Check if file exists
-        if os.path.exists(file_path):
-            working_links.append(link)
-            print(f"✅ {link}")
-        elif os.path.exists(file_path + '.html'):
-            working_links.append(link)
-            print(f"✅ {link} (redirects to {file_path}.html)")
-        elif os.path.exists(file_path + '/index.html'):
-            working_links.append(link)
-            print(f"✅ {link} (serves {file_path}/index.html)")
+            if edge['chain']:
+                print(f"✅ {link} (redirects to {edge['chain'][-1][1]})")
+            else:
+                print(f"✅ {link} (serves {edge['target']})")
         else:
             broken_links.append(link)
-            print(f"❌ {link} (FILE NOT FOUND)")
+            print(f"❌ {link} ({edge['status'].upper()})")
     
     print()
     print("=== SUMMARY ===")
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Check Search Manifest
+
+This script checks that search-shards/manifest.json and the content-hashed
+files it references (tools/build_search_index.py) are consistent: every file
+exists, its name, hash and size match its content, its item counts (shards
+and per-language article modules) match the manifest, the full-index copy matches search-index.json, the typo index only
+refers to indexed terms, and the language shards together cover the whole
+index. Files under search-shards/data/ that no manifest references are
+reported as stale.
+
+Usage:
+    python3 tools/check_search_manifest.py
+"""
+
+import os
+import sys
+import json
+import hashlib
+from typing import List, Tuple
+
+from build_search_index import (INDEX_PATH, SHARDS_DATA_DIR, SHARDS_DIR, SHARDS_VERSION,
+                                manifest_files)
+from fingerprint_assets import RE_FINGERPRINTED
+
+
+def load_entry(shards_dir: str, label: str, entry: dict, errors: List[str]):
+    """Load the file of a manifest entry, checking name, hash and size; returns its data or None."""
+    path = os.path.join(shards_dir, entry.get('file', ''))
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except OSError:
+        errors.append(f"{label}: {entry.get('file')} is missing")
+        return None
+    digest = hashlib.sha1(raw).hexdigest()[:len(entry.get('hash', ''))]
+    m = RE_FINGERPRINTED.match(entry['file'])
+    if not m or m.group(2) != entry.get('hash') or digest != entry.get('hash'):
+        errors.append(f"{label}: {entry['file']} does not match its hash ({digest})")
+    if entry.get('bytes') != len(raw):
+        errors.append(f"{label}: {entry['file']} is {len(raw)} bytes, manifest says {entry.get('bytes')}")
+    try:
+        return json.loads(raw.decode('utf-8'))
+    except ValueError:
+        errors.append(f"{label}: {entry['file']} is not valid JSON")
+        return None
+
+
+def check_search_manifest(root: str = ".") -> Tuple[List[str], List[str]]:
+    """Check the search manifest under root; returns (errors, stale files)."""
+    shards_dir = os.path.join(root, SHARDS_DIR)
+    try:
+        with open(os.path.join(shards_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError) as e:
+        return [f"manifest.json cannot be read: {e}"], []
+    if manifest.get('version') != SHARDS_VERSION:
+        return [f"manifest.json has version {manifest.get('version')}, expected {SHARDS_VERSION}"], []
+
+    errors = []
+    for key in ('index', 'inverted', 'fuzzy', 'articles'):
+        if key not in manifest:
+            errors.append(f"manifest.json has no '{key}' entry")
+
+    index = load_entry(shards_dir, 'index', manifest['index'], errors) if 'index' in manifest else None
+    if index is not None:
+        if len(index) != manifest['index'].get('count'):
+            errors.append(f"index: {len(index)} items, manifest says {manifest['index'].get('count')}")
+        try:
+            with open(os.path.join(root, INDEX_PATH), 'r', encoding='utf-8') as f:
+                if json.load(f) != index:
+                    errors.append(f"index: {manifest['index']['file']} differs from {INDEX_PATH}")
+        except (OSError, ValueError):
+            errors.append(f"{INDEX_PATH} cannot be read")
+
+    inverted = load_entry(shards_dir, 'inverted', manifest['inverted'], errors) if 'inverted' in manifest else None
+    if inverted is not None and index is not None and inverted.get('count') != len(index):
+        errors.append(f"inverted: built for {inverted.get('count')} items, index has {len(index)}")
+
+    fuzzy = load_entry(shards_dir, 'fuzzy', manifest['fuzzy'], errors) if 'fuzzy' in manifest else None
+    if fuzzy is not None and inverted is not None:
+        unknown = [t for t in fuzzy.get('terms', []) if t not in inverted.get('terms', {})]
+        if unknown:
+            errors.append(f"fuzzy: {len(unknown)} term(s) not in the inverted index (e.g. {unknown[0]})")
+        size = len(fuzzy.get('terms', []))
+        if any(not 0 <= i < size for ids in fuzzy.get('trigrams', {}).values() for i in ids):
+            errors.append("fuzzy: trigram postings point outside the vocabulary")
+
+    language_items = 0
+    for key, entry in sorted(manifest.get('shards', {}).items()):
+        shard = load_entry(shards_dir, f"shard {key}", entry, errors)
+        if shard is None:
+            continue
+        if len(shard.get('items', [])) != entry.get('count'):
+            errors.append(f"shard {key}: {len(shard.get('items', []))} items, manifest says {entry.get('count')}")
+        if '/' not in key:
+            language_items += len(shard.get('items', []))
+    if index is not None and language_items != len(index):
+        errors.append(f"language shards hold {language_items} items, index has {len(index)}")
+
+    for lang, entry in sorted(manifest.get('articles', {}).items()):
+        module = load_entry(shards_dir, f"articles {lang}", entry, errors)
+        if module is not None and len(module.get('items', [])) != entry.get('count'):
+            errors.append(f"articles {lang}: {len(module.get('items', []))} cards, manifest says {entry.get('count')}")
+
+    # The previous build's files are kept on purpose; anything else is stale
+    referenced = manifest_files(manifest)
+    stale = []
+    data_dir = os.path.join(shards_dir, SHARDS_DATA_DIR)
+    if os.path.isdir(data_dir):
+        for name in sorted(os.listdir(data_dir)):
+            if name.endswith(('.gz', '.br')):
+                continue
+            if f"{SHARDS_DATA_DIR}/{name}" not in referenced:
+                stale.append(f"{SHARDS_DATA_DIR}/{name}")
+    return errors, stale
+
+
+def main():
+    """Main entry point."""
+    print("=== CHECKING SEARCH MANIFEST ===")
+    errors, stale = check_search_manifest()
+    if stale:
+        print(f"ℹ️  {len(stale)} unreferenced file(s) in {SHARDS_DIR}/{SHARDS_DATA_DIR}/ "
+              "(the previous build's are kept until the next one):")
+        for name in stale:
+            print(f"  {name}")
+    if errors:
+        print(f"❌ {len(errors)} problem(s) found:")
+        for error in errors:
+            print(f"  {error}")
+        print("\n💡 TIP: Run python3 tools/build_search_index.py to rebuild the index and manifest")
+        sys.exit(1)
+    print("✅ Manifest, hashed files and search-index.json are consistent")
+
+
+if __name__ == "__main__":
+    main()
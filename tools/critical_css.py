@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Critical CSS Inliner
+
+Stops pages from blocking their first render on the whole of
+assets/styles.css:
+1. Pages are grouped by template (home, article, category, quiz, search, page)
+2. For each template, every selector of assets/styles.css is matched against
+   the above-the-fold elements of the template's pages (tools/css_tools.py);
+   the matching rules, in source order and with their @media blocks, are the
+   template's critical CSS
+3. The critical CSS is inlined as <style id="critical-css"> where the
+   stylesheet <link> was, and the full stylesheet is loaded asynchronously
+   (rel="preload" + onload, with a <noscript> fallback)
+Critical CSS is cached per template in .build-cache/critical-css.json, keyed
+by the stylesheet and the template's pages, so only templates whose pages or
+styles changed are recomputed. Re-running updates the inlined CSS in place.
+
+Usage:
+    python3 tools/critical_css.py [--dry-run] [--no-cache]
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from backup_store import BackupStore
+from css_tools import Document, FOLD_ELEMENTS, TEMPLATES, page_template, parse_stylesheet, serialize
+from fingerprint_assets import source_path
+from html_corpus import atomic_write_text, get_corpus
+from link_graph import site_path
+
+STYLESHEET = 'assets/styles.css'
+CACHE_PATH = '.build-cache/critical-css.json'
+CACHE_VERSION = 1
+
+# At-rules the first render needs; @keyframes can wait for the full stylesheet
+CRITICAL_AT_RULES = ('@charset', '@import', '@font-face')
+
+RE_LINK_TAG = re.compile(r'<link\b[^>]*>', re.IGNORECASE)
+RE_CRITICAL_STYLE = re.compile(r'(<style id="critical-css">)(.*?)(</style>)', re.DOTALL)
+RE_CRITICAL_BLOCK = re.compile(
+    r'<style id="critical-css">.*?</style>\s*'
+    r'<link rel="preload" href="([^"]*)" as="style" onload="[^"]*">\s*'
+    r'<noscript><link rel="stylesheet" href="\1"></noscript>', re.DOTALL)
+RE_ATTR = re.compile(r'([\w:-]+)\s*=\s*("([^"]*)"|\'([^\']*)\')')
+
+
+def critical_rules(rules, docs: List[Document]):
+    """Rules (with only their used selectors) that style above-the-fold elements."""
+    used = set()
+    selectors = list(dict.fromkeys(s for rule in rules if not rule.at for s in rule.selectors))
+    for doc in docs:
+        remaining = [s for s in selectors if s not in used]
+        used.update(s for s in remaining if doc.uses(s, above_fold=True))
+
+    selected = []
+    for rule in rules:
+        if rule.at:
+            if rule.at.lower().startswith(CRITICAL_AT_RULES):
+                selected.append(rule)
+            continue
+        keep = [s for s in rule.selectors if s in used]
+        if keep:
+            selected.append(rule.with_selectors(keep))
+    return selected
+
+
+def stylesheet_links(content: str, page_url: str, stylesheet: str = STYLESHEET) -> List[tuple]:
+    """(match, href) of the render-blocking <link rel="stylesheet"> tags loading the stylesheet."""
+    links = []
+    for match in RE_LINK_TAG.finditer(content):
+        attrs = {m.group(1).lower(): m.group(3) if m.group(3) is not None else m.group(4)
+                 for m in RE_ATTR.finditer(match.group(0))}
+        if attrs.get('rel', '').lower() != 'stylesheet' or not attrs.get('href'):
+            continue
+        if source_path(site_path(page_url, attrs['href']) or '') == '/' + stylesheet:
+            links.append((match, attrs['href']))
+    return links
+
+
+def inline_critical(content: str, css: str, page_url: str, stylesheet: str = STYLESHEET) -> str:
+    """Inline css and make the stylesheet load asynchronously; updates a previous run in place."""
+    if RE_CRITICAL_STYLE.search(content):
+        return RE_CRITICAL_STYLE.sub(lambda m: m.group(1) + css + m.group(3), content, count=1)
+
+    head_end = content.lower().find('</head>')
+    links = [(m, href) for m, href in stylesheet_links(content, page_url, stylesheet)
+             if head_end < 0 or m.start() < head_end]
+    if not links:
+        return content
+    match, href = links[0]
+    replacement = (
+        f'<style id="critical-css">{css}</style>\n'
+        f'    <link rel="preload" href="{href}" as="style" onload="this.onload=null;this.rel=\'stylesheet\'">\n'
+        f'    <noscript><link rel="stylesheet" href="{href}"></noscript>'
+    )
+    # Later duplicate links of the same stylesheet would block rendering again
+    for dup, _ in reversed(links[1:]):
+        content = content[:dup.start()] + content[dup.end():]
+    return content[:match.start()] + replacement + content[match.end():]
+
+
+def original_page(content: str) -> str:
+    """Page content as it was before inlining, so a page's key survives our own rewrite."""
+    content = RE_CRITICAL_BLOCK.sub(r'<link rel="stylesheet" href="\1">', content)
+    return RE_CRITICAL_STYLE.sub(r'\1\3', content)
+
+
+def cache_key(css_text: str, pages: List[str]) -> str:
+    """Key of a template: tool settings, stylesheet and (stripped) page contents."""
+    h = hashlib.sha1(f"{CACHE_VERSION}:{FOLD_ELEMENTS}\n".encode())
+    h.update(css_text.encode('utf-8'))
+    for content in pages:
+        h.update(b"\0" + content.encode('utf-8'))
+    return h.hexdigest()
+
+
+def build_templates(root: str = ".", use_cache: bool = True, cache_path: Optional[str] = None,
+                    stylesheet: str = STYLESHEET, log=print) -> Dict[str, dict]:
+    """Critical CSS per template: {template: {css, pages, cached}}."""
+    root_path = Path(root)
+    css_text = (root_path / stylesheet).read_text(encoding='utf-8')
+    cache_path = cache_path or str(root_path / CACHE_PATH)
+    cached = {}
+    if use_cache:
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cached = json.load(f).get('templates', {})
+        except (OSError, ValueError):
+            pass
+
+    groups: Dict[str, list] = {name: [] for name in TEMPLATES}
+    for doc in get_corpus(root).decodable(log):
+        if RE_CRITICAL_STYLE.search(doc.text) or stylesheet_links(doc.text, doc.url, stylesheet):
+            groups[page_template(doc.path.as_posix())].append(doc)
+
+    rules = None
+    results = {}
+    for name, docs in groups.items():
+        if not docs:
+            continue
+        pages = [original_page(doc.text) for doc in docs]
+        key = cache_key(css_text, pages)
+        entry = cached.get(name)
+        if entry and entry.get('key') == key:
+            results[name] = {'css': entry['css'], 'pages': docs, 'cached': True}
+            continue
+        if rules is None:
+            rules = parse_stylesheet(css_text)
+        css = serialize(critical_rules(rules, [Document(page) for page in pages]))
+        results[name] = {'css': css, 'pages': docs, 'cached': False}
+        cached[name] = {'key': key, 'css': css}
+
+    if use_cache:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        atomic_write_text(Path(cache_path), json.dumps({'version': CACHE_VERSION, 'templates': cached}))
+    return results
+
+
+def run(root: str = ".", dry_run: bool = False, use_cache: bool = True, backup_dir=None, log=print) -> dict:
+    """Inline each template's critical CSS into its pages."""
+    templates = build_templates(root, use_cache, log=log)
+    backups = BackupStore(backup_dir) if backup_dir else BackupStore()
+    full_size = len(serialize(parse_stylesheet((Path(root) / STYLESHEET).read_text(encoding='utf-8'))))
+    stats = {'templates': {}, 'changed': 0}
+
+    for name, result in templates.items():
+        changed = 0
+        for doc in result['pages']:
+            content = inline_critical(doc.text, result['css'], doc.url)
+            if content == doc.text:
+                continue
+            changed += 1
+            if not dry_run:
+                backups.save(doc.path, doc.data, tool="critical_css")
+                doc.write_text(content)
+        stats['changed'] += changed
+        stats['templates'][name] = {
+            'pages': len(result['pages']), 'changed': changed, 'cached': result['cached'],
+            'bytes': len(result['css'].encode('utf-8')), 'full_bytes': full_size,
+        }
+        log(f"{name:<9} {len(result['pages']):>3} pages  {stats['templates'][name]['bytes']:>6} / {full_size} bytes"
+            f"  {'(cached)' if result['cached'] else '(computed)'}  "
+            f"{changed} {'to update' if dry_run else 'updated'}")
+    return stats
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Inline per-template critical CSS and load the stylesheet asynchronously")
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    parser.add_argument('--no-cache', action='store_true', help='Recompute every template')
+    args = parser.parse_args()
+
+    print("=== CRITICAL CSS ===")
+    stats = run(dry_run=args.dry_run, use_cache=not args.no_cache)
+    print(f"\nPages {'to update' if args.dry_run else 'updated'}: {stats['changed']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,492 @@
+#!/usr/bin/env python3
+"""
+CSS Tools
+
+Shared helpers for the CSS build steps:
+- parse_stylesheet(): splits a stylesheet into rules (selectors, declarations,
+  enclosing @media/@supports chain), keeping source order
+- serialize(): writes a list of rules back out, minified, re-grouping
+  consecutive rules under their @media blocks
+- Document: a light DOM of an HTML page (html.parser), indexed by tag, id and
+  class, with an above-the-fold cut-off
+- parse_selector()/matches(): a CSS selector matcher covering type, id, class,
+  attribute, combinators and the structural pseudo-classes; state
+  pseudo-classes (:hover, :focus, ...) and pseudo-elements match their host
+  element, and anything it cannot parse is treated as used
+- page_template(): which page template (home, article, ...) a page belongs to
+
+Usage:
+    python3 tools/css_tools.py [stylesheet] [page.html]
+"""
+
+import re
+import sys
+from html.parser import HTMLParser
+from typing import Dict, Iterable, List, Optional, Tuple
+
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+             'param', 'source', 'track', 'wbr'}
+# Elements that are never rendered, nor anything inside them
+HIDDEN_TAGS = {'head', 'script', 'style', 'noscript', 'template', 'meta', 'link', 'title'}
+
+# Number of rendered <body> elements treated as above the fold
+FOLD_ELEMENTS = 150
+
+# Page templates, first match wins; anything else is "page"
+TEMPLATE_RULES = [
+    ('home', re.compile(r'^(es/)?index\.html$')),
+    ('search', re.compile(r'^(es/)?(search|buscar)/')),
+    ('quiz', re.compile(r'^(es/)?quiz/')),
+    ('category', re.compile(r'^(categories|es/categorias)/')),
+    ('article', re.compile(r'^(articles|es/articulos)/')),
+]
+TEMPLATES = [name for name, _ in TEMPLATE_RULES] + ['page']
+
+LEGACY_PSEUDO_ELEMENTS = {'before', 'after', 'first-line', 'first-letter'}
+
+
+def page_template(path: str) -> str:
+    """Template name of a page from its path relative to the site root."""
+    path = path.replace('\\', '/')
+    for name, pattern in TEMPLATE_RULES:
+        if pattern.search(path):
+            return name
+    return 'page'
+
+
+# Stylesheet parsing
+
+class CssRule:
+    __slots__ = ('selectors', 'body', 'media', 'at')
+
+    def __init__(self, selectors: List[str], body: Optional[str], media: Tuple[str, ...] = (), at: Optional[str] = None):
+        self.selectors = selectors
+        self.body = body
+        self.media = media
+        self.at = at
+
+    def __repr__(self) -> str:
+        return f"CssRule({self.at or ', '.join(self.selectors)!r}, media={self.media!r})"
+
+    def with_selectors(self, selectors: List[str]) -> 'CssRule':
+        return CssRule(selectors, self.body, self.media, self.at)
+
+
+RE_COMMENT = re.compile(r'/\*.*?\*/', re.DOTALL)
+GROUPING_AT_RULES = ('@media', '@supports', '@layer', '@container')
+
+
+def _scan(text: str, pos: int, stops: str) -> int:
+    """Index of the first stop character outside strings and brackets (len(text) if none)."""
+    depth = 0
+    quote = None
+    while pos < len(text):
+        ch = text[pos]
+        if quote:
+            if ch == '\\':
+                pos += 1
+            elif ch == quote:
+                quote = None
+        elif ch in '"\'':
+            quote = ch
+        elif depth <= 0 and ch in stops:
+            return pos
+        elif ch in '([':
+            depth += 1
+        elif ch in ')]':
+            depth -= 1
+        pos += 1
+    return pos
+
+
+def _block_end(text: str, pos: int) -> int:
+    """Index of the '}' closing the block whose '{' is at pos."""
+    depth = 0
+    while pos < len(text):
+        pos = _scan(text, pos, '{}')
+        if pos >= len(text):
+            break
+        depth += 1 if text[pos] == '{' else -1
+        if depth == 0:
+            return pos
+        pos += 1
+    return len(text)
+
+
+def split_selectors(prelude: str) -> List[str]:
+    parts, pos = [], 0
+    while pos <= len(prelude):
+        end = _scan(prelude, pos, ',')
+        part = ' '.join(prelude[pos:end].split())
+        if part:
+            parts.append(part)
+        pos = end + 1
+    return parts
+
+
+def _parse_block(text: str, pos: int, media: Tuple[str, ...], rules: List[CssRule]) -> int:
+    while pos < len(text):
+        stop = _scan(text, pos, '{;}')
+        prelude = ' '.join(text[pos:stop].split())
+        if stop >= len(text) or text[stop] == '}':
+            return stop + 1
+        if text[stop] == ';':
+            if prelude:
+                rules.append(CssRule([], None, media, prelude))
+            pos = stop + 1
+            continue
+        if prelude.lower().startswith(GROUPING_AT_RULES):
+            pos = _parse_block(text, stop + 1, media + (prelude,), rules)
+            continue
+        end = _block_end(text, stop)
+        body = ' '.join(text[stop + 1:end].split())
+        if prelude.startswith('@'):
+            rules.append(CssRule([], body, media, prelude))
+        elif prelude:
+            rules.append(CssRule(split_selectors(prelude), body, media))
+        pos = end + 1
+    return pos
+
+
+def parse_stylesheet(css: str) -> List[CssRule]:
+    """All rules of a stylesheet in source order."""
+    rules: List[CssRule] = []
+    _parse_block(RE_COMMENT.sub('', css), 0, (), rules)
+    return rules
+
+
+def serialize(rules: Iterable[CssRule]) -> str:
+    """Minified CSS for rules, nesting them back into their @media blocks."""
+    out: List[str] = []
+    current: Tuple[str, ...] = ()
+    for rule in rules:
+        common = 0
+        while common < min(len(current), len(rule.media)) and current[common] == rule.media[common]:
+            common += 1
+        out.append('}' * (len(current) - common))
+        out.extend(prelude + '{' for prelude in rule.media[common:])
+        current = rule.media
+        head = rule.at if rule.at else ','.join(rule.selectors)
+        out.append(head + ';' if rule.body is None else head + '{' + rule.body + '}')
+    out.append('}' * len(current))
+    return ''.join(out)
+
+
+# HTML documents
+
+class Element:
+    __slots__ = ('tag', 'attrs', 'id', 'classes', 'parent', 'children', 'index', 'position', 'hidden')
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional['Element'], index: int):
+        self.tag = tag
+        self.attrs = attrs
+        self.id = attrs.get('id')
+        self.classes = frozenset(attrs.get('class', '').split())
+        self.parent = parent
+        self.children: List['Element'] = []
+        self.index = index
+        self.position = len(parent.children) if parent else 0
+        self.hidden = tag in HIDDEN_TAGS or bool(parent and parent.hidden)
+
+    def __repr__(self) -> str:
+        return f"<{self.tag}#{self.id or ''}.{'.'.join(sorted(self.classes))}>"
+
+
+class DomBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element('#document', {}, None, -1)
+        self.stack = [self.root]
+        self.elements: List[Element] = []
+
+    def handle_starttag(self, tag, attrs):
+        parent = self.stack[-1]
+        element = Element(tag, {k: v or '' for k, v in attrs}, parent, len(self.elements))
+        parent.children.append(element)
+        self.elements.append(element)
+        if tag not in VOID_TAGS:
+            self.stack.append(element)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.stack.pop()
+
+    def handle_endtag(self, tag):
+        for i in range(len(self.stack) - 1, 0, -1):
+            if self.stack[i].tag == tag:
+                del self.stack[i:]
+                return
+
+
+class Document:
+    """Parsed page with tag/id/class indexes for selector matching."""
+
+    def __init__(self, html: str, fold_elements: int = FOLD_ELEMENTS):
+        builder = DomBuilder()
+        builder.feed(html)
+        builder.close()
+        self.elements = builder.elements
+        self.by_tag: Dict[str, List[Element]] = {}
+        self.by_id: Dict[str, List[Element]] = {}
+        self.by_class: Dict[str, List[Element]] = {}
+        for element in self.elements:
+            self.by_tag.setdefault(element.tag, []).append(element)
+            if element.id:
+                self.by_id.setdefault(element.id, []).append(element)
+            for cls in element.classes:
+                self.by_class.setdefault(cls, []).append(element)
+
+        # Elements with an index below fold_index are above the fold
+        self.fold_index = len(self.elements)
+        body = self.by_tag.get('body')
+        if body:
+            rendered = [e.index for e in self.elements if e.index > body[0].index and not e.hidden]
+            if len(rendered) > fold_elements:
+                self.fold_index = rendered[fold_elements]
+
+    def candidates(self, compound: 'Compound') -> List[Element]:
+        """Elements that could match a compound selector, from the smallest index."""
+        if compound.id:
+            return self.by_id.get(compound.id, [])
+        if compound.classes:
+            return min((self.by_class.get(c, []) for c in compound.classes), key=len)
+        if compound.tag and compound.tag != '*':
+            return self.by_tag.get(compound.tag, [])
+        return self.elements
+
+    def select(self, selector: str, above_fold: bool = False) -> List[Element]:
+        """Elements matching a selector (all of them if it cannot be parsed)."""
+        parts = parse_selector(selector)
+        limit = self.fold_index if above_fold else len(self.elements)
+        if parts is None:
+            return [e for e in self.elements if e.index < limit]
+        return [e for e in self.candidates(parts[-1][1]) if e.index < limit and matches(e, parts)]
+
+    def uses(self, selector: str, above_fold: bool = False) -> bool:
+        parts = parse_selector(selector)
+        if parts is None:
+            return True
+        limit = self.fold_index if above_fold else len(self.elements)
+        return any(e.index < limit and matches(e, parts) for e in self.candidates(parts[-1][1]))
+
+
+# Selector matching
+
+class Compound:
+    __slots__ = ('tag', 'id', 'classes', 'attrs', 'pseudos')
+
+    def __init__(self):
+        self.tag: Optional[str] = None
+        self.id: Optional[str] = None
+        self.classes: set = set()
+        self.attrs: List[Tuple[str, Optional[str], Optional[str], bool]] = []
+        self.pseudos: List[Tuple[str, Optional[str]]] = []
+
+
+RE_COMBINATOR = re.compile(r'\s*([>+~])\s*|\s+')
+RE_TYPE = re.compile(r'\*|[a-zA-Z][\w-]*')
+RE_NAME = re.compile(r'-?[_a-zA-Z][\w-]*')
+RE_ATTRIBUTE = re.compile(
+    r'\[\s*([\w-]+)\s*(?:([~|^$*]?=)\s*(?:"([^"]*)"|\'([^\']*)\'|([^\]\s]+))\s*([iIsS])?\s*)?\]')
+RE_PSEUDO = re.compile(r'(::?)([\w-]+)')
+RE_NTH = re.compile(r'^\s*(?:([+-]?\d*)n\s*(?:([+-])\s*(\d+))?|([+-]?\d+))\s*$')
+
+_selector_cache: Dict[str, Optional[List[Tuple[str, Compound]]]] = {}
+
+
+def parse_selector(text: str) -> Optional[List[Tuple[str, Compound]]]:
+    """[(combinator, compound), ...] left to right, or None if unsupported."""
+    if text in _selector_cache:
+        return _selector_cache[text]
+    parts = _parse_selector(text.strip())
+    _selector_cache[text] = parts
+    return parts
+
+
+def _parse_selector(text: str) -> Optional[List[Tuple[str, Compound]]]:
+    parts: List[Tuple[str, Compound]] = []
+    combinator, compound, empty = '', Compound(), True
+    pos = 0
+    while pos < len(text):
+        m = RE_COMBINATOR.match(text, pos)
+        if m:
+            if empty:
+                return None
+            parts.append((combinator, compound))
+            combinator, compound, empty = m.group(1) or ' ', Compound(), True
+            pos = m.end()
+            continue
+        ch = text[pos]
+        if ch == '#' or ch == '.':
+            m = RE_NAME.match(text, pos + 1)
+            if not m:
+                return None
+            if ch == '#':
+                compound.id = m.group(0)
+            else:
+                compound.classes.add(m.group(0))
+        elif ch == '[':
+            m = RE_ATTRIBUTE.match(text, pos)
+            if not m:
+                return None
+            value = next((v for v in m.group(3, 4, 5) if v is not None), None)
+            compound.attrs.append((m.group(1).lower(), m.group(2), value, (m.group(6) or '').lower() == 'i'))
+        elif ch == ':':
+            m = RE_PSEUDO.match(text, pos)
+            if not m:
+                return None
+            name = m.group(2).lower()
+            arg = None
+            end = m.end()
+            if end < len(text) and text[end] == '(':
+                close = _scan(text, end + 1, ')')
+                arg = text[end + 1:close]
+                end = close + 1
+            # Pseudo-elements style their host element
+            if m.group(1) == ':' and name not in LEGACY_PSEUDO_ELEMENTS:
+                compound.pseudos.append((name, arg))
+            pos = end
+            empty = False
+            continue
+        elif empty and compound.tag is None:
+            m = RE_TYPE.match(text, pos)
+            if not m:
+                return None
+            compound.tag = m.group(0).lower()
+        else:
+            return None
+        pos = m.end()
+        empty = False
+    if empty:
+        return None
+    parts.append((combinator, compound))
+    return parts
+
+
+def matches(element: Element, parts: List[Tuple[str, Compound]], i: Optional[int] = None) -> bool:
+    """True if element matches the parsed selector (matched right to left)."""
+    i = len(parts) - 1 if i is None else i
+    combinator, compound = parts[i]
+    if not match_compound(element, compound):
+        return False
+    if i == 0:
+        return True
+    parent = element.parent
+    if combinator == '>':
+        return parent is not None and parent.index >= 0 and matches(parent, parts, i - 1)
+    if combinator == ' ':
+        while parent is not None and parent.index >= 0:
+            if matches(parent, parts, i - 1):
+                return True
+            parent = parent.parent
+        return False
+    siblings = parent.children[:element.position] if parent else []
+    if combinator == '+':
+        return bool(siblings) and matches(siblings[-1], parts, i - 1)
+    return any(matches(sibling, parts, i - 1) for sibling in siblings)
+
+
+def match_compound(element: Element, compound: Compound) -> bool:
+    if compound.tag and compound.tag != '*' and compound.tag != element.tag:
+        return False
+    if compound.id and compound.id != element.id:
+        return False
+    if compound.classes and not compound.classes <= element.classes:
+        return False
+    for name, op, value, icase in compound.attrs:
+        actual = element.attrs.get(name)
+        if actual is None:
+            return False
+        if op is None:
+            continue
+        if icase:
+            actual, value = actual.lower(), value.lower()
+        if not ((op == '=' and actual == value)
+                or (op == '~=' and value in actual.split())
+                or (op == '|=' and (actual == value or actual.startswith(value + '-')))
+                or (op == '^=' and value and actual.startswith(value))
+                or (op == '$=' and value and actual.endswith(value))
+                or (op == '*=' and value and value in actual)):
+            return False
+    return all(match_pseudo(element, name, arg) for name, arg in compound.pseudos)
+
+
+def nth_matches(expr: str, position: int) -> bool:
+    """position (1-based) matches an an+b expression."""
+    expr = expr.split(' of ')[0].strip().lower()
+    if expr == 'odd':
+        return position % 2 == 1
+    if expr == 'even':
+        return position % 2 == 0
+    m = RE_NTH.match(expr)
+    if not m:
+        return True
+    if m.group(4) is not None:
+        return position == int(m.group(4))
+    a = {'': 1, '+': 1, '-': -1}.get(m.group(1), None)
+    a = int(m.group(1)) if a is None else a
+    b = int(m.group(3) or 0) * (-1 if m.group(2) == '-' else 1)
+    if a == 0:
+        return position == b
+    return (position - b) % a == 0 and (position - b) // a >= 0
+
+
+def match_pseudo(element: Element, name: str, arg: Optional[str]) -> bool:
+    parent = element.parent
+    siblings = parent.children if parent else [element]
+    same_type = [e for e in siblings if e.tag == element.tag]
+    if name == 'root':
+        return element.tag == 'html'
+    if name == 'first-child':
+        return element.position == 0
+    if name == 'last-child':
+        return element.position == len(siblings) - 1
+    if name == 'only-child':
+        return len(siblings) == 1
+    if name == 'first-of-type':
+        return same_type[0] is element
+    if name == 'last-of-type':
+        return same_type[-1] is element
+    if name == 'only-of-type':
+        return len(same_type) == 1
+    if name == 'nth-child' and arg:
+        return nth_matches(arg, element.position + 1)
+    if name == 'nth-last-child' and arg:
+        return nth_matches(arg, len(siblings) - element.position)
+    if name == 'nth-of-type' and arg:
+        return nth_matches(arg, same_type.index(element) + 1)
+    if name == 'nth-last-of-type' and arg:
+        return nth_matches(arg, len(same_type) - same_type.index(element))
+    if name == 'not' and arg:
+        inner = [parse_selector(s) for s in split_selectors(arg)]
+        if any(p is None for p in inner):
+            return True
+        return not any(matches(element, p) for p in inner)
+    if name in ('is', 'where', 'matches') and arg:
+        inner = [parse_selector(s) for s in split_selectors(arg)]
+        return any(p is None or matches(element, p) for p in inner)
+    # State pseudo-classes (:hover, :checked, ...), :has(), vendor prefixes and anything unknown
+    return True
+
+
+def main():
+    """Print rule and match counts for a stylesheet and a page."""
+    css_path = sys.argv[1] if len(sys.argv) > 1 else 'assets/styles.css'
+    page_path = sys.argv[2] if len(sys.argv) > 2 else 'index.html'
+    with open(css_path, 'r', encoding='utf-8') as f:
+        rules = parse_stylesheet(f.read())
+    with open(page_path, 'r', encoding='utf-8') as f:
+        doc = Document(f.read())
+
+    selectors = [s for r in rules if not r.at for s in r.selectors]
+    unsupported = [s for s in selectors if parse_selector(s) is None]
+    used = [s for s in selectors if doc.uses(s)]
+    above = [s for s in selectors if doc.uses(s, above_fold=True)]
+    print(f"{css_path}: {len(rules)} rules, {len(selectors)} selectors ({len(unsupported)} unsupported)")
+    print(f"{page_path} [{page_template(page_path)}]: {len(doc.elements)} elements, "
+          f"{len(used)} selectors used, {len(above)} above the fold")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,42 +6,56 @@ This script helps you identify where gtag.js implementations might be coming fro
 on your live site that aren't in your local files.
 
 Usage:
-    python3 tools/debug_live_site.py
+    python3 tools/debug_live_site.py [--sitemap [sitemap.xml]] [--base-url URL]
+
+Pages are fetched concurrently over pooled connections with a response
+cache (see tools/live_crawler.py).
 """
 
-import requests
 import re
-from urllib.parse import urljoin, urlparse
+import argparse
 
-def check_page_for_gtag(url: str) -> dict:
-    """Check a live page for gtag implementations."""
-    try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        content = response.text
-        
-        # Look for gtag implementations
-        gtag_js_matches = re.findall(r'https://www\.googletagmanager\.com/gtag/js[^"\'>\s]*', content, re.IGNORECASE)
-        gtag_dest_matches = re.findall(r'https://www\.googletagmanager\.com/gtag/destination[^"\'>\s]*', content, re.IGNORECASE)
-        gtag_calls = re.findall(r'gtag\([^)]*\)', content, re.IGNORECASE)
-        ga4_refs = re.findall(r'G-H1Q1KL01RP', content)
-        
-        return {
-            "url": url,
-            "status": "success",
-            "gtag_js_urls": gtag_js_matches,
-            "gtag_dest_urls": gtag_dest_matches,
-            "gtag_calls": gtag_calls,
-            "ga4_references": ga4_refs,
-            "has_gtag": len(gtag_js_matches) > 0 or len(gtag_dest_matches) > 0 or len(gtag_calls) > 0
-        }
-    except Exception as e:
+from live_crawler import CrawlResult, LiveCrawler, rebase_url, sitemap_urls
+
+# URLs checked when no sitemap is requested
+DEFAULT_URLS = [
+    "https://affordable-handbags.com/",
+    "https://affordable-handbags.com/articles/",
+    "https://affordable-handbags.com/articles/backpacks/",
+    "https://affordable-handbags.com/es/",
+    "https://affordable-handbags.com/es/articulos/"
+]
+
+def analyze_result(result: CrawlResult) -> dict:
+    """Look for gtag implementations in a fetched page."""
+    if not result.ok:
         return {
-            "url": url,
+            "url": result.url,
             "status": "error",
-            "error": str(e),
+            "error": result.error or f"HTTP {result.status}",
             "has_gtag": False
         }
+    content = result.text
+    
+    # Look for gtag implementations
+    gtag_js_matches = re.findall(r'https://www\.googletagmanager\.com/gtag/js[^"\'>\s]*', content, re.IGNORECASE)
+    gtag_dest_matches = re.findall(r'https://www\.googletagmanager\.com/gtag/destination[^"\'>\s]*', content, re.IGNORECASE)
+    gtag_calls = re.findall(r'gtag\([^)]*\)', content, re.IGNORECASE)
+    ga4_refs = re.findall(r'G-H1Q1KL01RP', content)
+    
+    return {
+        "url": result.url,
+        "status": "success",
+        "gtag_js_urls": gtag_js_matches,
+        "gtag_dest_urls": gtag_dest_matches,
+        "gtag_calls": gtag_calls,
+        "ga4_references": ga4_refs,
+        "has_gtag": len(gtag_js_matches) > 0 or len(gtag_dest_matches) > 0 or len(gtag_calls) > 0
+    }
+
+def check_page_for_gtag(url: str) -> dict:
+    """Check a live page for gtag implementations."""
+    return analyze_result(LiveCrawler(concurrency=1).run([url])[0])
 
 def main():
     """Main debugging function."""
@@ -49,20 +63,23 @@ def main():
     print("Checking live site for gtag.js implementations...")
     print()
     
-    # URLs to check
-    urls_to_check = [
-        "https://affordable-handbags.com/",
-        "https://affordable-handbags.com/articles/",
-        "https://affordable-handbags.com/articles/backpacks/",
-        "https://affordable-handbags.com/es/",
-        "https://affordable-handbags.com/es/articulos/"
-    ]
+    parser = argparse.ArgumentParser(description="Check live pages for gtag.js leftovers")
+    parser.add_argument('--sitemap', nargs='?', const='sitemap.xml', help='Check every URL in the sitemap')
+    parser.add_argument('--base-url', help='Fetch from this origin instead (e.g. http://localhost:8000)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight (default: 8)')
+    args = parser.parse_args()
+    
+    urls_to_check = sitemap_urls(args.sitemap) if args.sitemap else DEFAULT_URLS
+    urls_to_check = [rebase_url(url, args.base_url) for url in urls_to_check]
+    
+    # Fetch everything concurrently, then report in order
+    results = LiveCrawler(concurrency=args.concurrency).run(urls_to_check)
     
     found_issues = []
     
-    for url in urls_to_check:
-        print(f"Checking: {url}")
-        result = check_page_for_gtag(url)
+    for fetched in results:
+        print(f"Checking: {fetched.url}")
+        result = analyze_result(fetched)
         
         if result["status"] == "error":
             print(f"  ❌ Error: {result['error']}")
@@ -13,43 +13,28 @@ import os
 import re
 from pathlib import Path
 
+from gtm_compliance import check_site
+
 def check_local_files():
     """Check local files for tracking implementations."""
     print("=== LOCAL FILES CHECK ===")
     
-    html_files = []
-    for root, dirs, files in os.walk("."):
-        dirs[:] = [d for d in dirs if d not in {'.git', 'node_modules', 'dist', 'build', '.next', 'out', 'tools'}]
-        for file in files:
-            if file.endswith('.html') and '.bak_' not in file and not file.startswith('.'):
-                html_files.append(Path(root) / file)
-    
-    gtag_count = 0
-    ga4_count = 0
-    gtm_count = 0
+    report = check_site()
+    pages = [page for page in report['pages'].values() if "error" not in page]
+    for path, page in report['pages'].items():
+        if "error" in page:
+            print(f"Error reading {path}: {page['error']}")
     
-    for html_file in html_files:
-        try:
-            with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
-            
-            gtag_refs = len(re.findall(r'gtag\(', content, re.IGNORECASE))
-            ga4_refs = len(re.findall(r'G-H1Q1KL01RP', content))
-            gtm_refs = len(re.findall(r'googletagmanager\.com/gtm\.js', content, re.IGNORECASE))
-            
-            gtag_count += gtag_refs
-            ga4_count += ga4_refs
-            gtm_count += gtm_refs
-            
-        except Exception as e:
-            print(f"Error reading {html_file}: {e}")
+    gtag_count = sum(page['gtag_calls'] for page in pages)
+    ga4_count = sum(page['ga4_references'] for page in pages)
+    gtm_count = sum(page['gtm_scripts'] for page in pages)
     
-    print(f"Local HTML files: {len(html_files)}")
+    print(f"Local HTML files: {report['total']}")
     print(f"gtag() calls: {gtag_count}")
     print(f"GA4 references: {ga4_count}")
     print(f"GTM scripts: {gtm_count}")
     
-    if gtag_count == 0 and ga4_count == 0 and gtm_count == len(html_files):
+    if gtag_count == 0 and ga4_count == 0 and gtm_count == report['total']:
         print("✅ Local files are PERFECT - clean GTM-only implementation")
         return True
     else:
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Asset Fingerprinting
+
+netlify.toml serves /assets/*, *.css and *.js with
+"Cache-Control: public, max-age=31536000, immutable", but pages load them by
+fixed names (/assets/script.js), so a changed file is never re-fetched. This
+build step makes those headers safe:
+1. Every file under assets/ gets a content-hashed copy next to it
+   (assets/styles.css -> assets/styles.1a2b3c4d.css). References to other
+   assets inside CSS (url(...)) and JS ('/assets/...') are rewritten first,
+   so a changed image also changes the hash of the stylesheet using it
+2. assets/manifest.json maps every original path to its fingerprinted copy
+3. All pages are rewritten in a single pass: src, href, srcset, content,
+   poster and inline url(...) references to assets (absolute, relative,
+   %-encoded, or with a ?v= query) point at the fingerprinted copy.
+   References to an older fingerprint are updated to the current one
+Originals are kept; fingerprinted copies from before the previous build are
+removed. Run after tools/critical_css.py, which looks for the original
+stylesheet link.
+
+Usage:
+    python3 tools/fingerprint_assets.py [--dry-run]
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import quote, urlsplit, urlunsplit
+
+from backup_store import BackupStore
+from html_corpus import atomic_write_text, get_corpus, walk_files
+from link_graph import site_path
+
+ASSET_DIR = 'assets'
+MANIFEST_PATH = 'assets/manifest.json'
+MANIFEST_VERSION = 1
+HASH_LENGTH = 8
+
+ASSET_EXTENSIONS = ('.css', '.js', '.svg', '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico',
+                    '.woff', '.woff2', '.ttf', '.json')
+# Files whose references to other assets are rewritten before hashing
+TEXT_EXTENSIONS = ('.css', '.js')
+# Outputs that are content-hashed already (tools/image_pipeline.py)
+HASHED_DIRS = ('assets/images/optimized/', 'assets/bundles/')
+
+RE_FINGERPRINTED = re.compile(r'^(.*)\.([0-9a-f]{%d})(\.[A-Za-z0-9]+)$' % HASH_LENGTH)
+RE_TEXT_REFERENCE = re.compile(r'''url\(\s*(["']?)([^"')]+)\1\s*\)|(["'])(/assets/[^"'\s]+)\3''')
+RE_HTML_REFERENCE = re.compile(
+    r'''(\b(?:src|href|content|poster|data-src)\s*=\s*)(["'])([^"']*)\2'''
+    r'''|(\bsrcset\s*=\s*)(["'])([^"']*)\5'''
+    r'''|(url\(\s*)(&quot;|["']?)([^"')&]+)\8(\s*\))''',
+    re.IGNORECASE)
+
+
+def source_path(path: str) -> str:
+    """Original path of a fingerprinted asset path (unchanged for other paths)."""
+    m = RE_FINGERPRINTED.match(path)
+    return m.group(1) + m.group(3) if m else path
+
+
+def fingerprinted_name(rel_path: str, digest: str) -> str:
+    stem, ext = os.path.splitext(rel_path)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+
+def load_manifest(root: str = ".") -> Dict[str, dict]:
+    try:
+        with open(os.path.join(root, MANIFEST_PATH), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        return data.get('assets', {}) if data.get('version') == MANIFEST_VERSION else {}
+    except (OSError, ValueError):
+        return {}
+
+
+class Fingerprinter:
+    """Content-hashed copies of every asset, resolved recursively through CSS/JS references."""
+
+    def __init__(self, root: str = "."):
+        self.root = Path(root)
+        self.sources = set()
+        for rel in walk_files(self.root / ASSET_DIR, ASSET_EXTENSIONS):
+            path = f"{ASSET_DIR}/{rel.as_posix()}"
+            if path.startswith(HASHED_DIRS) or path == MANIFEST_PATH:
+                continue
+            if RE_FINGERPRINTED.match(path) and (self.root / source_path(path)).is_file():
+                continue
+            self.sources.add(path)
+        self.manifest: Dict[str, dict] = {}
+        self.contents: Dict[str, bytes] = {}
+        self._building = set()
+
+    def resolve(self, path: str) -> Optional[str]:
+        """Fingerprinted site path for a decoded site path, or None if it is not an asset."""
+        rel = source_path(path.lstrip('/'))
+        if rel not in self.sources:
+            return None
+        return self.build(rel)['path']
+
+    def build(self, rel: str) -> dict:
+        if rel in self.manifest:
+            return self.manifest[rel]
+        data = (self.root / rel).read_bytes()
+        if rel.endswith(TEXT_EXTENSIONS) and rel not in self._building:
+            self._building.add(rel)
+            data = self.rewrite_text(data.decode('utf-8'), '/' + rel).encode('utf-8')
+            self._building.discard(rel)
+        digest = hashlib.sha1(data).hexdigest()
+        self.contents[rel] = data
+        self.manifest[rel] = {
+            'path': '/' + fingerprinted_name(rel, digest),
+            'hash': digest[:HASH_LENGTH],
+            'size': len(data),
+        }
+        return self.manifest[rel]
+
+    def rewrite_text(self, text: str, file_url: str) -> str:
+        """Point url(...) and '/assets/...' string references of a CSS/JS file at fingerprinted copies."""
+        def replace(m):
+            ref = m.group(2) or m.group(4)
+            new = self.rewrite_url(ref, file_url)
+            if new is None:
+                return m.group(0)
+            if m.group(2):
+                return f"url({m.group(1)}{new}{m.group(1)})"
+            return f"{m.group(3)}{new}{m.group(3)}"
+        return RE_TEXT_REFERENCE.sub(replace, text)
+
+    def rewrite_url(self, ref: str, base_url: str) -> Optional[str]:
+        """Fingerprinted form of a reference (keeping its origin and fragment), or None."""
+        path = site_path(base_url, ref.strip())
+        if path is None:
+            return None
+        target = self.resolve(path)
+        if target is None:
+            return None
+        parts = urlsplit(ref.strip())
+        return urlunsplit((parts.scheme, parts.netloc, quote(target), '', parts.fragment))
+
+    def build_all(self) -> Dict[str, dict]:
+        for rel in sorted(self.sources):
+            self.build(rel)
+        return self.manifest
+
+    def write(self, previous: Dict[str, dict]) -> dict:
+        """Write fingerprinted copies and the manifest; prune copies older than the previous build."""
+        stats = {'written': 0, 'unchanged': 0, 'pruned': 0}
+        for rel, entry in self.manifest.items():
+            target = self.root / entry['path'].lstrip('/')
+            if target.exists():
+                stats['unchanged'] += 1
+                continue
+            tmp = target.with_name(f".{target.name}.tmp{os.getpid()}")
+            tmp.write_bytes(self.contents[rel])
+            os.replace(tmp, target)
+            stats['written'] += 1
+
+        keep = {e['path'] for e in self.manifest.values()} | {e['path'] for e in previous.values()}
+        for rel in walk_files(self.root / ASSET_DIR, ASSET_EXTENSIONS):
+            path = f"{ASSET_DIR}/{rel.as_posix()}"
+            if (RE_FINGERPRINTED.match(path) and source_path(path) in self.sources
+                    and '/' + path not in keep):
+                (self.root / path).unlink()
+                stats['pruned'] += 1
+
+        atomic_write_text(self.root / MANIFEST_PATH, json.dumps({
+            'version': MANIFEST_VERSION,
+            'assets': {'/' + rel: self.manifest[rel] for rel in sorted(self.manifest)},
+        }, indent=2) + '\n')
+        return stats
+
+
+def rewrite_html(content: str, page_url: str, fingerprinter: Fingerprinter):
+    """Rewrite every asset reference of a page; returns (content, references changed)."""
+    changed = 0
+
+    def replace(m):
+        nonlocal changed
+        if m.group(1):
+            new = fingerprinter.rewrite_url(m.group(3), page_url)
+            result = m.group(0) if new is None else f"{m.group(1)}{m.group(2)}{new}{m.group(2)}"
+        elif m.group(4):
+            candidates = []
+            for candidate in m.group(6).split(','):
+                pieces = candidate.strip().split(None, 1)
+                if pieces:
+                    new = fingerprinter.rewrite_url(pieces[0], page_url)
+                    candidates.append(' '.join([new or pieces[0]] + pieces[1:]))
+            result = f"{m.group(4)}{m.group(5)}{', '.join(candidates)}{m.group(5)}"
+            if result.replace(' ', '') == m.group(0).replace(' ', ''):
+                result = m.group(0)
+        else:
+            new = fingerprinter.rewrite_url(m.group(9), page_url)
+            result = m.group(0) if new is None else f"{m.group(7)}{m.group(8)}{new}{m.group(8)}{m.group(10)}"
+        if result != m.group(0):
+            changed += 1
+        return result
+
+    return RE_HTML_REFERENCE.sub(replace, content), changed
+
+
+def run(root: str = ".", dry_run: bool = False, backup_dir=None, log=print) -> dict:
+    """Fingerprint every asset and rewrite all pages."""
+    previous = load_manifest(root)
+    fingerprinter = Fingerprinter(root)
+    manifest = fingerprinter.build_all()
+    stats = {'assets': len(manifest), 'pages': 0, 'references': 0}
+    if not dry_run:
+        stats.update(fingerprinter.write(previous))
+
+    backups = BackupStore(backup_dir) if backup_dir else BackupStore()
+    for doc in get_corpus(root).decodable(log):
+        content, changed = rewrite_html(doc.text, doc.url, fingerprinter)
+        if not changed:
+            continue
+        stats['pages'] += 1
+        stats['references'] += changed
+        log(f"{'Would rewrite' if dry_run else '✅ Rewrote'} {changed} reference(s) in {doc.path}")
+        if not dry_run:
+            backups.save(doc.path, doc.data, tool="fingerprint_assets")
+            doc.write_text(content)
+    return stats
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Fingerprint assets and rewrite page references")
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    args = parser.parse_args()
+
+    print("=== ASSET FINGERPRINTING ===")
+    stats = run(dry_run=args.dry_run)
+    print(f"\nAssets: {stats['assets']}", end='')
+    if not args.dry_run:
+        print(f" ({stats['written']} written, {stats['unchanged']} unchanged, {stats['pruned']} pruned)", end='')
+    print(f"\nPages {'to rewrite' if args.dry_run else 'rewritten'}: {stats['pages']} ({stats['references']} references)")
+    if not args.dry_run:
+        print(f"Manifest: {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,15 +6,15 @@ This script fixes footer links across all HTML pages to ensure consistency
 and proper local development compatibility.
 """
 
-import os
 import re
-from pathlib import Path
 
-def fix_footer_links_in_file(file_path):
-    """Fix footer links in a single HTML file."""
+from html_corpus import get_corpus
+
+def fix_footer_links_in_file(doc):
+    """Fix footer links in a single corpus document."""
+    file_path = doc.path
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = doc.text
     except Exception as e:
         print(f"❌ Error reading {file_path}: {e}")
         return False
@@ -58,8 +58,7 @@ def fix_footer_links_in_file(file_path):
     # Check if any changes were made
     if content != original_content:
         try:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            doc.write_text(content)
             print(f"✅ Fixed footer links in {file_path}")
             return True
         except Exception as e:
@@ -71,16 +70,7 @@ def fix_footer_links_in_file(file_path):
 
 def find_all_html_files():
     """Find all HTML files in the project."""
-    html_files = []
-    for root, dirs, files in os.walk("."):
-        # Skip certain directories
-        dirs[:] = [d for d in dirs if d not in {'.git', 'node_modules', 'dist', 'build', '.next', 'out', 'tools', 'scripts'}]
-        
-        for file in files:
-            if file.endswith('.html') and not file.startswith('.') and '.bak_' not in file:
-                html_files.append(Path(root) / file)
-    
-    return html_files
+    return list(get_corpus())
 
 def main():
     """Main execution."""
@@ -95,8 +85,8 @@ def main():
     fixed_count = 0
     error_count = 0
     
-    for file_path in html_files:
-        if fix_footer_links_in_file(file_path):
+    for doc in html_files:
+        if fix_footer_links_in_file(doc):
             fixed_count += 1
         else:
             error_count += 1
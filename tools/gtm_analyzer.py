@@ -17,6 +17,9 @@ import re
 from pathlib import Path
 from collections import defaultdict
 
+from gtm_compliance import check_site
+from html_corpus import get_corpus
+
 GTM_ID = "GTM-TCG7SMDD"
 
 # Regex patterns for different GTM implementations
@@ -45,13 +48,14 @@ RE_GTAG_INIT = re.compile(
     re.IGNORECASE
 )
 
-def analyze_file(file_path: Path) -> dict:
+def analyze_file(file_path: Path, content: str = None) -> dict:
     """Analyze a single HTML file for GTM implementations."""
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-    except Exception as e:
-        return {"error": str(e)}
+    if content is None:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except Exception as e:
+            return {"error": str(e)}
     
     analysis = {
         "file": str(file_path),
@@ -117,6 +121,8 @@ def get_file_status(analysis: dict) -> str:
     """Determine the status of a file based on its GTM implementation."""
     if "error" in analysis:
         return "ERROR"
+    if analysis.get("compliant"):
+        return "PERFECT"
     
     gtm_count = len(analysis["gtm_scripts"])
     noscript_count = len(analysis["gtm_noscripts"])
@@ -142,14 +148,7 @@ def main():
     print()
     
     # Find all HTML files
-    html_files = []
-    for root, dirs, files in os.walk("."):
-        # Skip certain directories
-        dirs[:] = [d for d in dirs if d not in {'.git', 'node_modules', 'dist', 'build', '.next', 'out', 'tools'}]
-        
-        for file in files:
-            if file.endswith('.html') and not file.startswith('.'):
-                html_files.append(Path(root) / file)
+    html_files = get_corpus()
     
     print(f"Found {len(html_files)} HTML files to analyze")
     print()
@@ -158,8 +157,18 @@ def main():
     analyses = []
     status_counts = defaultdict(int)
     
-    for file_path in sorted(html_files):
-        analysis = analyze_file(file_path)
+    # Only pages the compliance checker flags need the detailed block analysis
+    verdicts = check_site()["pages"]
+    
+    for doc in html_files:
+        verdict = verdicts.get(doc.path.as_posix(), {})
+        try:
+            if verdict.get("is_clean"):
+                analysis = {"file": str(doc.path), "compliant": True}
+            else:
+                analysis = analyze_file(doc.path, doc.lenient_text)
+        except Exception as e:
+            analysis = {"error": str(e), "file": str(doc.path)}
         analyses.append(analysis)
         status = get_file_status(analysis)
         status_counts[status] += 1
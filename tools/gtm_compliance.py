@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+GTM/GA4 Compliance Checker - Read-only, cached verdict for every page
+
+Counts the four tracking signals the deployment checks care about (GTM
+loader, GTM noscript, gtag() calls, GA4 measurement ID) in one combined scan
+per page. Verdicts are cached in .build-cache/gtm-verdicts.json keyed by
+file content hash; pages whose size and mtime are unchanged are not even
+read, so a repeat run over the whole site takes a few milliseconds.
+
+A page is compliant when it has exactly one GTM loader, exactly one GTM
+noscript, no gtag() calls and no GA4 ID.
+
+Usage:
+    python3 tools/gtm_compliance.py [--json] [--no-cache] [--root-path DIR]
+
+Exits with status 1 if any page is not compliant (usable as a pre-deploy hook).
+
+Environment variables:
+    GA4_MEASUREMENT_ID: GA4 measurement ID (default: G-H1Q1KL01RP)
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from pathlib import Path
+from typing import Dict
+
+from html_corpus import atomic_write_text, get_corpus
+
+GA4_ID = os.environ.get("GA4_MEASUREMENT_ID", "G-H1Q1KL01RP")
+VERDICTS_PATH = '.build-cache/gtm-verdicts.json'
+CHECKER_VERSION = 1
+
+# All four signals in one pass; none of them can overlap another. The GA4 ID
+# is matched case-sensitively, like the per-tool checks it replaces.
+RE_SIGNALS = re.compile(
+    r"(?P<gtm_scripts>googletagmanager\.com/gtm\.js)"
+    r"|(?P<gtm_noscripts>googletagmanager\.com/ns\.html)"
+    r"|(?P<gtag_calls>gtag\()"
+    rf"|(?P<ga4_references>(?-i:{re.escape(GA4_ID)}))",
+    re.IGNORECASE
+)
+
+SIGNALS = ('gtm_scripts', 'gtm_noscripts', 'gtag_calls', 'ga4_references')
+
+
+def count_signals(content: str) -> Dict[str, int]:
+    """Count every tracking signal in a single scan."""
+    counts = dict.fromkeys(SIGNALS, 0)
+    for match in RE_SIGNALS.finditer(content):
+        counts[match.lastgroup] += 1
+    return counts
+
+
+def is_clean(counts: Dict[str, int]) -> bool:
+    return (counts['gtm_scripts'] == 1 and counts['gtm_noscripts'] == 1
+            and counts['gtag_calls'] == 0 and counts['ga4_references'] == 0)
+
+
+def cache_signature() -> str:
+    """Cached verdicts are only valid for the same checker and GA4 ID."""
+    return f"{CHECKER_VERSION}:{GA4_ID}"
+
+
+def load_verdicts(path=VERDICTS_PATH) -> dict:
+    """Load the verdict cache, or an empty one if missing/stale."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {"signature": cache_signature(), "files": {}}
+    if cache.get("signature") != cache_signature():
+        return {"signature": cache_signature(), "files": {}}
+    return cache
+
+
+def save_verdicts(cache: dict, path=VERDICTS_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    atomic_write_text(Path(path), json.dumps(cache, separators=(',', ':')))
+
+
+def check_site(root: str = ".", use_cache: bool = True, cache_path: str = None) -> dict:
+    """Check every page, re-reading only pages that changed since the last run."""
+    corpus = get_corpus(root)
+    cache_path = cache_path or os.path.join(root, VERDICTS_PATH)
+    cache = load_verdicts(cache_path) if use_cache else {"signature": cache_signature(), "files": {}}
+    old_files = cache["files"]
+    files = {}
+    stats = {'cached': 0, 'checked': 0, 'errors': 0}
+    pages = {}
+
+    for doc in corpus:
+        key = doc.path.as_posix()
+        try:
+            st = doc.stat()
+            entry = old_files.get(key)
+            if entry and entry["mtime"] == st.st_mtime_ns and entry["size"] == st.st_size:
+                stats['cached'] += 1
+            elif entry and entry["sha1"] == doc.digest:
+                # Touched but not modified
+                entry = dict(entry, mtime=st.st_mtime_ns, size=st.st_size)
+                stats['cached'] += 1
+            else:
+                entry = {
+                    "mtime": st.st_mtime_ns,
+                    "size": st.st_size,
+                    "sha1": doc.digest,
+                    "counts": count_signals(doc.lenient_text),
+                }
+                stats['checked'] += 1
+        except OSError as e:
+            stats['errors'] += 1
+            pages[key] = {"error": str(e), "is_clean": False}
+            continue
+        files[key] = entry
+        pages[key] = dict(entry["counts"], is_clean=is_clean(entry["counts"]))
+
+    if use_cache:
+        cache["files"] = files
+        save_verdicts(cache, cache_path)
+
+    failing = sorted(path for path, page in pages.items() if not page["is_clean"])
+    return {
+        "clean": not failing,
+        "total": len(pages),
+        "clean_files": len(pages) - len(failing),
+        "failing": failing,
+        "pages": pages,
+        "stats": stats,
+    }
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Check every page for a clean GTM-only implementation")
+    parser.add_argument('--json', action='store_true', help='Print the full report as JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Ignore and do not update the verdict cache')
+    parser.add_argument('--root-path', default='.', help='Root path to search for HTML files')
+    args = parser.parse_args()
+
+    report = check_site(args.root_path, use_cache=not args.no_cache)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("=== GTM/GA4 Compliance ===")
+        for path in report["failing"]:
+            page = report["pages"][path]
+            if "error" in page:
+                print(f"❌ {path} - ERROR: {page['error']}")
+            else:
+                print(f"⚠️  {path} - GTM scripts: {page['gtm_scripts']}, noscripts: {page['gtm_noscripts']}, "
+                      f"gtag calls: {page['gtag_calls']}, GA4 references: {page['ga4_references']}")
+        stats = report["stats"]
+        print(f"Pages: {report['total']} ({stats['checked']} checked, {stats['cached']} from cache)")
+        print(f"Compliant: {report['clean_files']}/{report['total']}")
+        print("✅ All pages compliant" if report["clean"] else "❌ Some pages are not compliant")
+
+    if not report["clean"]:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
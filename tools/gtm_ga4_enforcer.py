@@ -6,87 +6,48 @@ This script:
 1. Removes ALL existing GTM script loaders and direct gtag.js blocks
 2. Inserts canonical GTM loader script in <head>
 3. Inserts GTM noscript iframe immediately after <body>
-4. Creates backups before modification
+4. Backs up originals into a content-addressed store (tools/backup_store.py)
 5. Reports summary of changes
 
+All removals and both insertions happen in a single scan of each file (the
+"enforce" preset of tools/gtm_rules.py), and files are written through
+temp-file-plus-rename.
+
 Usage:
     python tools/gtm_ga4_enforcer.py [--dry-run] [--verbose]
     
 Environment variables:
     GTM_CONTAINER_ID: GTM container ID (default: GTM-TCG7SMDD)
     GA4_MEASUREMENT_ID: GA4 measurement ID (default: G-H1Q1KL01RP)
-    BACKUP_SUFFIX: Backup file suffix (default: .bak_gtmfix)
+    BACKUP_DIR: Backup store directory (default: .backups)
     TARGET_EXTENSIONS: Comma-separated file extensions (default: .html)
 """
 
 import os
-import re
 import sys
-import shutil
 import argparse
-from pathlib import Path
-from typing import List, Tuple, Dict
+from typing import List
+
+from backup_store import DEFAULT_BACKUP_DIR, BackupStore
+from gtm_rules import PRESETS, RuleEngine, gtm_body_block, gtm_head_block
+from html_corpus import HtmlDocument, get_corpus
 
 # Configuration from environment variables
 GTM_ID = os.environ.get("GTM_CONTAINER_ID", "GTM-TCG7SMDD")
 GA4_ID = os.environ.get("GA4_MEASUREMENT_ID", "G-H1Q1KL01RP")
-BACKUP_SUFFIX = os.environ.get("BACKUP_SUFFIX", ".bak_gtmfix")
+BACKUP_DIR = DEFAULT_BACKUP_DIR
 EXTS = set(ext.strip().lower() for ext in os.environ.get("TARGET_EXTENSIONS", ".html").split(",")) if os.environ.get("TARGET_EXTENSIONS") else {".html"}
 
 # Canonical GTM blocks
-GTM_HEAD = f"""<!-- Google Tag Manager -->
-<script>(function(w,d,s,l,i){{w[l]=w[l]||[];w[l].push({{'gtm.start': new Date().getTime(),event:'gtm.js'}});var f=d.getElementsByTagName(s)[0], j=d.createElement(s), dl=l!='dataLayer'?'&l='+l:'';j.async=true; j.src='https://www.googletagmanager.com/gtm.js?id='+i+dl;f.parentNode.insertBefore(j,f);}})(window,document,'script','dataLayer','{GTM_ID}');</script>
-<!-- End Google Tag Manager -->
-"""
-
-GTM_BODY = f"""<!-- Google Tag Manager (noscript) -->
-<noscript><iframe src="https://www.googletagmanager.com/ns.html?id={GTM_ID}" height="0" width="0" style="display:none;visibility:hidden"></iframe></noscript>
-<!-- End Google Tag Manager (noscript) -->
-"""
-
-# Regexes to remove any existing GTM loaders (handle small variations & minified)
-RE_GTM_SCRIPT = re.compile(
-    r"<!--\s*Google Tag Manager\s*-->.*?googletagmanager\.com/gtm\.js.*?<!--\s*End Google Tag Manager\s*-->",
-    re.IGNORECASE | re.DOTALL
-)
-RE_GTM_NOSCRIPT = re.compile(
-    r"<!--\s*Google Tag Manager \(noscript\)\s*-->.*?googletagmanager\.com/ns\.html\?id=.*?<!--\s*End Google Tag Manager \(noscript\)\s*-->",
-    re.IGNORECASE | re.DOTALL
-)
-
-# Regexes to remove direct gtag.js implementations
-RE_GTAG_SCRIPT = re.compile(
-    r"<!--\s*Google tag \(gtag\.js\)\s*-->.*?googletagmanager\.com/gtag/js.*?<!--\s*End Google tag \(gtag\.js\)\s*-->",
-    re.IGNORECASE | re.DOTALL
-)
-RE_GTAG_CONFIG = re.compile(
-    r"gtag\('config',\s*['\"][^'\"]*['\"]\s*\)",
-    re.IGNORECASE
-)
-RE_GTAG_INIT = re.compile(
-    r"gtag\('js',\s*new Date\(\)\s*\)",
-    re.IGNORECASE
-)
-
-# Additional patterns for various GTM implementations
-RE_GTM_VARIANTS = [
-    re.compile(r"googletagmanager\.com/gtm\.js\?id=", re.IGNORECASE),
-    re.compile(r"googletagmanager\.com/ns\.html\?id=", re.IGNORECASE),
-    re.compile(r"GTM-[A-Z0-9]+", re.IGNORECASE),
-]
-
-# Additional patterns for gtag variants
-RE_GTAG_VARIANTS = [
-    re.compile(r"googletagmanager\.com/gtag/js", re.IGNORECASE),
-    re.compile(r"gtag\('config'", re.IGNORECASE),
-    re.compile(r"gtag\('js'", re.IGNORECASE),
-    re.compile(r"G-[A-Z0-9]+", re.IGNORECASE),
-]
+GTM_HEAD = gtm_head_block(GTM_ID)
+GTM_BODY = gtm_body_block(GTM_ID)
 
 class GTMEnforcer:
-    def __init__(self, dry_run: bool = False, verbose: bool = False):
+    def __init__(self, dry_run: bool = False, verbose: bool = False, backup_dir: str = BACKUP_DIR):
         self.dry_run = dry_run
         self.verbose = verbose
+        self.backups = BackupStore(backup_dir)
+        self.engine = RuleEngine(PRESETS["enforce"], GTM_ID)
         self.stats = {
             'processed': 0,
             'modified': 0,
@@ -102,107 +63,48 @@ class GTMEnforcer:
             return
         print(f"[{level}] {message}")
         
-    def find_html_files(self, root_path: str) -> List[Path]:
-        """Find all HTML files in the project tree."""
-        root = Path(root_path)
-        html_files = []
-        
-        for file_path in root.rglob("*"):
-            if file_path.is_file() and file_path.suffix.lower() in EXTS:
-                html_files.append(file_path)
-                
-        return sorted(html_files)
+    def find_html_files(self, root_path: str) -> List[HtmlDocument]:
+        """Find all HTML files in the project tree (shared corpus exclusion policy)."""
+        return list(get_corpus(root_path, tuple(sorted(EXTS))))
     
-    def create_backup(self, file_path: Path) -> bool:
-        """Create backup of file before modification."""
+    def create_backup(self, doc: HtmlDocument) -> bool:
+        """Record the original content in the backup store before modification."""
         if self.dry_run:
-            self.log(f"Would create backup: {file_path}{BACKUP_SUFFIX}", "VERBOSE")
+            self.log(f"Would back up: {doc.path}", "VERBOSE")
             return True
             
-        backup_path = file_path.with_suffix(file_path.suffix + BACKUP_SUFFIX)
         try:
-            shutil.copy2(file_path, backup_path)
+            digest = self.backups.save(doc.path, doc.data, tool="gtm_ga4_enforcer")
             self.stats['backups_created'] += 1
-            self.log(f"Created backup: {backup_path}", "VERBOSE")
+            self.log(f"Backed up {doc.path} as {digest[:12]}", "VERBOSE")
             return True
         except Exception as e:
-            self.errors.append(f"Failed to create backup for {file_path}: {e}")
+            self.errors.append(f"Failed to create backup for {doc.path}: {e}")
             return False
     
-    def clean_gtm_content(self, content: str) -> str:
-        """Remove all existing GTM and gtag implementations."""
-        original_content = content
-        
-        # Remove GTM script blocks
-        content = RE_GTM_SCRIPT.sub("", content)
-        content = RE_GTM_NOSCRIPT.sub("", content)
-        
-        # Remove gtag script blocks
-        content = RE_GTAG_SCRIPT.sub("", content)
-        
-        # Remove gtag config and init calls
-        content = RE_GTAG_CONFIG.sub("", content)
-        content = RE_GTAG_INIT.sub("", content)
+    def rewrite_content(self, content: str) -> str:
+        """Remove all GTM/gtag constructs and insert the canonical blocks in one scan."""
+        content, counts = self.engine.apply(content)
         
-        # Remove any remaining GTM/gtag references
-        for pattern in RE_GTM_VARIANTS + RE_GTAG_VARIANTS:
-            # Find and remove entire script tags containing these patterns
-            script_pattern = re.compile(
-                rf'<script[^>]*>.*?{pattern.pattern}.*?</script>',
-                re.IGNORECASE | re.DOTALL
-            )
-            content = script_pattern.sub("", content)
-            
-            # Also remove noscript iframes
-            noscript_pattern = re.compile(
-                rf'<noscript[^>]*>.*?{pattern.pattern}.*?</noscript>',
-                re.IGNORECASE | re.DOTALL
-            )
-            content = noscript_pattern.sub("", content)
-        
-        # Clean up extra whitespace
-        content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
-        
-        return content
-    
-    def insert_gtm_head(self, content: str) -> str:
-        """Insert GTM script in head section."""
-        head_pattern = re.compile(r'(<head[^>]*>)', re.IGNORECASE)
-        match = head_pattern.search(content)
-        
-        if match:
-            # Insert after opening head tag
-            insert_pos = match.end()
-            content = content[:insert_pos] + '\n' + GTM_HEAD + content[insert_pos:]
+        if counts['ensure-gtm-head']:
             self.log("Inserted GTM script in <head>", "VERBOSE")
         else:
             self.log("Warning: No <head> tag found, GTM script not inserted", "WARN")
-            
-        return content
-    
-    def insert_gtm_body(self, content: str) -> str:
-        """Insert GTM noscript immediately after body tag."""
-        body_pattern = re.compile(r'(<body[^>]*>)', re.IGNORECASE)
-        match = body_pattern.search(content)
-        
-        if match:
-            # Insert after opening body tag
-            insert_pos = match.end()
-            content = content[:insert_pos] + '\n' + GTM_BODY + content[insert_pos:]
+        if counts['ensure-noscript-after-body']:
             self.log("Inserted GTM noscript in <body>", "VERBOSE")
         else:
             self.log("Warning: No <body> tag found, GTM noscript not inserted", "WARN")
-            
+        
         return content
     
-    def process_file(self, file_path: Path) -> bool:
+    def process_file(self, doc: HtmlDocument) -> bool:
         """Process a single HTML file."""
         self.stats['processed'] += 1
+        file_path = doc.full_path
         
         try:
             # Read file content
-            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                original_content = f.read()
+            original_content = doc.text
             
             # Check if file is binary or too large
             if len(original_content) > 1024 * 1024:  # 1MB limit
@@ -210,12 +112,8 @@ class GTMEnforcer:
                 self.stats['skipped'] += 1
                 return False
                 
-            # Clean existing GTM/gtag content
-            cleaned_content = self.clean_gtm_content(original_content)
-            
-            # Insert GTM blocks
-            final_content = self.insert_gtm_head(cleaned_content)
-            final_content = self.insert_gtm_body(final_content)
+            # Remove existing GTM/gtag content and insert canonical blocks
+            final_content = self.rewrite_content(original_content)
             
             # Check if content changed
             if final_content == original_content:
@@ -223,13 +121,12 @@ class GTMEnforcer:
                 return False
             
             # Create backup
-            if not self.create_backup(file_path):
+            if not self.create_backup(doc):
                 return False
             
-            # Write modified content
+            # Write modified content (temp file + rename)
             if not self.dry_run:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(final_content)
+                doc.write_text(final_content)
             
             self.stats['modified'] += 1
             self.log(f"{'Would modify' if self.dry_run else 'Modified'}: {file_path}")
@@ -259,8 +156,8 @@ class GTMEnforcer:
             return
         
         # Process each file
-        for file_path in html_files:
-            self.process_file(file_path)
+        for doc in html_files:
+            self.process_file(doc)
         
         # Print summary
         self.print_summary()
@@ -285,7 +182,7 @@ class GTMEnforcer:
         if self.dry_run:
             self.log("\nThis was a DRY RUN - no files were actually modified")
         else:
-            self.log(f"\nBackup suffix used: {BACKUP_SUFFIX}")
+            self.log(f"\nBackups stored in: {self.backups.root} (see tools/backup_store.py)")
 
 def main():
     """Main entry point."""
@@ -296,7 +193,7 @@ def main():
 Environment Variables:
   GTM_CONTAINER_ID    GTM container ID (default: GTM-TCG7SMDD)
   GA4_MEASUREMENT_ID  GA4 measurement ID (default: G-H1Q1KL01RP)
-  BACKUP_SUFFIX       Backup file suffix (default: .bak_gtmfix)
+  BACKUP_DIR          Backup store directory (default: .backups)
   TARGET_EXTENSIONS   Comma-separated file extensions (default: .html)
 
 Examples:
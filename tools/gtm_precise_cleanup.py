@@ -4,188 +4,37 @@ Precise GTM Cleanup Script - Removes only gtag.js implementations
 
 This script:
 1. Removes only direct gtag.js script blocks (not GTM)
-2. Removes gtag() function calls
+2. Removes the gtag() definition, gtag('js') and dataLayer setup (other gtag() calls stay)
 3. Removes GA4 measurement ID references in comments
 4. Preserves GTM implementation completely
 5. Creates backups before modification
 
+Runs the "precise" preset of the GTM rule engine (tools/gtm_rules.py). The
+GTM loader sets up dataLayer through w[l] and never defines or calls gtag(),
+so none of the gtag patterns match inside it and it is left as it is.
+
 Usage:
-    python3 tools/gtm_precise_cleanup.py
+    python3 tools/gtm_precise_cleanup.py [--dry-run]
 """
 
-import os
-import re
-import shutil
-from pathlib import Path
-
-GTM_ID = "GTM-TCG7SMDD"
-GA4_ID = "G-H1Q1KL01RP"
-BACKUP_SUFFIX = ".bak_gtm_precise"
-
-# Regex patterns for precise gtag cleanup (NOT GTM)
-RE_GTAG_SCRIPT_BLOCK = re.compile(
-    r"<!--\s*Google tag \(gtag\.js\)\s*-->.*?<!--\s*End Google tag \(gtag\.js\)\s*-->",
-    re.IGNORECASE | re.DOTALL
-)
-
-RE_GTAG_INLINE_SCRIPT = re.compile(
-    r"<script[^>]*>\s*window\.dataLayer\s*=.*?gtag\(.*?</script>",
-    re.IGNORECASE | re.DOTALL
-)
-
-RE_GTAG_FUNCTION_DEF = re.compile(
-    r"function gtag\(\)\{[^}]*\}",
-    re.IGNORECASE
-)
+import sys
+import argparse
 
-RE_GTAG_JS_INIT = re.compile(
-    r"gtag\('js',\s*new Date\(\)\s*\)",
-    re.IGNORECASE
-)
+from gtm_rules import PRESETS, run
 
-RE_DATA_LAYER_INIT = re.compile(
-    r"window\.dataLayer\s*=\s*window\.dataLayer\s*\|\|\s*\[\];",
-    re.IGNORECASE
-)
+RULES = PRESETS["precise"]
 
-RE_GA4_COMMENT_BLOCKS = re.compile(
-    r"<!--\s*GA4 is configured in GTM.*?G-H1Q1KL01RP.*?-->",
-    re.IGNORECASE | re.DOTALL
-)
-
-def clean_gtag_only(content: str) -> tuple[str, int]:
-    """Remove only gtag.js implementations, preserve GTM."""
-    original_content = content
-    removal_count = 0
-    
-    # Remove gtag script blocks (not GTM)
-    content = RE_GTAG_SCRIPT_BLOCK.sub("", content)
-    if content != original_content:
-        removal_count += 1
-        original_content = content
-    
-    # Remove inline gtag scripts
-    content = RE_GTAG_INLINE_SCRIPT.sub("", content)
-    if content != original_content:
-        removal_count += 1
-        original_content = content
-    
-    # Remove gtag function definitions
-    content = RE_GTAG_FUNCTION_DEF.sub("", content)
-    if content != original_content:
-        removal_count += 1
-        original_content = content
-    
-    # Remove gtag js init
-    content = RE_GTAG_JS_INIT.sub("", content)
-    if content != original_content:
-        removal_count += 1
-        original_content = content
-    
-    # Remove dataLayer initialization
-    content = RE_DATA_LAYER_INIT.sub("", content)
-    if content != original_content:
-        removal_count += 1
-        original_content = content
-    
-    # Remove GA4 comment blocks
-    content = RE_GA4_COMMENT_BLOCKS.sub("", content)
-    if content != original_content:
-        removal_count += 1
-        original_content = content
-    
-    # Clean up extra whitespace
-    content = re.sub(r'\n\s*\n\s*\n', '\n\n', content)
-    content = re.sub(r'^\s*\n', '', content, flags=re.MULTILINE)
-    
-    return content, removal_count
-
-def process_file(file_path: Path) -> tuple[str, str, int]:
-    """Process a single HTML file."""
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-    except Exception as e:
-        return str(file_path), f"error: {e}", 0
-    
-    original_content = content
-    
-    # Clean only gtag implementations
-    content, removal_count = clean_gtag_only(content)
-    
-    # Check if content changed
-    changed = (content != original_content)
-    
-    if changed:
-        # Create backup
-        backup_path = file_path.with_suffix(file_path.suffix + BACKUP_SUFFIX)
-        try:
-            shutil.copy2(file_path, backup_path)
-        except Exception:
-            pass
-        
-        # Write updated content
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-    
-    status = "updated" if changed else "no_change"
-    return str(file_path), status, removal_count
 
 def main():
     """Main execution."""
-    print("=== Precise GTM Cleanup - Remove Only gtag.js ===")
-    print(f"GTM Container: {GTM_ID}")
-    print(f"GA4 Measurement ID: {GA4_ID}")
-    print(f"Backup suffix: {BACKUP_SUFFIX}")
-    print()
-    
-    stats = {
-        'processed': 0,
-        'changed': 0,
-        'total_removals': 0,
-        'errors': 0
-    }
-    
-    # Find all HTML files
-    html_files = []
-    for root, dirs, files in os.walk("."):
-        # Skip certain directories
-        dirs[:] = [d for d in dirs if d not in {'.git', 'node_modules', 'dist', 'build', '.next', 'out', 'tools'}]
-        
-        for file in files:
-            if file.endswith('.html') and not file.startswith('.'):
-                html_files.append(Path(root) / file)
-    
-    print(f"Found {len(html_files)} HTML files to process")
-    print()
-    
-    # Process each file
-    for file_path in sorted(html_files):
-        stats['processed'] += 1
-        path, status, removals = process_file(file_path)
-        
-        if status == "updated":
-            stats['changed'] += 1
-            print(f"✅ {path}")
-            if removals > 0:
-                print(f"   Removed {removals} gtag implementation(s)")
-        elif status.startswith("error"):
-            stats['errors'] += 1
-            print(f"❌ {path} - {status}")
-        else:
-            print(f"⚪ {path} - no gtag found")
-        
-        stats['total_removals'] += removals
-    
-    # Print summary
-    print()
-    print("=== Summary ===")
-    print(f"Files processed: {stats['processed']}")
-    print(f"Files changed: {stats['changed']}")
-    print(f"Total gtag implementations removed: {stats['total_removals']}")
-    print(f"Errors: {stats['errors']}")
-    print()
-    print("✅ Precise GTM cleanup complete!")
+    parser = argparse.ArgumentParser(description="Remove gtag.js implementations without touching GTM")
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing files')
+    args = parser.parse_args()
+
+    stats = run(RULES, "Precise GTM Cleanup - Removing only gtag.js", "gtm_precise_cleanup", dry_run=args.dry_run)
+    if stats['errors']:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+GTM Rule Engine - One pass per file for any combination of GTM/gtag fixes
+
+Replaces the regex sets that gtm_cleanup.py, gtm_precise_cleanup.py,
+gtm_dedupe.py, gtm_dedupe_fix.py, complete_gtm_fix.py and gtm_ga4_enforcer.py
+each carried. Rules are declarative: each names the constructs (tokens) it
+cares about and what to do with them. The tokens needed by the selected rules
+are compiled into one combined pattern, so a page is scanned once no matter
+how many rules are applied.
+
+Usage:
+    python3 tools/gtm_rules.py --list
+    python3 tools/gtm_rules.py --preset cleanup [--dry-run]
+    python3 tools/gtm_rules.py --rules remove-gtag-blocks,dedupe-gtm [--dry-run]
+
+Environment variables:
+    GTM_CONTAINER_ID: GTM container ID (default: GTM-TCG7SMDD)
+    BACKUP_DIR: Backup store directory (default: .backups)
+"""
+
+import os
+import re
+import sys
+import argparse
+from typing import Dict, List, Tuple
+
+from backup_store import BackupStore
+from html_corpus import get_corpus
+
+GTM_ID = os.environ.get("GTM_CONTAINER_ID", "GTM-TCG7SMDD")
+
+
+def gtm_head_block(gtm_id: str = GTM_ID) -> str:
+    return f"""<!-- Google Tag Manager -->
+<script>(function(w,d,s,l,i){{w[l]=w[l]||[];w[l].push({{'gtm.start': new Date().getTime(),event:'gtm.js'}});var f=d.getElementsByTagName(s)[0], j=d.createElement(s), dl=l!='dataLayer'?'&l='+l:'';j.async=true; j.src='https://www.googletagmanager.com/gtm.js?id='+i+dl;f.parentNode.insertBefore(j,f);}})(window,document,'script','dataLayer','{gtm_id}');</script>
+<!-- End Google Tag Manager -->
+"""
+
+
+def gtm_body_block(gtm_id: str = GTM_ID) -> str:
+    return f"""<!-- Google Tag Manager (noscript) -->
+<noscript><iframe src="https://www.googletagmanager.com/ns.html?id={gtm_id}" height="0" width="0" style="display:none;visibility:hidden"></iframe></noscript>
+<!-- End Google Tag Manager (noscript) -->
+"""
+
+
+# Constructs the engine can find, in match priority order: name -> pattern.
+# Marked blocks come first so they are consumed as a unit.
+TOKENS = [
+    ("gtm_script", r"<!--\s*Google Tag Manager\s*-->.*?googletagmanager\.com/gtm\.js.*?<!--\s*End Google Tag Manager\s*-->"),
+    ("gtm_noscript", r"<!--\s*Google Tag Manager \(noscript\)\s*-->.*?googletagmanager\.com/ns\.html\?id=.*?<!--\s*End Google Tag Manager \(noscript\)\s*-->"),
+    ("gtag_script", r"<!--\s*Google tag \(gtag\.js\)\s*-->.*?<!--\s*End Google tag \(gtag\.js\)\s*-->"),
+    ("ga4_comment", r"<!--\s*GA4 is configured in GTM(?:(?!-->).)*?G-[A-Z0-9]+(?:(?!-->).)*-->"),
+    ("script", r"<script\b[^>]*>.*?</script\s*>"),
+    ("noscript", r"<noscript\b[^>]*>.*?</noscript\s*>"),
+    ("gtag_function", r"function gtag\(\)\{[^}]*\}"),
+    ("gtag_init", r"gtag\('js',\s*new Date\(\)\s*\)"),
+    ("gtag_call", r"gtag\('[^']*',\s*[^)]*\)"),
+    ("datalayer_init", r"window\.dataLayer\s*=\s*window\.dataLayer\s*\|\|\s*\[\];"),
+    ("head", r"<head\b[^>]*>"),
+    ("body", r"<body\b[^>]*>"),
+]
+
+# First character of every token, used as a fast-skip lookahead
+TOKEN_FIRST_CHARS = "<gfw"
+
+# Elements consumed whole, and the code tokens that can sit inside them. A
+# kept element is re-scanned for code tokens so inline setup still gets edited.
+ELEMENT_TOKENS = ("script", "noscript")
+CODE_TOKENS = ("gtag_function", "gtag_init", "gtag_call", "datalayer_init")
+
+# GTM/gtag code inside a <script>/<noscript> element
+RE_TRACKING_VARIANT = re.compile(
+    r"googletagmanager\.com/(?:gtm\.js\?id=|ns\.html\?id=|gtag/js)"
+    r"|gtag\('(?:config|js)'|\bGTM-[A-Z0-9]+|\bG-[A-Z0-9]+",
+    re.IGNORECASE
+)
+RE_GTAG_CALL = re.compile(r"gtag\(", re.IGNORECASE)
+# A gtag.js setup script: starts by initialising dataLayer and calls gtag()
+RE_GTAG_INIT_SCRIPT = re.compile(r"<script[^>]*>\s*window\.dataLayer\s*=.*?gtag\(", re.IGNORECASE | re.DOTALL)
+RE_BLANK_LINES = re.compile(r'\n\s*\n\s*\n')
+RE_EMPTY_LINES = re.compile(r'^\s*\n', re.MULTILINE)
+
+# Token actions
+REMOVE = "remove"
+KEEP_FIRST = "keep_first"
+INSERT_GTM_AFTER = "insert_gtm_after"
+INSERT_NOSCRIPT_AFTER = "insert_noscript_after"
+
+
+def compile_tokens(tokens: List[Tuple[str, str]]):
+    """Combine (name, pattern) tokens into one alternation with named groups."""
+    if not tokens:
+        return None
+    return re.compile(
+        f"(?=[{TOKEN_FIRST_CHARS}])(?:" + "|".join(f"(?P<{n}>{p})" for n, p in tokens) + ")",
+        re.IGNORECASE | re.DOTALL
+    )
+
+
+class Rule:
+    """A declarative rewrite: which tokens it acts on, what to do, and when."""
+
+    def __init__(self, name: str, description: str, tokens: Dict[str, str] = None,
+                 when=None, post=None):
+        self.name = name
+        self.description = description
+        self.tokens = tokens or {}      # token name -> action
+        self.when = when                # optional predicate on the matched text
+        self.post = post                # optional whole-document cleanup
+
+
+RULES = {rule.name: rule for rule in [
+    Rule("strip-gtm", "Remove every marked GTM loader and noscript block",
+         {"gtm_script": REMOVE, "gtm_noscript": REMOVE}),
+    Rule("dedupe-gtm", "Keep only the first marked GTM loader block for the container",
+         {"gtm_script": KEEP_FIRST}),
+    Rule("dedupe-gtm-noscript", "Keep only the first marked GTM noscript block for the container",
+         {"gtm_noscript": KEEP_FIRST}),
+    Rule("remove-gtag-blocks", "Remove marked 'Google tag (gtag.js)' blocks",
+         {"gtag_script": REMOVE}),
+    Rule("remove-gtag-scripts", "Remove inline <script> elements that call gtag()",
+         {"script": REMOVE}, when=RE_GTAG_CALL.search),
+    Rule("remove-gtag-init-scripts", "Remove inline <script> elements that initialise dataLayer and call gtag()",
+         {"script": REMOVE}, when=RE_GTAG_INIT_SCRIPT.match),
+    Rule("remove-tracking-elements", "Remove <script>/<noscript> elements carrying any GTM/gtag code",
+         {"script": REMOVE, "noscript": REMOVE}, when=RE_TRACKING_VARIANT.search),
+    Rule("remove-gtag-calls", "Remove gtag() definitions, calls and dataLayer initialisation",
+         {"gtag_function": REMOVE, "gtag_init": REMOVE, "gtag_call": REMOVE, "datalayer_init": REMOVE}),
+    Rule("remove-gtag-setup", "Remove gtag() definitions, gtag('js') and dataLayer initialisation (not other calls)",
+         {"gtag_function": REMOVE, "gtag_init": REMOVE, "datalayer_init": REMOVE}),
+    Rule("remove-ga4-comments", "Remove 'GA4 is configured in GTM' comments",
+         {"ga4_comment": REMOVE}),
+    Rule("ensure-gtm-head", "Insert the canonical GTM loader after <head> if none is kept",
+         {"head": INSERT_GTM_AFTER}),
+    Rule("ensure-noscript-after-body", "Insert the canonical GTM noscript after <body> if none is kept",
+         {"body": INSERT_NOSCRIPT_AFTER}),
+    Rule("collapse-blank-lines", "Collapse runs of blank lines left by removals",
+         post=lambda text: RE_BLANK_LINES.sub('\n\n', text)),
+    Rule("strip-blank-lines", "Remove all blank lines",
+         post=lambda text: RE_EMPTY_LINES.sub('', text)),
+]}
+
+# Rule sets matching the scripts this engine replaces
+PRESETS = {
+    "enforce": ["strip-gtm", "remove-gtag-blocks", "remove-tracking-elements", "remove-gtag-calls",
+                "ensure-gtm-head", "ensure-noscript-after-body", "collapse-blank-lines"],
+    "cleanup": ["remove-gtag-blocks", "remove-gtag-scripts", "remove-gtag-calls",
+                "remove-ga4-comments", "collapse-blank-lines", "strip-blank-lines"],
+    "precise": ["remove-gtag-blocks", "remove-gtag-init-scripts", "remove-gtag-setup",
+                "remove-ga4-comments", "collapse-blank-lines", "strip-blank-lines"],
+    "dedupe": ["dedupe-gtm", "dedupe-gtm-noscript"],
+    "complete": ["strip-gtm", "remove-gtag-blocks", "remove-gtag-scripts", "remove-gtag-calls",
+                 "remove-ga4-comments", "ensure-gtm-head", "ensure-noscript-after-body",
+                 "collapse-blank-lines"],
+}
+
+
+class RuleEngine:
+    """Applies a set of rules to documents in one scan each."""
+
+    def __init__(self, rule_names: List[str], gtm_id: str = GTM_ID):
+        unknown = [name for name in rule_names if name not in RULES]
+        if unknown:
+            raise ValueError(f"Unknown rule(s): {', '.join(unknown)}")
+        self.rules = [RULES[name] for name in rule_names]
+        self.gtm_id = gtm_id
+        self.gtm_head = gtm_head_block(gtm_id)
+        self.gtm_body = gtm_body_block(gtm_id)
+
+        # token name -> [(rule, action)] for the selected rules only
+        self.handlers: Dict[str, List[Tuple[Rule, str]]] = {}
+        for rule in self.rules:
+            for token, action in rule.tokens.items():
+                self.handlers.setdefault(token, []).append((rule, action))
+
+        # Inserting canonical blocks needs to know whether one is already kept
+        if any(a == INSERT_GTM_AFTER for hs in self.handlers.values() for _, a in hs):
+            self.handlers.setdefault("gtm_script", [])
+        if any(a == INSERT_NOSCRIPT_AFTER for hs in self.handlers.values() for _, a in hs):
+            self.handlers.setdefault("gtm_noscript", [])
+
+        wanted = [(name, pattern) for name, pattern in TOKENS if name in self.handlers]
+        self.pattern = compile_tokens(wanted)
+        self.code_pattern = compile_tokens([(name, pattern) for name, pattern in wanted
+                                            if name in CODE_TOKENS])
+
+    def apply(self, content: str) -> Tuple[str, Dict[str, int]]:
+        """Rewrite content; returns (new_content, {rule name: number of edits})."""
+        counts = {rule.name: 0 for rule in self.rules}
+        if self.pattern is None:
+            out = content
+        else:
+            out = self._scan(content, counts)
+        for rule in self.rules:
+            if rule.post:
+                cleaned = rule.post(out)
+                if cleaned != out:
+                    counts[rule.name] += 1
+                out = cleaned
+        return out, counts
+
+    def _scan(self, content: str, counts: Dict[str, int], pattern=None) -> str:
+        pattern = pattern or self.pattern
+        out: List[str] = []
+        seen = {"gtm_script": 0, "gtm_noscript": 0}
+        head_slot = body_slot = None
+        head_rule = body_rule = None
+        pos = 0
+
+        for match in pattern.finditer(content):
+            kind = match.lastgroup
+            text = match.group(0)
+            out.append(content[pos:match.start()])
+            pos = match.end()
+
+            keep = True
+            for rule, action in self.handlers[kind]:
+                if rule.when is not None and not rule.when(text):
+                    continue
+                if action == KEEP_FIRST and self.gtm_id not in text:
+                    continue  # another container's block is not a duplicate
+                if action == REMOVE or (action == KEEP_FIRST and seen[kind] > 0):
+                    keep = False
+                    counts[rule.name] += 1
+                    break
+
+            if kind in seen and keep and self.gtm_id in text:
+                seen[kind] += 1
+            if not keep:
+                continue
+
+            if kind in ELEMENT_TOKENS and self.code_pattern is not None:
+                text = self._scan(text, counts, self.code_pattern)
+            out.append(text)
+            for rule, action in self.handlers[kind]:
+                # Reserve a slot; whether to fill it is only known after the scan
+                if action == INSERT_GTM_AFTER and head_slot is None:
+                    head_slot, head_rule = len(out), rule
+                    out.append('')
+                elif action == INSERT_NOSCRIPT_AFTER and body_slot is None:
+                    body_slot, body_rule = len(out), rule
+                    out.append('')
+
+        out.append(content[pos:])
+
+        if head_slot is not None and not seen["gtm_script"]:
+            out[head_slot] = '\n' + self.gtm_head
+            counts[head_rule.name] += 1
+        if body_slot is not None and not seen["gtm_noscript"]:
+            out[body_slot] = '\n' + self.gtm_body
+            counts[body_rule.name] += 1
+
+        return ''.join(out)
+
+
+def run(rule_names: List[str], title: str, tool: str, dry_run: bool = False,
+        root: str = ".", backup_dir: str = None) -> dict:
+    """Apply rules to every page of the corpus with backups and atomic writes."""
+    engine = RuleEngine(rule_names)
+    backups = BackupStore(backup_dir) if backup_dir else BackupStore()
+    corpus = get_corpus(root)
+
+    print(f"=== {title} ===")
+    print(f"GTM Container: {GTM_ID}")
+    print(f"Rules: {', '.join(rule_names)}")
+    print(f"Dry run: {dry_run}")
+    print()
+    print(f"Found {len(corpus)} HTML files to process")
+    print()
+
+    stats = {'processed': 0, 'changed': 0, 'edits': 0, 'errors': 0}
+    for doc in corpus:
+        stats['processed'] += 1
+        try:
+            new_content, counts = engine.apply(doc.text)
+            if new_content == doc.text:
+                print(f"⚪ {doc.path} - no changes")
+                continue
+            if not dry_run:
+                backups.save(doc.path, doc.data, tool=tool)
+                doc.write_text(new_content)
+            stats['changed'] += 1
+            stats['edits'] += sum(counts.values())
+            applied = ', '.join(f"{name} x{n}" for name, n in counts.items() if n)
+            print(f"✅ {doc.path} - {applied}")
+        except Exception as e:
+            stats['errors'] += 1
+            print(f"❌ {doc.path} - error: {e}")
+
+    print()
+    print("=== Summary ===")
+    print(f"Files processed: {stats['processed']}")
+    print(f"Files {'that would change' if dry_run else 'changed'}: {stats['changed']}")
+    print(f"Rule applications: {stats['edits']}")
+    print(f"Errors: {stats['errors']}")
+    if not dry_run and stats['changed']:
+        print(f"Backups stored in: {backups.root} (see tools/backup_store.py)")
+    return stats
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Apply GTM/gtag rewrite rules in a single pass per file")
+    parser.add_argument('--preset', choices=sorted(PRESETS), help='Named rule set')
+    parser.add_argument('--rules', help='Comma-separated rule names (see --list)')
+    parser.add_argument('--list', action='store_true', help='List available rules and presets')
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing files')
+    parser.add_argument('--root-path', default='.', help='Root path to search for HTML files')
+    args = parser.parse_args()
+
+    if args.list or not (args.preset or args.rules):
+        print("Rules:")
+        for rule in RULES.values():
+            print(f"  {rule.name:<28} {rule.description}")
+        print("\nPresets:")
+        for name, rules in PRESETS.items():
+            print(f"  {name:<10} {', '.join(rules)}")
+        return
+
+    rule_names = list(PRESETS[args.preset]) if args.preset else []
+    if args.rules:
+        rule_names += [r.strip() for r in args.rules.split(',') if r.strip() and r.strip() not in rule_names]
+
+    try:
+        stats = run(rule_names, "GTM Rule Engine", "gtm_rules", dry_run=args.dry_run, root=args.root_path)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(2)
+    if stats['errors']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
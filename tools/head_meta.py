@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Head Metadata Extraction and Alternate-Graph Check
+
+Pulls the canonical URL, hreflang alternates, og:url and robots directives out
+of a page with a streaming HTMLParser that stops at </head> (or <body>), so
+the article body is never tokenized. check_alternate_graph() then verifies the
+EN<->ES hreflang graph across every page:
+
+- missing or non-self canonical, og:url that disagrees with the canonical
+- no self-referencing hreflang entry
+- hreflang targets that are not pages of the site (broken)
+- A -> B without B -> A (asymmetric)
+
+Usage:
+    from head_meta import extract_head_meta, check_alternate_graph
+
+    meta = extract_head_meta(html)
+    issues = check_alternate_graph({url: meta, ...})
+"""
+
+from html.parser import HTMLParser
+from typing import Dict, List, Optional
+
+CHUNK_SIZE = 8192
+
+
+class HeadMetaParser(HTMLParser):
+    """Collects canonical/alternate/og:url/robots until the head is closed."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.done = False
+        self.canonical: Optional[str] = None
+        self.alternates: Dict[str, str] = {}
+        self.og_url: Optional[str] = None
+        self.robots: Optional[str] = None
+
+    def handle_starttag(self, tag, attrs):
+        if self.done:
+            return
+        if tag == 'body':
+            self.done = True
+            return
+        attrs = {k: (v or '') for k, v in attrs}
+        if tag == 'link':
+            rel = attrs.get('rel', '').lower().split()
+            if 'canonical' in rel and self.canonical is None:
+                self.canonical = attrs.get('href', '').strip()
+            elif 'alternate' in rel and attrs.get('hreflang'):
+                self.alternates.setdefault(attrs['hreflang'].strip().lower(), attrs.get('href', '').strip())
+        elif tag == 'meta':
+            if attrs.get('property', '').lower() == 'og:url' and self.og_url is None:
+                self.og_url = attrs.get('content', '').strip()
+            elif attrs.get('name', '').lower() == 'robots':
+                self.robots = attrs.get('content', '').strip().lower()
+
+    handle_startendtag = handle_starttag
+
+    def handle_endtag(self, tag):
+        if tag == 'head':
+            self.done = True
+
+
+def extract_head_meta(html: str) -> dict:
+    """Parse only the <head> of a page, feeding it in chunks until </head>."""
+    parser = HeadMetaParser()
+    for start in range(0, len(html), CHUNK_SIZE):
+        parser.feed(html[start:start + CHUNK_SIZE])
+        if parser.done:
+            break
+    return {
+        "canonical": parser.canonical,
+        "alternates": parser.alternates,
+        "og_url": parser.og_url,
+        "robots": parser.robots,
+    }
+
+
+def check_alternate_graph(pages: Dict[str, dict], languages=('en', 'es')) -> List[dict]:
+    """Check canonicals and the hreflang graph; pages maps page URL -> head metadata."""
+    issues = []
+
+    def report(url, kind, detail):
+        issues.append({"url": url, "type": kind, "detail": detail})
+
+    for url, meta in pages.items():
+        canonical = meta.get("canonical")
+        if not canonical:
+            report(url, "missing_canonical", "no <link rel=canonical>")
+        elif canonical != url:
+            report(url, "canonical_mismatch", f"canonical is {canonical}")
+        if meta.get("og_url") and canonical and meta["og_url"] != canonical:
+            report(url, "og_url_mismatch", f"og:url is {meta['og_url']}")
+
+        alternates = meta.get("alternates", {})
+        if not alternates:
+            continue
+        page_lang = next((lang for lang, target in alternates.items()
+                          if target == url and lang in languages), None)
+        if url not in alternates.values():
+            report(url, "missing_self_hreflang", "no hreflang entry points at the page itself")
+
+        for lang, target in alternates.items():
+            if target not in pages:
+                report(url, "broken_hreflang", f"{lang} -> {target} is not a page of the site")
+                continue
+            if lang not in languages or target == url:
+                continue
+            # The target must point back at this page under this page's language
+            back = pages[target].get("alternates", {})
+            if page_lang is None or back.get(page_lang) != url:
+                report(url, "asymmetric_hreflang", f"{lang} -> {target}, which does not link back")
+
+    return issues
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Shared HTML Corpus
+
+Walks the project tree once, applies one canonical exclusion policy and hands
+out cached, lazily-loaded documents so every tool reads each page at most once
+per process.
+
+doc.text is strict UTF-8 so a page is never rewritten with bytes silently
+dropped; tools that write pages iterate corpus.decodable(), which reports and
+skips pages in another encoding. Read-only checks use doc.lenient_text.
+
+Usage:
+    from html_corpus import get_corpus
+
+    for doc in get_corpus():
+        print(doc.path, len(doc.text))
+
+Running this module directly prints a short inventory of the corpus:
+    python3 tools/html_corpus.py
+"""
+
+import os
+import hashlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+# Directories that never contain publishable pages
+EXCLUDED_DIRS = {
+    '.git', 'node_modules', 'dist', 'build', '.next', 'out',
+    'tools', 'scripts',
+}
+
+# Backup files written by the GTM fix scripts (e.g. index.html.bak_gtmfix)
+BACKUP_MARKER = '.bak_'
+
+HTML_EXTENSIONS = ('.html',)
+
+
+def is_excluded_dir(name: str) -> bool:
+    """Return True if a directory should be skipped while walking."""
+    return name in EXCLUDED_DIRS or name.startswith('.')
+
+
+def is_backup_file(name: str) -> bool:
+    """Return True if a file name looks like a backup copy."""
+    return BACKUP_MARKER in name
+
+
+def walk_files(root: str = ".", extensions=HTML_EXTENSIONS) -> List[Path]:
+    """Walk the tree once and return matching files, sorted, relative to root."""
+    root_path = Path(root)
+    found = []
+    for current, dirs, files in os.walk(root_path):
+        dirs[:] = sorted(d for d in dirs if not is_excluded_dir(d))
+        for name in files:
+            if name.startswith('.') or is_backup_file(name):
+                continue
+            if name.lower().endswith(extensions):
+                found.append((Path(current) / name).relative_to(root_path))
+    return sorted(found)
+
+
+class HtmlDocument:
+    """A single page of the corpus. Content is read on first access and cached."""
+
+    def __init__(self, root: Path, path: Path):
+        self.root = root
+        self.path = path
+        self._data: Optional[bytes] = None
+        self._text: Optional[str] = None
+        self._lower: Optional[str] = None
+        self._digest: Optional[str] = None
+
+    def __repr__(self) -> str:
+        return f"HtmlDocument({str(self.path)!r})"
+
+    @property
+    def full_path(self) -> Path:
+        return self.root / self.path
+
+    @property
+    def url(self) -> str:
+        """Site-relative URL of the file, e.g. /articles/wallets.html"""
+        return '/' + self.path.as_posix()
+
+    @property
+    def data(self) -> bytes:
+        if self._data is None:
+            with open(self.full_path, 'rb') as f:
+                self._data = f.read()
+        return self._data
+
+    @property
+    def text(self) -> str:
+        """Content as UTF-8; raises UnicodeDecodeError for a page in another encoding."""
+        if self._text is None:
+            self._text = self.data.decode('utf-8')
+        return self._text
+
+    @property
+    def lenient_text(self) -> str:
+        """Content as UTF-8 with undecodable bytes dropped; never write this back."""
+        try:
+            return self.text
+        except UnicodeDecodeError:
+            return self.data.decode('utf-8', errors='ignore')
+
+    @property
+    def lower(self) -> str:
+        if self._lower is None:
+            self._lower = self.text.lower()
+        return self._lower
+
+    @property
+    def digest(self) -> str:
+        """SHA-1 of the raw file content."""
+        if self._digest is None:
+            self._digest = hashlib.sha1(self.data).hexdigest()
+        return self._digest
+
+    def stat(self) -> os.stat_result:
+        return self.full_path.stat()
+
+    def is_loaded(self) -> bool:
+        return self._data is not None
+
+    def write_text(self, content: str):
+        """Write new content to disk and refresh the cached copy."""
+        atomic_write_text(self.full_path, content)
+        self._data = content.encode('utf-8')
+        self._text = content
+        self._lower = None
+        self._digest = None
+
+    def invalidate(self):
+        """Drop the cached content so the next access re-reads the file."""
+        self._data = None
+        self._text = None
+        self._lower = None
+        self._digest = None
+
+
+class HtmlCorpus:
+    """All publishable HTML pages under a root, walked once."""
+
+    def __init__(self, root: str = ".", extensions=HTML_EXTENSIONS):
+        self.root = Path(root)
+        self.extensions = extensions
+        self._docs: Optional[Dict[Path, HtmlDocument]] = None
+
+    def _load(self) -> Dict[Path, HtmlDocument]:
+        if self._docs is None:
+            self._docs = {
+                path: HtmlDocument(self.root, path)
+                for path in walk_files(self.root, self.extensions)
+            }
+        return self._docs
+
+    def __iter__(self) -> Iterator[HtmlDocument]:
+        return iter(self._load().values())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    @property
+    def paths(self) -> List[Path]:
+        return list(self._load().keys())
+
+    def decodable(self, log=print) -> Iterator[HtmlDocument]:
+        """Pages that decode as UTF-8; the others are reported through log and skipped."""
+        for doc in self:
+            try:
+                doc.text
+            except UnicodeDecodeError as e:
+                log(f"❌ {doc.path} - not valid UTF-8 ({e.reason} at byte {e.start}), skipped")
+                continue
+            yield doc
+
+    def get(self, path) -> Optional[HtmlDocument]:
+        """Look up a document by its path relative to the corpus root."""
+        return self._load().get(Path(path))
+
+    def refresh(self):
+        """Forget the file list and all cached content."""
+        self._docs = None
+
+
+_CORPORA: Dict[tuple, HtmlCorpus] = {}
+
+
+def get_corpus(root: str = ".", extensions=HTML_EXTENSIONS) -> HtmlCorpus:
+    """Return the shared corpus for a root, creating it on first use."""
+    key = (str(Path(root).resolve()), tuple(extensions))
+    if key not in _CORPORA:
+        _CORPORA[key] = HtmlCorpus(root, extensions)
+    return _CORPORA[key]
+
+
+def atomic_write_text(path: Path, content: str):
+    """Write through a temp file in the same directory, then rename over the target."""
+    path = Path(path)
+    tmp_path = path.with_name(f".{path.name}.tmp{os.getpid()}")
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if path.exists():
+            os.chmod(tmp_path, path.stat().st_mode & 0o777)
+        os.replace(tmp_path, path)
+    finally:
+        if tmp_path.exists():
+            tmp_path.unlink()
+
+
+def main():
+    """Print a short inventory of the corpus."""
+    corpus = get_corpus()
+    print("=== HTML CORPUS ===")
+    print(f"Root: {corpus.root.resolve()}")
+    print(f"Excluded directories: {', '.join(sorted(EXCLUDED_DIRS))}")
+    print(f"Pages: {len(corpus)}")
+    print()
+    for doc in corpus:
+        print(f"  {doc.url}")
+
+
+if __name__ == "__main__":
+    main()
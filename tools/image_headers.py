@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Image Dimension Injector
+
+Gives every <img> on the site intrinsic dimensions and loading hints so the
+browser can reserve space before the image arrives (no layout shift):
+1. Dimensions are read from the file headers only (PNG IHDR, JPEG SOF with
+   EXIF orientation, GIF, WebP VP8/VP8L/VP8X, AVIF ispe, SVG width/height or
+   viewBox); images are never decoded
+2. Results are cached in .build-cache/image-dimensions.json, keyed by file
+   hash, with an mtime/size fast path so unchanged images are not re-read
+3. In one pass over all pages, width/height are added where missing, and
+   loading="lazy" decoding="async" are added to every image except the first
+   one on the page (the above-the-fold hero, which is never lazy-loaded)
+Existing width/height values are kept; they are often display sizes.
+
+Usage:
+    python3 tools/image_headers.py [--dry-run] [--no-cache]
+"""
+
+import os
+import re
+import json
+import struct
+import hashlib
+import argparse
+from html import unescape
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple
+
+from backup_store import BackupStore
+from html_corpus import atomic_write_text, get_corpus
+from link_graph import site_path
+
+CACHE_PATH = '.build-cache/image-dimensions.json'
+CACHE_VERSION = 1
+
+# Enough for the AVIF meta box and SVG root element
+HEAD_BYTES = 64 * 1024
+
+RE_IMG_TAG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+RE_SCRIPT = re.compile(r'<script\b.*?</script\s*>', re.IGNORECASE | re.DOTALL)
+RE_ATTR = re.compile(r'([\w:-]+)\s*=\s*("([^"]*)"|\'([^\']*)\')')
+RE_SVG_TAG = re.compile(rb'<svg\b[^>]*>', re.IGNORECASE)
+RE_SVG_LENGTH = re.compile(r'^\s*([\d.]+)\s*(px)?\s*$')
+
+# JPEG start-of-frame markers (C4 = DHT, C8 = JPG, CC = DAC are not frames)
+JPEG_SOF = {0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7, 0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF}
+JPEG_STANDALONE = {0x01, 0xD0, 0xD1, 0xD2, 0xD3, 0xD4, 0xD5, 0xD6, 0xD7, 0xD8, 0xD9}
+
+Size = Tuple[int, int]
+
+
+def exif_orientation(app1: bytes) -> int:
+    """Orientation tag (1-8) from an APP1 Exif segment, 1 if absent."""
+    if not app1.startswith(b'Exif\0\0') or len(app1) < 14:
+        return 1
+    tiff = app1[6:]
+    endian = '<' if tiff[:2] == b'II' else '>'
+    try:
+        offset = struct.unpack(endian + 'I', tiff[4:8])[0]
+        count = struct.unpack(endian + 'H', tiff[offset:offset + 2])[0]
+        for i in range(count):
+            entry = tiff[offset + 2 + i * 12:offset + 14 + i * 12]
+            if struct.unpack(endian + 'H', entry[:2])[0] == 0x0112:
+                return struct.unpack(endian + 'H', entry[8:10])[0]
+    except struct.error:
+        pass
+    return 1
+
+
+def jpeg_size(f) -> Optional[Size]:
+    """Walk JPEG markers up to the first SOF, seeking over segment bodies."""
+    f.seek(2)
+    orientation = 1
+    while True:
+        byte = f.read(1)
+        while byte and byte != b'\xff':
+            byte = f.read(1)
+        while byte == b'\xff':
+            byte = f.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker in JPEG_STANDALONE:
+            continue
+        length_bytes = f.read(2)
+        if len(length_bytes) < 2:
+            return None
+        length = struct.unpack('>H', length_bytes)[0]
+        if marker in JPEG_SOF:
+            frame = f.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            # Orientations 5-8 are rotated by 90 degrees when displayed
+            return (height, width) if orientation >= 5 else (width, height)
+        if marker == 0xE1 and orientation == 1:
+            orientation = exif_orientation(f.read(length - 2))
+        else:
+            f.seek(length - 2, os.SEEK_CUR)
+
+
+def webp_size(head: bytes) -> Optional[Size]:
+    chunk = head[12:16]
+    if chunk == b'VP8 ' and len(head) >= 30:
+        width, height = struct.unpack('<HH', head[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L' and len(head) >= 25 and head[20] == 0x2F:
+        bits = struct.unpack('<I', head[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X' and len(head) >= 30:
+        return (int.from_bytes(head[24:27], 'little') + 1,
+                int.from_bytes(head[27:30], 'little') + 1)
+    return None
+
+
+def avif_size(head: bytes, start: int = 0, end: Optional[int] = None) -> Optional[Size]:
+    """Largest ispe (image spatial extents) box inside meta/iprp/ipco."""
+    end = len(head) if end is None else end
+    best = None
+    pos = start
+    while pos + 8 <= end:
+        size, kind = struct.unpack('>I4s', head[pos:pos + 8])
+        header = 8
+        if size == 1 and pos + 16 <= end:
+            size, header = struct.unpack('>Q', head[pos + 8:pos + 16])[0], 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return best
+        body = pos + header
+        found = None
+        if kind == b'meta':
+            found = avif_size(head, body + 4, min(pos + size, end))
+        elif kind in (b'iprp', b'ipco'):
+            found = avif_size(head, body, min(pos + size, end))
+        elif kind == b'ispe' and body + 12 <= end:
+            found = struct.unpack('>II', head[body + 4:body + 12])
+        if found and (best is None or found[0] * found[1] > best[0] * best[1]):
+            best = found
+        pos += size
+    return best
+
+
+def svg_size(head: bytes) -> Optional[Size]:
+    match = RE_SVG_TAG.search(head)
+    if not match:
+        return None
+    attrs = {k.lower(): v for k, v in parse_attrs(match.group(0).decode('utf-8', 'replace')).items()}
+    width, height = (RE_SVG_LENGTH.match(attrs.get(k, '')) for k in ('width', 'height'))
+    if width and height:
+        return round(float(width.group(1))), round(float(height.group(1)))
+    view_box = attrs.get('viewbox', '').replace(',', ' ').split()
+    if len(view_box) == 4:
+        try:
+            return round(float(view_box[2])), round(float(view_box[3]))
+        except ValueError:
+            pass
+    return None
+
+
+def read_dimensions(path) -> Optional[Size]:
+    """Intrinsic (width, height) of an image file from its header, or None."""
+    with open(path, 'rb') as f:
+        head = f.read(32)
+        if head.startswith(b'\x89PNG\r\n\x1a\n') and head[12:16] == b'IHDR':
+            return struct.unpack('>II', head[16:24])
+        if head[:6] in (b'GIF87a', b'GIF89a'):
+            return struct.unpack('<HH', head[6:10])
+        if head.startswith(b'\xff\xd8'):
+            return jpeg_size(f)
+        if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+            return webp_size(head)
+        head += f.read(HEAD_BYTES - len(head))
+        if head[4:8] == b'ftyp':
+            return avif_size(head)
+        if b'<svg' in head.lower():
+            return svg_size(head)
+    return None
+
+
+def file_digest(path) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class DimensionCache:
+    """Image dimensions keyed by file hash, with a per-path stat fast path."""
+
+    def __init__(self, root: str = ".", cache_path: Optional[str] = None, use_cache: bool = True):
+        self.root = Path(root)
+        self.cache_path = cache_path or str(self.root / CACHE_PATH)
+        self.use_cache = use_cache
+        self.files: Dict[str, dict] = {}
+        self.sizes: Dict[str, list] = {}
+        self.stats = {'read': 0, 'cached': 0, 'unknown': 0}
+        if use_cache:
+            try:
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self.files, self.sizes = data['files'], data['sizes']
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def get(self, rel_path: str) -> Optional[Size]:
+        full = self.root / rel_path
+        try:
+            st = full.stat()
+        except OSError:
+            return None
+        entry = self.files.get(rel_path)
+        if entry and entry['mtime'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            digest = entry['sha1']
+        else:
+            digest = file_digest(full)
+            self.files[rel_path] = {'mtime': st.st_mtime_ns, 'size': st.st_size, 'sha1': digest}
+        if digest in self.sizes:
+            self.stats['cached'] += 1
+        else:
+            self.stats['read'] += 1
+            try:
+                size = read_dimensions(full)
+            except (OSError, struct.error):
+                size = None
+            self.sizes[digest] = list(size) if size and all(size) else None
+        if self.sizes[digest] is None:
+            self.stats['unknown'] += 1
+            return None
+        return tuple(self.sizes[digest])
+
+    def save(self):
+        if not self.use_cache:
+            return
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+        atomic_write_text(Path(self.cache_path), json.dumps(
+            {'version': CACHE_VERSION, 'files': self.files, 'sizes': self.sizes}, separators=(',', ':')))
+
+
+def parse_attrs(tag: str) -> Dict[str, str]:
+    return {m.group(1).lower(): unescape(m.group(3) if m.group(3) is not None else m.group(4))
+            for m in RE_ATTR.finditer(tag)}
+
+
+def add_attrs(tag: str, attrs: Dict[str, str]) -> str:
+    """Append attributes before the tag's closing '>' or '/>'."""
+    end = len(tag) - (2 if tag.endswith('/>') else 1)
+    body = tag[:end].rstrip()
+    return body + ''.join(f' {k}="{v}"' for k, v in attrs.items()) + tag[end:].replace('/>', ' />')
+
+
+def inject_attributes(content: str, lookup: Callable[[str], Optional[Size]]) -> Tuple[str, int]:
+    """Add dimensions and loading hints to every <img>; returns (content, tags changed)."""
+    scripts = [m.span() for m in RE_SCRIPT.finditer(content)]
+    out, pos, changed, seen_first = [], 0, 0, False
+    for match in RE_IMG_TAG.finditer(content):
+        if any(start <= match.start() < end for start, end in scripts):
+            continue
+        tag = match.group(0)
+        attrs = parse_attrs(tag)
+        first, seen_first = not seen_first, True
+        new_tag, extra = tag, {}
+
+        if 'width' not in attrs or 'height' not in attrs:
+            size = lookup(attrs.get('src', ''))
+            if size:
+                width, height = size
+                if 'width' in attrs and attrs['width'].isdigit():
+                    extra['height'] = str(round(int(attrs['width']) * height / width))
+                elif 'height' in attrs and attrs['height'].isdigit():
+                    extra['width'] = str(round(int(attrs['height']) * width / height))
+                elif 'width' not in attrs and 'height' not in attrs:
+                    extra.update(width=str(width), height=str(height))
+
+        if first:
+            # The hero image must not wait for layout
+            if attrs.get('loading', '').lower() == 'lazy':
+                new_tag = re.sub(r'\bloading\s*=\s*(["\'])lazy\1', 'loading="eager"', new_tag, flags=re.IGNORECASE)
+        else:
+            if 'loading' not in attrs:
+                extra['loading'] = 'lazy'
+            if 'decoding' not in attrs:
+                extra['decoding'] = 'async'
+
+        if extra:
+            new_tag = add_attrs(new_tag, extra)
+        if new_tag != tag:
+            out.append(content[pos:match.start()])
+            out.append(new_tag)
+            pos = match.end()
+            changed += 1
+    out.append(content[pos:])
+    return ''.join(out), changed
+
+
+def run(root: str = ".", dry_run: bool = False, use_cache: bool = True, backup_dir=None, log=print) -> dict:
+    """Inject attributes across every page in one pass."""
+    cache = DimensionCache(root, use_cache=use_cache)
+    backups = BackupStore(backup_dir) if backup_dir else BackupStore()
+    stats = {'pages': 0, 'changed_pages': 0, 'tags': 0}
+
+    for doc in get_corpus(root).decodable(log):
+        stats['pages'] += 1
+
+        def lookup(src: str) -> Optional[Size]:
+            path = site_path(doc.url, src) if src else None
+            return cache.get(path.lstrip('/')) if path and path != '/' else None
+
+        content, changed = inject_attributes(doc.text, lookup)
+        if not changed:
+            continue
+        stats['changed_pages'] += 1
+        stats['tags'] += changed
+        log(f"{'Would update' if dry_run else '✅ Updated'} {changed} <img> tag(s) in {doc.path}")
+        if not dry_run:
+            backups.save(doc.path, doc.data, tool="image_headers")
+            doc.write_text(content)
+
+    cache.save()
+    stats.update(cache.stats)
+    return stats
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Add width/height and lazy-loading hints to <img> tags")
+    parser.add_argument('--dry-run', action='store_true', help='Report changes without writing')
+    parser.add_argument('--no-cache', action='store_true', help='Re-read every image header')
+    args = parser.parse_args()
+
+    print("=== IMAGE DIMENSIONS ===")
+    stats = run(dry_run=args.dry_run, use_cache=not args.no_cache)
+    print(f"\nPages: {stats['pages']} ({stats['changed_pages']} {'to update' if args.dry_run else 'updated'})")
+    print(f"<img> tags changed: {stats['tags']}")
+    print(f"Images: {stats['read']} headers read, {stats['cached']} from cache, {stats['unknown']} unreadable")
+
+
+if __name__ == "__main__":
+    main()
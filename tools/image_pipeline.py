@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Responsive Image Pipeline
+
+Turns the full-size product photos in photos/ and assets/images/ into
+responsive variants:
+1. Each source gets a slug-safe, content-hashed base name
+   ("Travelon Anti-Theft ... Bag.jpg" -> travelon-anti-theft-...-bag-1a2b3c4d)
+2. Photos are turned upright by their EXIF orientation, then resized widths
+   (never upscaled) are encoded as JPEG, WebP and, when the
+   installed Pillow supports it, AVIF, using a process pool
+3. Outputs are cached by source hash (.build-cache/images.json), so unchanged
+   photos are skipped on the next run
+4. assets/images/optimized/manifest.json maps every original URL to its
+   variants. Variants of the previous build are kept for pages still
+   pointing at them; older ones are removed
+5. With --rewrite-html every <img> that references an optimized photo
+   becomes a <picture> with srcset/sizes
+
+Encoding needs Pillow (pip install Pillow). Without it the encode step is
+skipped with a warning; --rewrite-html only needs the manifest.
+
+Usage:
+    python3 tools/image_pipeline.py [--jobs N] [--rewrite-html] [--dry-run]
+"""
+
+import os
+import re
+import json
+import hashlib
+import argparse
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from html import escape, unescape
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote, unquote
+
+try:
+    from PIL import Image, ImageOps, features
+except ImportError:
+    Image = ImageOps = features = None
+
+from backup_store import BackupStore
+from html_corpus import atomic_write_text, get_corpus, walk_files
+
+SOURCE_DIRS = ['photos', 'assets/images']
+OUTPUT_DIR = 'assets/images/optimized'
+MANIFEST_PATH = OUTPUT_DIR + '/manifest.json'
+CACHE_PATH = '.build-cache/images.json'
+PIPELINE_VERSION = 2
+
+SOURCE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp')
+WIDTHS = (320, 640, 960, 1280)
+QUALITY = {'jpeg': 80, 'webp': 78, 'avif': 55}
+FORMAT_EXT = {'jpeg': 'jpg', 'webp': 'webp', 'avif': 'avif'}
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+# Article images are at most the content column wide
+DEFAULT_SIZES = "(max-width: 768px) 100vw, 768px"
+
+RE_IMG_TAG = re.compile(r'<img\b[^>]*>', re.IGNORECASE)
+RE_PICTURE = re.compile(r'<picture\b.*?</picture\s*>', re.IGNORECASE | re.DOTALL)
+RE_ATTR = re.compile(r'([\w:-]+)\s*=\s*("([^"]*)"|\'([^\']*)\')')
+# Encoded variant file names (hashed_name() + '-<width>.<ext>')
+RE_VARIANT = re.compile(r'^[a-z0-9-]+-[0-9a-f]{8}-\d+\.(?:%s)$' % '|'.join(FORMAT_EXT.values()))
+
+
+def slugify(name: str, max_length: int = 60) -> str:
+    """Lowercase ASCII slug of a file stem."""
+    ascii_name = unicodedata.normalize('NFKD', name).encode('ascii', 'ignore').decode('ascii')
+    slug = re.sub(r'[^a-z0-9]+', '-', ascii_name.lower()).strip('-')
+    return slug[:max_length].rstrip('-') or 'image'
+
+
+def hashed_name(source: Path, digest: str) -> str:
+    return f"{slugify(source.stem)}-{digest[:8]}"
+
+
+def available_formats() -> List[str]:
+    """Encodings the installed Pillow can write, best first."""
+    if Image is None:
+        return []
+    formats = ['webp'] if features.check('webp') else []
+    try:
+        if features.check('avif'):
+            formats.insert(0, 'avif')
+    except ValueError:
+        pass
+    return formats + ['jpeg']
+
+
+def encode_image(job: dict) -> dict:
+    """Resize and encode one source image (process pool worker)."""
+    with Image.open(job['source']) as img:
+        img.load()
+        # Camera photos are often stored sideways with an EXIF rotation flag
+        img = ImageOps.exif_transpose(img)
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGB')
+        width, height = img.size
+        widths = sorted({w for w in WIDTHS if w < width} | {min(width, max(WIDTHS))})
+        variants = {fmt: [] for fmt in job['formats']}
+        for target_width in widths:
+            target_height = round(height * target_width / width)
+            resized = img if target_width == width else img.resize((target_width, target_height), Image.LANCZOS)
+            for fmt in job['formats']:
+                out = resized.convert('RGB') if fmt == 'jpeg' else resized
+                name = f"{job['name']}-{target_width}.{FORMAT_EXT[fmt]}"
+                out_path = Path(job['out_dir']) / name
+                tmp_path = out_path.with_name(f".{name}.tmp{os.getpid()}")
+                save_args = {'quality': QUALITY[fmt]}
+                if fmt == 'jpeg':
+                    save_args.update(optimize=True, progressive=True)
+                out.save(tmp_path, format=fmt.upper(), **save_args)
+                os.replace(tmp_path, out_path)
+                variants[fmt].append([name, target_width])
+    return {'width': width, 'height': height, 'variants': variants}
+
+
+def file_digest(path: Path) -> str:
+    h = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def load_json(path: str, default: dict) -> dict:
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+
+def source_url(rel_path: Path) -> str:
+    return '/' + rel_path.as_posix()
+
+
+def manifest_files(manifest: dict) -> set:
+    """Variant file names referenced by an optimized-images manifest."""
+    return {url.rsplit('/', 1)[-1]
+            for entry in manifest.get('images', {}).values()
+            for candidates in entry['sources'].values()
+            for url, _ in candidates}
+
+
+def prune_outputs(out_dir: Path, manifest: dict, previous: dict) -> int:
+    """Remove variants used by neither this build's nor the previous build's manifest."""
+    keep = manifest_files(manifest) | manifest_files(previous)
+    pruned = 0
+    for path in sorted(Path(out_dir).iterdir()):
+        if RE_VARIANT.match(path.name) and path.name not in keep:
+            path.unlink()
+            pruned += 1
+    return pruned
+
+
+def optimize_images(root: str = ".", jobs: int = 0, log=print) -> Optional[dict]:
+    """Encode every new or changed source; returns the manifest, or None without Pillow."""
+    formats = available_formats()
+    if not formats:
+        log("⚠️  Pillow is not installed (pip install Pillow); skipping image encoding")
+        return None
+
+    root_path = Path(root)
+    out_dir = root_path / OUTPUT_DIR
+    out_dir.mkdir(parents=True, exist_ok=True)
+    previous = load_json(str(root_path / MANIFEST_PATH), {})
+    cache_file = str(root_path / CACHE_PATH)
+    cache = load_json(cache_file, {})
+    if cache.get('version') != PIPELINE_VERSION or cache.get('formats') != formats:
+        cache = {'version': PIPELINE_VERSION, 'formats': formats, 'images': {}}
+
+    sources = []
+    for source_dir in SOURCE_DIRS:
+        if (root_path / source_dir).is_dir():
+            for rel in walk_files(root_path / source_dir, SOURCE_EXTENSIONS):
+                rel_path = Path(source_dir) / rel
+                if not rel_path.as_posix().startswith(OUTPUT_DIR + '/'):
+                    sources.append(rel_path)
+
+    images, pending = {}, []
+    for rel_path in sources:
+        digest = file_digest(root_path / rel_path)
+        cached = cache['images'].get(digest)
+        if cached and all((out_dir / name).exists() for v in cached['variants'].values() for name, _ in v):
+            images[digest] = cached
+        else:
+            pending.append((rel_path, digest))
+
+    log(f"Sources: {len(sources)} ({len(sources) - len(pending)} cached, {len(pending)} to encode)")
+    log(f"Formats: {', '.join(formats)}")
+
+    job_list = [{'source': str(root_path / rel), 'name': hashed_name(rel, digest),
+                 'out_dir': str(out_dir), 'formats': formats} for rel, digest in pending]
+    jobs = jobs or os.cpu_count() or 1
+    if jobs > 1 and len(job_list) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(encode_image, job_list))
+    else:
+        results = [encode_image(job) for job in job_list]
+    for (rel_path, digest), result in zip(pending, results):
+        images[digest] = result
+        log(f"✅ {rel_path} -> {hashed_name(rel_path, digest)} ({len(result['variants']['jpeg'])} widths)")
+
+    cache['images'] = images
+    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+    atomic_write_text(Path(cache_file), json.dumps(cache, separators=(',', ':')))
+
+    manifest = {'version': PIPELINE_VERSION, 'images': {}}
+    for rel_path in sources:
+        entry = images[file_digest(root_path / rel_path)]
+        base = '/' + OUTPUT_DIR + '/'
+        manifest['images'][source_url(rel_path)] = {
+            'width': entry['width'],
+            'height': entry['height'],
+            'sources': {fmt: [[base + name, w] for name, w in variants] for fmt, variants in entry['variants'].items()},
+        }
+    atomic_write_text(root_path / MANIFEST_PATH, json.dumps(manifest, indent=1, ensure_ascii=False))
+    pruned = prune_outputs(out_dir, manifest, previous)
+    if pruned:
+        log(f"🗑️  Removed {pruned} variant(s) no longer referenced")
+    return manifest
+
+
+def parse_attrs(tag: str) -> Dict[str, str]:
+    return {m.group(1).lower(): unescape(m.group(3) if m.group(3) is not None else m.group(4))
+            for m in RE_ATTR.finditer(tag)}
+
+
+def srcset(candidates) -> str:
+    return ', '.join(f"{quote(url)} {width}w" for url, width in candidates)
+
+
+def picture_markup(attrs: Dict[str, str], entry: dict, sizes: str = DEFAULT_SIZES) -> str:
+    """Build a <picture> for an <img>, keeping its other attributes."""
+    sources = entry['sources']
+    fallback = sources['jpeg']
+    sizes = attrs.get('sizes', sizes)
+    parts = ['<picture>']
+    for fmt in ('avif', 'webp'):
+        if sources.get(fmt):
+            parts.append(f'<source type="{MIME_TYPES[fmt]}" srcset="{srcset(sources[fmt])}" sizes="{sizes}">')
+
+    kept = {k: v for k, v in attrs.items() if k not in ('src', 'srcset', 'sizes', 'width', 'height')}
+    img_attrs = {
+        'src': quote(fallback[-1][0]),
+        'srcset': srcset(fallback),
+        'sizes': sizes,
+        'width': str(entry['width']),
+        'height': str(entry['height']),
+        **kept,
+    }
+    parts.append('<img ' + ' '.join(f'{k}="{escape(v, quote=True)}"' for k, v in img_attrs.items()) + '>')
+    parts.append('</picture>')
+    return ''.join(parts)
+
+
+def rewrite_html(content: str, manifest: dict, sizes: str = DEFAULT_SIZES) -> tuple:
+    """Wrap every <img> of an optimized photo in a <picture>; returns (content, count)."""
+    images = manifest.get('images', {})
+    # Images already inside a <picture> are left alone
+    pictures = [m.span() for m in RE_PICTURE.finditer(content)]
+    out, pos, count = [], 0, 0
+    for match in RE_IMG_TAG.finditer(content):
+        attrs = parse_attrs(match.group(0))
+        entry = images.get(unquote(attrs.get('src', '')))
+        if entry is None or any(start <= match.start() < end for start, end in pictures):
+            continue
+        out.append(content[pos:match.start()])
+        out.append(picture_markup(attrs, entry, sizes))
+        pos = match.end()
+        count += 1
+    out.append(content[pos:])
+    return ''.join(out), count
+
+
+def rewrite_pages(manifest: dict, root: str = ".", dry_run: bool = False, backup_dir=None, log=print) -> int:
+    """Rewrite <img> tags across the corpus with backups and atomic writes."""
+    backups = BackupStore(backup_dir) if backup_dir else BackupStore()
+    changed = 0
+    for doc in get_corpus(root).decodable(log):
+        content, count = rewrite_html(doc.text, manifest)
+        if not count:
+            continue
+        changed += 1
+        log(f"{'Would rewrite' if dry_run else '✅ Rewrote'} {count} image(s) in {doc.path}")
+        if not dry_run:
+            backups.save(doc.path, doc.data, tool="image_pipeline")
+            doc.write_text(content)
+    return changed
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Build responsive image variants and rewrite <img> tags")
+    parser.add_argument('--jobs', '-j', type=int, default=0, help='Encoder processes (default: one per CPU)')
+    parser.add_argument('--rewrite-html', action='store_true', help='Rewrite <img> tags to <picture> with srcset')
+    parser.add_argument('--dry-run', action='store_true', help='Report HTML rewrites without writing')
+    args = parser.parse_args()
+
+    print("=== Image Pipeline ===")
+    manifest = optimize_images(jobs=args.jobs)
+    if manifest is None:
+        manifest = load_json(MANIFEST_PATH, None)
+        if manifest is None:
+            print("No manifest from a previous run; nothing to rewrite")
+            return
+        print(f"Using existing manifest: {MANIFEST_PATH}")
+
+    if args.rewrite_html:
+        changed = rewrite_pages(manifest, dry_run=args.dry_run)
+        print(f"Pages {'to rewrite' if args.dry_run else 'rewritten'}: {changed}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Site Link Graph
+
+Extracts every href/src/srcset from every page once, resolves each one the way
+Netlify serves it (netlify.toml redirects and rewrites via
+tools/netlify_redirects.py, then static files with pretty URLs) and stores the result as an adjacency index in
+.build-cache/link-graph.json. Broken-link, orphan-page and redirect-chain
+queries are answered from that index; only pages whose content changed are
+re-parsed on the next build.
+
+Usage:
+    python3 tools/link_graph.py [broken|orphans|redirects|summary] [--json]
+"""
+
+import os
+import sys
+import json
+import argparse
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urljoin, urlsplit
+
+from html_corpus import atomic_write_text, get_corpus
+from netlify_redirects import load_redirect_table
+
+GRAPH_PATH = '.build-cache/link-graph.json'
+GRAPH_VERSION = 1
+SITE_HOSTS = {'affordable-handbags.com', 'www.affordable-handbags.com'}
+REDIRECT_FILES = ['netlify.toml']
+MAX_HOPS = 10
+
+# Pages that are entry points and need no inbound links
+ENTRY_PAGES = {'index.html', 'es/index.html', '404.html'}
+
+# Attributes that reference other resources, per tag
+LINK_ATTRS = {
+    'a': ('href',),
+    'link': ('href',),
+    'script': ('src',),
+    'img': ('src', 'srcset'),
+    'source': ('src', 'srcset'),
+    'iframe': ('src',),
+    'video': ('src', 'poster'),
+    'audio': ('src',),
+}
+SKIP_LINK_RELS = {'preconnect', 'dns-prefetch'}
+SKIP_SCHEMES = ('mailto:', 'tel:', 'javascript:', 'data:', 'sms:', 'whatsapp:')
+
+
+class LinkExtractor(HTMLParser):
+    """Collects (attribute, value) pairs for every outgoing reference."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links: List[Tuple[str, str]] = []
+
+    def handle_starttag(self, tag, attrs):
+        names = LINK_ATTRS.get(tag)
+        if not names:
+            return
+        attrs = dict(attrs)
+        if tag == 'link' and SKIP_LINK_RELS & set((attrs.get('rel') or '').lower().split()):
+            return
+        for name in names:
+            value = (attrs.get(name) or '').strip()
+            if not value:
+                continue
+            if name == 'srcset':
+                for candidate in value.split(','):
+                    url = candidate.strip().split(' ')[0]
+                    if url:
+                        self.links.append((name, url))
+            else:
+                self.links.append((name, value))
+
+    handle_startendtag = handle_starttag
+
+
+def extract_links(html: str) -> List[Tuple[str, str]]:
+    parser = LinkExtractor()
+    parser.feed(html)
+    parser.close()
+    return parser.links
+
+
+def site_path(page_url: str, href: str) -> Optional[str]:
+    """Resolve an href to a decoded site path, or None if it leaves the site."""
+    if href.startswith('#') or href.lower().startswith(SKIP_SCHEMES) or '${' in href or '{{' in href:
+        return None
+    parts = urlsplit(urljoin(page_url, href))
+    if parts.scheme and parts.scheme not in ('http', 'https'):
+        return None
+    if parts.netloc and parts.netloc.lower() not in SITE_HOSTS:
+        return None
+    return unquote(parts.path) or '/'
+
+
+class LinkGraph:
+    """Adjacency index of every page's outgoing links, resolved against the site."""
+
+    def __init__(self, root: str = ".", redirect_files=None):
+        self.root = Path(root)
+        self.redirects = load_redirect_table([str(self.root / f) for f in (redirect_files or REDIRECT_FILES)])
+        self.files = self._site_files()
+        self.pages: Dict[str, dict] = {}
+        self.edges: Dict[str, List[dict]] = {}
+        self.stats = {'parsed': 0, 'cached': 0}
+
+    def _site_files(self) -> set:
+        """Every servable file, as a posix path relative to the root."""
+        files = set()
+        for current, dirs, names in os.walk(self.root):
+            dirs[:] = [d for d in dirs if not d.startswith('.') and d != 'node_modules']
+            rel_dir = Path(current).relative_to(self.root)
+            for name in names:
+                files.add((rel_dir / name).as_posix())
+        return files
+
+    def static_file(self, path: str) -> Optional[str]:
+        """The file Netlify would serve for a path (pretty URLs enabled)."""
+        rel = path.lstrip('/')
+        if not rel or rel.endswith('/'):
+            base = rel.rstrip('/')
+            candidates = [rel + 'index.html'] + ([base + '.html'] if base else [])
+        else:
+            candidates = [rel, rel + '.html', rel + '/index.html']
+        for candidate in candidates:
+            if candidate in self.files:
+                return candidate
+        return None
+
+    def resolve(self, path: str) -> dict:
+        """Follow redirects/rewrites and return {status, target, chain}."""
+        chain = []
+        seen = {path}
+        current = path
+        for _ in range(MAX_HOPS):
+            file = self.static_file(current)
+            hit = self.redirects.match(current)
+            if hit and (hit[0].force or file is None):
+                rule, to = hit
+                if rule.status == 200:
+                    file = self.static_file(unquote(urlsplit(to).path))
+                    return {'status': 'ok' if file else 'broken', 'target': file, 'chain': chain}
+                if rule.is_redirect:
+                    chain.append([current, to, rule.status])
+                    parts = urlsplit(to)
+                    if parts.netloc and parts.netloc.lower() not in SITE_HOSTS:
+                        return {'status': 'external', 'target': to, 'chain': chain}
+                    current = unquote(parts.path) or '/'
+                    if current in seen:
+                        return {'status': 'loop', 'target': None, 'chain': chain}
+                    seen.add(current)
+                    continue
+                return {'status': 'broken', 'target': None, 'chain': chain}
+            return {'status': 'ok' if file else 'broken', 'target': file, 'chain': chain}
+        return {'status': 'loop', 'target': None, 'chain': chain}
+
+    def build(self, cache_path: Optional[str] = None, use_cache: bool = True):
+        """Extract links (reusing cached extractions of unchanged pages) and resolve them."""
+        cache_path = cache_path or str(self.root / GRAPH_PATH)
+        cached = {}
+        if use_cache:
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    index = json.load(f)
+                if index.get('version') == GRAPH_VERSION:
+                    cached = index.get('pages', {})
+            except (OSError, ValueError):
+                pass
+
+        resolutions: Dict[str, dict] = {}
+        for doc in get_corpus(str(self.root)):
+            key = doc.path.as_posix()
+            st = doc.stat()
+            entry = cached.get(key)
+            if entry and entry['mtime'] == st.st_mtime_ns and entry['size'] == st.st_size:
+                self.stats['cached'] += 1
+            elif entry and entry['sha1'] == doc.digest:
+                entry = dict(entry, mtime=st.st_mtime_ns, size=st.st_size)
+                self.stats['cached'] += 1
+            else:
+                entry = {'mtime': st.st_mtime_ns, 'size': st.st_size, 'sha1': doc.digest,
+                         'links': extract_links(doc.lenient_text)}
+                self.stats['parsed'] += 1
+            self.pages[key] = entry
+
+            edges = []
+            for attr, href in entry['links']:
+                path = site_path(doc.url, href)
+                if path is None:
+                    continue
+                if path not in resolutions:
+                    resolutions[path] = self.resolve(path)
+                edges.append(dict(resolutions[path], href=href, attr=attr))
+            self.edges[key] = edges
+
+        if use_cache:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            atomic_write_text(Path(cache_path), json.dumps(
+                {'version': GRAPH_VERSION, 'pages': self.pages, 'edges': self.edges},
+                separators=(',', ':')
+            ))
+        return self
+
+    # Queries
+
+    def broken_links(self) -> List[dict]:
+        return [
+            {'page': page, 'href': edge['href'], 'status': edge['status'], 'chain': edge['chain']}
+            for page, edges in self.edges.items()
+            for edge in edges if edge['status'] in ('broken', 'loop')
+        ]
+
+    def inbound(self) -> Dict[str, set]:
+        incoming: Dict[str, set] = {page: set() for page in self.pages}
+        for page, edges in self.edges.items():
+            for edge in edges:
+                target = edge['target']
+                if edge['status'] == 'ok' and target in incoming and target != page:
+                    incoming[target].add(page)
+        return incoming
+
+    def orphans(self) -> List[str]:
+        return sorted(page for page, sources in self.inbound().items()
+                      if not sources and page not in ENTRY_PAGES)
+
+    def redirected_links(self, min_hops: int = 1) -> List[dict]:
+        return [
+            {'page': page, 'href': edge['href'], 'hops': len(edge['chain']), 'chain': edge['chain']}
+            for page, edges in self.edges.items()
+            for edge in edges if len(edge['chain']) >= min_hops and edge['status'] != 'loop'
+        ]
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Build the site link graph and query it")
+    parser.add_argument('query', nargs='?', default='summary', choices=['summary', 'broken', 'orphans', 'redirects'])
+    parser.add_argument('--json', action='store_true', help='Print query results as JSON')
+    parser.add_argument('--no-cache', action='store_true', help='Re-parse every page')
+    args = parser.parse_args()
+
+    graph = LinkGraph().build(use_cache=not args.no_cache)
+    broken = graph.broken_links()
+    orphans = graph.orphans()
+    redirected = graph.redirected_links()
+    chains = [r for r in redirected if r['hops'] > 1]
+
+    results = {'broken': broken, 'orphans': orphans, 'redirects': redirected}
+    if args.json:
+        data = results.get(args.query, {
+            'pages': len(graph.pages),
+            'links': sum(len(e) for e in graph.edges.values()),
+            'broken': len(broken), 'orphans': len(orphans),
+            'redirected': len(redirected), 'chains': len(chains),
+        })
+        print(json.dumps(data, indent=2))
+    else:
+        print("=== LINK GRAPH ===")
+        print(f"Pages: {len(graph.pages)} ({graph.stats['parsed']} parsed, {graph.stats['cached']} from cache)")
+        print(f"Internal links: {sum(len(e) for e in graph.edges.values())}")
+        if args.query in ('summary', 'broken'):
+            print(f"\n❌ Broken links: {len(broken)}")
+            for item in broken[:None if args.query == 'broken' else 10]:
+                print(f"  {item['page']}: {item['href']} ({item['status']})")
+        if args.query in ('summary', 'orphans'):
+            print(f"\n🔎 Orphan pages (no inbound links): {len(orphans)}")
+            for page in orphans[:None if args.query == 'orphans' else 10]:
+                print(f"  {page}")
+        if args.query in ('summary', 'redirects'):
+            print(f"\n↪️  Links through redirects: {len(redirected)} ({len(chains)} with 2+ hops)")
+            for item in (redirected if args.query == 'redirects' else chains[:10]):
+                hops = ' -> '.join([item['chain'][0][0]] + [to for _, to, _ in item['chain']])
+                print(f"  {item['page']}: {hops}")
+
+    if broken:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
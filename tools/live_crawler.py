@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Live Site Crawler - Concurrent, cached fetching of site pages
+
+An asyncio HTTP/1.1 client built on the standard library (no requests or
+aiohttp needed):
+- keep-alive connections are pooled per host and reused across requests
+- a semaphore bounds the number of requests in flight
+- responses are cached in .build-cache/live-crawl/ and revalidated with
+  If-None-Match / If-Modified-Since, so unchanged pages come back as 304s
+- URLs can be seeded from sitemap.xml, and --base-url points the crawl at
+  another origin (e.g. `python3 -m http.server` serving the repo root)
+
+Usage:
+    python3 tools/live_crawler.py [--sitemap sitemap.xml] [--base-url URL]
+                                  [--concurrency N] [--no-cache] [URL ...]
+"""
+
+import ssl
+import sys
+import json
+import gzip
+import time
+import asyncio
+import hashlib
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlsplit, urlunsplit
+
+from html_corpus import atomic_write_text
+from sitemap_parser import iter_sitemap_urls
+
+SITE_URL = "https://affordable-handbags.com"
+CACHE_DIR = '.build-cache/live-crawl'
+USER_AGENT = "mejores-bolsos-crawler/1.0"
+MAX_REDIRECTS = 5
+
+
+class CrawlResult:
+    """Outcome of fetching one URL."""
+
+    def __init__(self, url: str, status: int = 0, headers: Dict[str, str] = None,
+                 body: bytes = b'', from_cache: bool = False, error: str = None,
+                 final_url: str = None, elapsed: float = 0.0):
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+        self.body = body
+        self.from_cache = from_cache
+        self.error = error
+        self.final_url = final_url or url
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and 200 <= self.status < 300
+
+    @property
+    def text(self) -> str:
+        return self.body.decode('utf-8', errors='ignore')
+
+
+class ResponseCache:
+    """On-disk cache of validators and bodies, one body file per URL."""
+
+    def __init__(self, root: str = CACHE_DIR):
+        self.root = Path(root)
+        self.index_path = self.root / "index.json"
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        except (OSError, ValueError):
+            self.index = {}
+
+    def _body_path(self, url: str) -> Path:
+        return self.root / (hashlib.sha1(url.encode('utf-8')).hexdigest() + ".body")
+
+    def validators(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for a cached URL."""
+        entry = self.index.get(url)
+        if not entry or not self._body_path(url).exists():
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def load(self, url: str) -> Tuple[Dict[str, str], bytes]:
+        with open(self._body_path(url), 'rb') as f:
+            return self.index[url].get("headers", {}), f.read()
+
+    def store(self, url: str, headers: Dict[str, str], body: bytes):
+        if "etag" not in headers and "last-modified" not in headers:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        with open(self._body_path(url), 'wb') as f:
+            f.write(body)
+        self.index[url] = {
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "headers": {k: v for k, v in headers.items() if k in ("content-type", "etag", "last-modified")},
+        }
+
+    def save(self):
+        if self.index:
+            self.root.mkdir(parents=True, exist_ok=True)
+            atomic_write_text(self.index_path, json.dumps(self.index, indent=1))
+
+
+class ConnectionPool:
+    """Idle keep-alive connections, keyed by (scheme, host, port)."""
+
+    def __init__(self):
+        self.idle: Dict[tuple, List[tuple]] = {}
+        self.opened = 0
+
+    async def acquire(self, scheme: str, host: str, port: int, timeout: float) -> Tuple[tuple, bool]:
+        """Return ((reader, writer), reused)."""
+        key = (scheme, host, port)
+        while self.idle.get(key):
+            reader, writer = self.idle[key].pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return (reader, writer), True
+            writer.close()
+        context = ssl.create_default_context() if scheme == 'https' else None
+        conn = await asyncio.wait_for(
+            asyncio.open_connection(host, port, ssl=context, server_hostname=host if context else None),
+            timeout
+        )
+        self.opened += 1
+        return conn, False
+
+    def release(self, scheme: str, host: str, port: int, conn: tuple):
+        self.idle.setdefault((scheme, host, port), []).append(conn)
+
+    def close(self):
+        for conns in self.idle.values():
+            for _, writer in conns:
+                writer.close()
+        self.idle.clear()
+
+
+async def read_response(reader: asyncio.StreamReader, method: str = 'GET') -> Tuple[int, Dict[str, str], bytes, bool]:
+    """Read one HTTP/1.x response; returns (status, headers, body, keep_alive)."""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed before response")
+    version, status = status_line.decode('latin-1').split(None, 2)[:2]
+    status = int(status)
+
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+    if method == 'HEAD' or status in (204, 304) or 100 <= status < 200:
+        body = b''
+    elif headers.get('transfer-encoding', '').lower() == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b';')[0].strip(), 16)
+            if size == 0:
+                while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b''.join(chunks)
+    elif 'content-length' in headers:
+        body = await reader.readexactly(int(headers['content-length']))
+    else:
+        body = await reader.read()
+        keep_alive = False
+
+    if headers.get('content-encoding', '').lower() == 'gzip':
+        body = gzip.decompress(body)
+    return status, headers, body, keep_alive
+
+
+class LiveCrawler:
+    """Fetches many URLs concurrently over pooled keep-alive connections."""
+
+    def __init__(self, concurrency: int = 8, timeout: float = 10.0, cache_dir: Optional[str] = CACHE_DIR):
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.cache = ResponseCache(cache_dir) if cache_dir else None
+        self.pool = ConnectionPool()
+        self.stats = {'requests': 0, 'not_modified': 0, 'errors': 0}
+
+    async def _request(self, url: str, headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        parts = urlsplit(url)
+        scheme = parts.scheme or 'http'
+        port = parts.port or (443 if scheme == 'https' else 80)
+        path = urlunsplit(('', '', parts.path or '/', parts.query, ''))
+        host_header = parts.netloc
+
+        lines = [f"GET {path} HTTP/1.1", f"Host: {host_header}", f"User-Agent: {USER_AGENT}",
+                 "Accept-Encoding: gzip", "Connection: keep-alive"]
+        lines += [f"{k}: {v}" for k, v in headers.items()]
+        request = ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+        # A pooled connection may have been closed by the server while idle;
+        # retry once on a fresh one in that case.
+        for attempt in range(2):
+            (reader, writer), reused = await self.pool.acquire(scheme, parts.hostname, port, self.timeout)
+            try:
+                writer.write(request)
+                await writer.drain()
+                status, resp_headers, body, keep_alive = await asyncio.wait_for(read_response(reader), self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as e:
+                writer.close()
+                if reused and attempt == 0:
+                    continue
+                raise
+            except BaseException:
+                writer.close()
+                raise
+            self.stats['requests'] += 1
+            if keep_alive:
+                self.pool.release(scheme, parts.hostname, port, (reader, writer))
+            else:
+                writer.close()
+            return status, resp_headers, body
+        raise ConnectionError(f"could not fetch {url}")
+
+    async def fetch(self, url: str) -> CrawlResult:
+        """Fetch one URL, following redirects and revalidating against the cache."""
+        started = time.perf_counter()
+        current = url
+        try:
+            for _ in range(MAX_REDIRECTS + 1):
+                conditional = self.cache.validators(current) if self.cache else {}
+                status, headers, body = await self._request(current, conditional)
+                if status in (301, 302, 303, 307, 308) and 'location' in headers:
+                    current = urljoin(current, headers['location'])
+                    continue
+                from_cache = False
+                if status == 304 and conditional:
+                    self.stats['not_modified'] += 1
+                    cached_headers, body = self.cache.load(current)
+                    headers = dict(cached_headers, **headers)
+                    status, from_cache = 200, True
+                elif self.cache and status == 200:
+                    self.cache.store(current, headers, body)
+                return CrawlResult(url, status, headers, body, from_cache=from_cache,
+                                   final_url=current, elapsed=time.perf_counter() - started)
+            raise ConnectionError(f"more than {MAX_REDIRECTS} redirects")
+        except (OSError, ValueError, asyncio.TimeoutError, asyncio.IncompleteReadError) as e:
+            self.stats['errors'] += 1
+            return CrawlResult(url, error=str(e) or type(e).__name__, elapsed=time.perf_counter() - started)
+
+    async def crawl(self, urls: List[str]) -> List[CrawlResult]:
+        """Fetch every URL with at most `concurrency` requests in flight; results keep input order."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def bounded(url):
+            async with semaphore:
+                return await self.fetch(url)
+
+        try:
+            return await asyncio.gather(*(bounded(url) for url in urls))
+        finally:
+            self.pool.close()
+            if self.cache:
+                self.cache.save()
+
+    def run(self, urls: List[str]) -> List[CrawlResult]:
+        return asyncio.run(self.crawl(urls))
+
+
+def sitemap_urls(source: str = "sitemap.xml") -> List[str]:
+    """Read <loc> entries from a local sitemap (or sitemap index) file."""
+    return list(iter_sitemap_urls(source))
+
+
+def rebase_url(url: str, base_url: Optional[str]) -> str:
+    """Point a site URL at another origin (e.g. a local static server)."""
+    if not base_url:
+        return url
+    parts = urlsplit(url)
+    base = urlsplit(base_url)
+    return urlunsplit((base.scheme, base.netloc, parts.path, parts.query, ''))
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Fetch site pages concurrently with caching")
+    parser.add_argument('urls', nargs='*', help='URLs to fetch (default: every URL in the sitemap)')
+    parser.add_argument('--sitemap', default='sitemap.xml', help='Sitemap to seed from (default: sitemap.xml)')
+    parser.add_argument('--base-url', help='Fetch from this origin instead (e.g. http://localhost:8000)')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight (default: 8)')
+    parser.add_argument('--timeout', type=float, default=10.0, help='Per-request timeout in seconds')
+    parser.add_argument('--no-cache', action='store_true', help='Do not use or update the response cache')
+    args = parser.parse_args()
+
+    urls = args.urls or sitemap_urls(args.sitemap)
+    urls = [rebase_url(url, args.base_url) for url in urls]
+
+    crawler = LiveCrawler(args.concurrency, args.timeout, None if args.no_cache else CACHE_DIR)
+    started = time.perf_counter()
+    results = crawler.run(urls)
+    elapsed = time.perf_counter() - started
+
+    print("=== Live Crawl ===")
+    for result in results:
+        if result.error:
+            print(f"❌ {result.url} - {result.error}")
+        elif not result.ok:
+            print(f"⚠️  {result.url} - HTTP {result.status}")
+        else:
+            cached = " (not modified)" if result.from_cache else ""
+            print(f"✅ {result.url} - {result.status}{cached} {result.elapsed * 1000:.0f}ms")
+    print()
+    print(f"URLs: {len(results)} in {elapsed:.2f}s")
+    print(f"Requests: {crawler.stats['requests']} over {crawler.pool.opened} connection(s)")
+    print(f"Not modified: {crawler.stats['not_modified']}")
+    print(f"Errors: {crawler.stats['errors']}")
+
+    if any(not r.ok for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
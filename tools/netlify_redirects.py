@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Compiled Netlify Redirect Table
+
+Parses the [[redirects]] of netlify.toml (or netlify-backup.toml) into a
+matcher that answers "which rule handles this path?" without scanning the
+whole list:
+- exact paths live in a hash map
+- splat rules ("/articles/*", "/articles/*.html") live in a trie keyed by path
+  segments, so only rules sharing the path's leading segments are tried
+File order is preserved, so the first matching rule still wins, as on Netlify.
+
+On top of the matcher it finds redirect chains (A -> B -> C), loops and
+rules shadowed by an earlier rule for the same path, and can emit a
+collapsed table where every redirect points straight at its final target.
+
+Usage:
+    python3 tools/netlify_redirects.py [--config netlify.toml ...] [--collapsed]
+"""
+
+import os
+import sys
+import tomllib
+import argparse
+from typing import Callable, Dict, List, Optional, Tuple
+
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+PERMANENT_STATUSES = (301, 308)
+CONFIG_FILES = ['netlify.toml', 'netlify-backup.toml']
+MAX_HOPS = 10
+
+
+def strip_slash(path: str) -> str:
+    """Netlify matches paths with or without a trailing slash."""
+    return path.rstrip('/') or '/'
+
+
+def split_segments(path: str) -> List[str]:
+    return [s for s in strip_slash(path).split('/') if s]
+
+
+class RedirectRule:
+    def __init__(self, order: int, source: str, target: str, status: int = 301, force: bool = False):
+        self.order = order
+        self.source = source
+        self.target = target
+        self.status = status
+        self.force = force
+
+    def __repr__(self) -> str:
+        return f"RedirectRule({self.source!r} -> {self.target!r}, {self.status})"
+
+    @property
+    def is_redirect(self) -> bool:
+        return self.status in REDIRECT_STATUSES
+
+    @property
+    def is_splat(self) -> bool:
+        return '*' in self.source
+
+
+class TrieNode:
+    __slots__ = ('children', 'splats')
+
+    def __init__(self):
+        self.children: Dict[str, 'TrieNode'] = {}
+        # (rule, text before '*', text after '*') for splats starting at this depth
+        self.splats: List[Tuple[RedirectRule, str, str]] = []
+
+
+class RedirectTable:
+    """First-match redirect lookup: exact hash map plus a splat trie."""
+
+    def __init__(self, rules: List[RedirectRule]):
+        self.rules = rules
+        self.exact: Dict[str, RedirectRule] = {}
+        self.shadowed: List[Tuple[RedirectRule, RedirectRule]] = []
+        self.trie = TrieNode()
+
+        for rule in rules:
+            if rule.is_splat:
+                head, _, tail = strip_slash(rule.source).partition('*')
+                # Literal segments before the one holding '*' become trie edges
+                segments = head.split('/')
+                node = self.trie
+                for segment in [s for s in segments[:-1] if s]:
+                    node = node.children.setdefault(segment, TrieNode())
+                node.splats.append((rule, segments[-1], tail))
+            else:
+                key = strip_slash(rule.source)
+                if key in self.exact:
+                    self.shadowed.append((rule, self.exact[key]))
+                else:
+                    self.exact[key] = rule
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def match(self, path: str) -> Optional[Tuple[RedirectRule, str]]:
+        """Return (rule, target) of the first rule in file order that matches path."""
+        key = strip_slash(path)
+        best = self.exact.get(key)
+        best_target = best.target if best else None
+
+        segments = split_segments(key)
+        node = self.trie
+        for depth in range(len(segments) + 1):
+            if node.splats:
+                rest = '/'.join(segments[depth:])
+                for rule, before, after in node.splats:
+                    if best is not None and rule.order > best.order:
+                        continue
+                    if rest.startswith(before) and rest.endswith(after) and len(rest) >= len(before) + len(after):
+                        splat = rest[len(before):len(rest) - len(after)]
+                        best, best_target = rule, rule.target.replace(':splat', splat)
+            if depth == len(segments):
+                break
+            node = node.children.get(segments[depth])
+            if node is None:
+                break
+        return (best, best_target) if best else None
+
+    def applies(self, path: str, exists: Optional[Callable[[str], bool]] = None) -> Optional[Tuple[RedirectRule, str]]:
+        """Like match(), but a non-forced rule is skipped when a static file exists."""
+        hit = self.match(path)
+        if hit and not hit[0].force and exists is not None and exists(path):
+            return None
+        return hit
+
+    def follow(self, path: str, exists: Optional[Callable[[str], bool]] = None) -> Tuple[List[Tuple[str, str, int]], bool]:
+        """Follow redirects from path; returns (hops, looped)."""
+        hops = []
+        seen = {strip_slash(path)}
+        current = path
+        for _ in range(MAX_HOPS):
+            hit = self.applies(current, exists)
+            if not hit or not hit[0].is_redirect:
+                return hops, False
+            rule, target = hit
+            hops.append((current, target, rule.status))
+            if '://' in target:
+                return hops, False
+            current = target.split('?')[0].split('#')[0]
+            if strip_slash(current) in seen:
+                return hops, True
+            seen.add(strip_slash(current))
+        return hops, True
+
+    def chains(self, exists: Optional[Callable[[str], bool]] = None) -> List[dict]:
+        """Every exact redirect rule whose target redirects again (or loops)."""
+        found = []
+        for rule in self.rules:
+            if rule.is_splat or not rule.is_redirect:
+                continue
+            if self.exact.get(strip_slash(rule.source)) is not rule:
+                continue
+            hops, looped = self.follow(rule.source, exists)
+            if looped or len(hops) > 1:
+                found.append({"rule": rule, "hops": hops, "loop": looped})
+        return found
+
+    def collapsed(self, exists: Optional[Callable[[str], bool]] = None) -> List[RedirectRule]:
+        """Rules with chains collapsed to their final target; loops and shadowed rules dropped."""
+        result = []
+        for rule in self.rules:
+            if not rule.is_splat and self.exact.get(strip_slash(rule.source)) is not rule:
+                continue
+            if rule.is_redirect and not rule.is_splat:
+                hops, looped = self.follow(rule.source, exists)
+                if looped:
+                    continue
+                if len(hops) > 1:
+                    permanent = all(status in PERMANENT_STATUSES for _, _, status in hops)
+                    status = rule.status if permanent else 302
+                    result.append(RedirectRule(rule.order, rule.source, hops[-1][1], status, rule.force))
+                    continue
+            result.append(rule)
+        return result
+
+
+def load_rules(path: str) -> List[RedirectRule]:
+    with open(path, 'rb') as f:
+        config = tomllib.load(f)
+    return [
+        RedirectRule(order, r['from'], r['to'], int(r.get('status', 301)), bool(r.get('force', False)))
+        for order, r in enumerate(rr for rr in config.get('redirects', []) if 'from' in rr and 'to' in rr)
+    ]
+
+
+def load_redirect_table(paths=None) -> RedirectTable:
+    """Compile the redirects of one or more config files (in order) into one table."""
+    rules = []
+    for path in paths or ['netlify.toml']:
+        if os.path.exists(path):
+            for rule in load_rules(path):
+                rule.order = len(rules)
+                rules.append(rule)
+    return RedirectTable(rules)
+
+
+def to_toml(rules: List[RedirectRule]) -> str:
+    """Render rules as netlify.toml [[redirects]] blocks."""
+    blocks = []
+    for rule in rules:
+        lines = ["[[redirects]]", f'  from = "{rule.source}"', f'  to = "{rule.target}"', f"  status = {rule.status}"]
+        if rule.force:
+            lines.append("  force = true")
+        blocks.append("\n".join(lines))
+    return "\n\n".join(blocks) + "\n"
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Compile netlify.toml redirects and report chains and loops")
+    parser.add_argument('--config', action='append', help='Config file(s) to analyse (default: netlify.toml and netlify-backup.toml)')
+    parser.add_argument('--collapsed', action='store_true', help='Print the collapsed redirect table as TOML')
+    args = parser.parse_args()
+
+    # Shadowing rules only apply when no static file exists, as on Netlify
+    from link_graph import LinkGraph
+    site = LinkGraph()
+    exists = lambda path: site.static_file(path) is not None
+
+    problems = 0
+    for config in args.config or CONFIG_FILES:
+        if not os.path.exists(config):
+            print(f"⚠️  {config}: not found")
+            continue
+        table = load_redirect_table([config])
+        if args.collapsed:
+            print(f"# Collapsed redirects from {config}")
+            print(to_toml(table.collapsed(exists)))
+            continue
+
+        chains = table.chains(exists)
+        loops = [c for c in chains if c['loop']]
+        splats = sum(1 for r in table.rules if r.is_splat)
+        print(f"=== {config} ===")
+        print(f"Rules: {len(table)} ({len(table.exact)} exact, {splats} splat)")
+        print(f"Shadowed (duplicate 'from', never used): {len(table.shadowed)}")
+        for rule, winner in table.shadowed:
+            print(f"  {rule.source} -> {rule.target} (already handled by -> {winner.target})")
+        print(f"Chains: {len(chains) - len(loops)}")
+        for chain in chains:
+            if not chain['loop']:
+                print(f"  {' -> '.join([chain['hops'][0][0]] + [to for _, to, _ in chain['hops']])}")
+        print(f"Loops: {len(loops)}")
+        for chain in loops:
+            print(f"  {' -> '.join([chain['hops'][0][0]] + [to for _, to, _ in chain['hops']])}")
+        print()
+        problems += len(chains)
+
+    if problems:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
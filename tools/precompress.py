@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""
+Precompression Stage
+
+Writes max-level gzip (.gz) and Brotli (.br) siblings next to every text file
+the site serves (HTML, CSS, JS, JSON, XML, SVG, TXT), including
+search-index.json and sitemap.xml, so a server that supports precompressed
+files (nginx gzip_static/brotli_static, most static CDNs, or the --serve
+stand-in below) never compresses on the fly:
+1. Files are compressed in parallel (process pool)
+2. .build-cache/precompress.json records each file's hash; unchanged files
+   whose siblings still exist are skipped
+3. A sibling that would not be smaller than the original is not written
+4. The report lists byte savings per file type
+Brotli needs the optional brotli module (pip install brotli); without it only
+.gz siblings are written.
+
+--serve starts a local static server that answers with the .br/.gz sibling
+(Content-Encoding, Vary: Accept-Encoding) when the client accepts it, and
+--verify fetches every compressed file through that server and checks it
+decompresses to the original bytes.
+
+Usage:
+    python3 tools/precompress.py [--jobs N] [--force] [--verify] [--serve [PORT]]
+"""
+
+import os
+import sys
+import gzip
+import json
+import hashlib
+import argparse
+import threading
+import http.client
+from concurrent.futures import ProcessPoolExecutor
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional
+from urllib.parse import quote
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+from html_corpus import atomic_write_text, walk_files
+
+TEXT_EXTENSIONS = ('.html', '.htm', '.css', '.js', '.mjs', '.json', '.xml', '.svg', '.txt', '.webmanifest')
+CACHE_PATH = '.build-cache/precompress.json'
+CACHE_VERSION = 1
+# Smaller files gain nothing worth a second request path
+MIN_SIZE = 512
+SKIP_FILES = {'package.json', 'package-lock.json'}
+
+# Preferred first when a client accepts both
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]
+
+
+def gzip_bytes(raw: bytes) -> bytes:
+    """Deterministic max-level gzip (no timestamp, so unchanged input gives identical output)."""
+    return gzip.compress(raw, compresslevel=9, mtime=0)
+
+
+def brotli_bytes(raw: bytes) -> Optional[bytes]:
+    if brotli is None:
+        return None
+    return brotli.compress(raw, quality=11, lgwin=24)
+
+
+def write_sibling(path: str, ext: str, data: Optional[bytes], original_size: int) -> int:
+    """Write path+ext atomically if it is smaller than the original; returns its size (0 if none)."""
+    target = path + ext
+    if data is None or len(data) >= original_size:
+        if os.path.exists(target):
+            os.remove(target)
+        return 0
+    tmp = f"{target}.tmp{os.getpid()}"
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, target)
+    return len(data)
+
+
+def write_compressed(path: str, raw: bytes) -> Dict[str, int]:
+    """Write .gz and .br siblings of path for its content raw; returns their sizes."""
+    return {
+        'gz': write_sibling(str(path), '.gz', gzip_bytes(raw), len(raw)),
+        'br': write_sibling(str(path), '.br', brotli_bytes(raw), len(raw)),
+    }
+
+
+def compress_file(path: str) -> dict:
+    """Process pool worker: compress one file."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    sizes = write_compressed(path, raw)
+    return {'sha1': hashlib.sha1(raw).hexdigest(), 'size': len(raw), **sizes}
+
+
+def find_text_files(root: str = ".") -> List[str]:
+    return [p.as_posix() for p in walk_files(root, TEXT_EXTENSIONS) if p.name not in SKIP_FILES]
+
+
+def file_type(path: str) -> str:
+    return os.path.splitext(path)[1].lstrip('.').lower()
+
+
+def precompress(root: str = ".", jobs: int = 0, force: bool = False) -> dict:
+    """Compress every changed text file; returns {'files': {path: entry}, 'compressed', 'skipped'}."""
+    root_path = Path(root)
+    cache_file = root_path / CACHE_PATH
+    cache = {}
+    if not force:
+        try:
+            data = json.loads(cache_file.read_text(encoding='utf-8'))
+            if data.get('version') == CACHE_VERSION and data.get('brotli') == (brotli is not None):
+                cache = data['files']
+        except (OSError, ValueError, KeyError):
+            pass
+
+    files, pending = {}, []
+    for rel in find_text_files(root):
+        full = root_path / rel
+        st = full.stat()
+        if st.st_size < MIN_SIZE:
+            continue
+        entry = cache.get(rel)
+        siblings_ok = entry is not None and all(
+            (root_path / (rel + ext)).exists() == bool(entry[key]) for key, ext in (('gz', '.gz'), ('br', '.br')))
+        if entry and siblings_ok and entry['mtime'] == st.st_mtime_ns and entry['size'] == st.st_size:
+            files[rel] = entry
+            continue
+        if entry and siblings_ok and entry['sha1'] == hashlib.sha1(full.read_bytes()).hexdigest():
+            files[rel] = dict(entry, mtime=st.st_mtime_ns)
+            continue
+        pending.append(rel)
+
+    jobs = jobs or os.cpu_count() or 1
+    paths = [str(root_path / rel) for rel in pending]
+    if jobs > 1 and len(paths) > 1:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(compress_file, paths, chunksize=8))
+    else:
+        results = [compress_file(p) for p in paths]
+    for rel, result in zip(pending, results):
+        files[rel] = dict(result, mtime=(root_path / rel).stat().st_mtime_ns)
+
+    os.makedirs(cache_file.parent, exist_ok=True)
+    atomic_write_text(cache_file, json.dumps(
+        {'version': CACHE_VERSION, 'brotli': brotli is not None, 'files': files}, separators=(',', ':')))
+    return {'files': files, 'compressed': len(pending), 'skipped': len(files) - len(pending)}
+
+
+def savings_by_type(files: Dict[str, dict]) -> Dict[str, dict]:
+    report: Dict[str, dict] = {}
+    for rel, entry in files.items():
+        row = report.setdefault(file_type(rel), {'files': 0, 'bytes': 0, 'gz': 0, 'br': 0})
+        row['files'] += 1
+        row['bytes'] += entry['size']
+        # A missing sibling means the original is served as is
+        row['gz'] += entry['gz'] or entry['size']
+        row['br'] += entry['br'] or entry['size']
+    return dict(sorted(report.items()))
+
+
+def print_report(report: Dict[str, dict]):
+    def pct(part, whole):
+        return f"{100 * (1 - part / whole):5.1f}%" if whole else "    -"
+
+    def line(label, row):
+        text = f"{label:<6}{row['files']:>6}{row['bytes']:>12,}{row['gz']:>12,}{pct(row['gz'], row['bytes']):>8}"
+        if brotli is not None:
+            text += f"{row['br']:>12,}{pct(row['br'], row['bytes']):>8}"
+        print(text)
+
+    header = f"{'type':<6}{'files':>6}{'original':>12}{'gzip':>12}{'saved':>8}"
+    print(header + (f"{'brotli':>12}{'saved':>8}" if brotli is not None else ''))
+    total = {'files': 0, 'bytes': 0, 'gz': 0, 'br': 0}
+    for kind, row in report.items():
+        for key in total:
+            total[key] += row[key]
+        line(kind, row)
+    line('total', total)
+
+
+class PrecompressedHandler(SimpleHTTPRequestHandler):
+    """Static file handler that serves .br/.gz siblings like a production server would."""
+
+    def send_head(self):
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.split('?')[0].endswith('/'):
+            path = os.path.join(path, 'index.html')
+        accepted = {e.split(';')[0].strip() for e in self.headers.get('Accept-Encoding', '').split(',')}
+        if os.path.isfile(path):
+            for encoding, ext in ENCODINGS:
+                if encoding in accepted and os.path.isfile(path + ext):
+                    with open(path + ext, 'rb') as f:
+                        data = f.read()
+                    self.send_response(200)
+                    self.send_header('Content-Type', self.guess_type(path))
+                    self.send_header('Content-Encoding', encoding)
+                    self.send_header('Content-Length', str(len(data)))
+                    self.send_header('Vary', 'Accept-Encoding')
+                    self.end_headers()
+                    return _BytesBody(data)
+        return super().send_head()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _BytesBody:
+    """File-like body for copyfile()."""
+
+    def __init__(self, data: bytes):
+        self.data = data
+
+    def read(self, size=-1):
+        data, self.data = self.data, b''
+        return data
+
+    def close(self):
+        pass
+
+
+def make_server(root: str = ".", port: int = 0) -> ThreadingHTTPServer:
+    handler = lambda *args, **kwargs: PrecompressedHandler(*args, directory=root, **kwargs)
+    return ThreadingHTTPServer(('127.0.0.1', port), handler)
+
+
+def verify(root: str, files: Dict[str, dict]) -> List[str]:
+    """Fetch every compressed file through the local server; returns the failures."""
+    server = make_server(root)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    failures = []
+    try:
+        conn = http.client.HTTPConnection('127.0.0.1', server.server_address[1], timeout=10)
+        for rel, entry in sorted(files.items()):
+            original = (Path(root) / rel).read_bytes()
+            for encoding, key in (('br', 'br'), ('gzip', 'gz')):
+                if not entry[key]:
+                    continue
+                conn.request('GET', '/' + quote(rel), headers={'Accept-Encoding': encoding})
+                response = conn.getresponse()
+                body = response.read()
+                served = response.getheader('Content-Encoding')
+                decoded = gzip.decompress(body) if served == 'gzip' else (
+                    brotli.decompress(body) if served == 'br' and brotli else None)
+                if response.status != 200 or served != encoding or decoded != original:
+                    failures.append(f"{rel} ({encoding}): status {response.status}, encoding {served}")
+        conn.close()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return failures
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Write .br/.gz siblings for every text file of the site")
+    parser.add_argument('--jobs', '-j', type=int, default=0, help='Compression processes (default: one per CPU)')
+    parser.add_argument('--force', action='store_true', help='Recompress every file')
+    parser.add_argument('--verify', action='store_true', help='Check every sibling through the local server')
+    parser.add_argument('--serve', nargs='?', type=int, const=8000, metavar='PORT',
+                        help='Serve the site with precompressed responses (default port 8000)')
+    args = parser.parse_args()
+
+    print("=== PRECOMPRESSION ===")
+    if brotli is None:
+        print("⚠️  brotli module not installed (pip install brotli); writing .gz siblings only")
+    result = precompress(jobs=args.jobs, force=args.force)
+    print(f"Files: {len(result['files'])} ({result['compressed']} compressed, {result['skipped']} unchanged)\n")
+    print_report(savings_by_type(result['files']))
+
+    if args.verify:
+        failures = verify(".", result['files'])
+        if failures:
+            print(f"\n❌ {len(failures)} sibling(s) failed verification")
+            for failure in failures:
+                print(f"  {failure}")
+            sys.exit(1)
+        print("\n✅ Every sibling served with the right Content-Encoding and decompresses to the original")
+
+    if args.serve is not None:
+        server = make_server(".", args.serve)
+        print(f"\nServing on http://127.0.0.1:{server.server_address[1]}/ (Ctrl+C to stop)")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
+
+
+if __name__ == "__main__":
+    main()
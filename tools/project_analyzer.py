@@ -17,6 +17,8 @@ import re
 from pathlib import Path
 from collections import defaultdict
 
+from html_corpus import get_corpus
+
 def analyze_backup_files():
     """Analyze all backup files in the project."""
     print("=== BACKUP FILE ANALYSIS ===")
@@ -58,12 +60,7 @@ def analyze_active_files():
     print("=== ACTIVE FILE ANALYSIS ===")
     
     # Find all active HTML files
-    html_files = []
-    for root, dirs, files in os.walk("."):
-        dirs[:] = [d for d in dirs if d not in {'.git', 'node_modules', 'dist', 'build', '.next', 'out', 'tools'}]
-        for file in files:
-            if file.endswith('.html') and '.bak_' not in file and not file.startswith('.'):
-                html_files.append(Path(root) / file)
+    html_files = get_corpus()
     
     print(f"Active HTML files: {len(html_files)}")
     
@@ -73,10 +70,10 @@ def analyze_active_files():
     ga4_refs = 0
     issues = []
     
-    for html_file in html_files:
+    for doc in html_files:
+        html_file = doc.path
         try:
-            with open(html_file, 'r', encoding='utf-8', errors='ignore') as f:
-                content = f.read()
+            content = doc.lenient_text
             
             # Count implementations
             gtm_scripts = len(re.findall(r'googletagmanager\.com/gtm\.js', content, re.IGNORECASE))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Run the Read-Only Audit Suite
+
+Runs the GTM and link audits in one process so they share a single walk of
+the tree and a single read of every page (see tools/html_corpus.py).
+
+Usage:
+    python3 tools/run_audits.py
+"""
+
+import check_article_links
+import deployment_checker
+import gtm_analyzer
+import project_analyzer
+import verify_deployment
+from html_corpus import get_corpus
+
+AUDITS = [
+    ("GTM deployment verification", verify_deployment.main),
+    ("GTM analysis", gtm_analyzer.main),
+    ("Local tracking check", deployment_checker.check_local_files),
+    ("Active file analysis", project_analyzer.analyze_active_files),
+    ("Article links", check_article_links.check_article_links),
+]
+
+def main():
+    """Run every audit against the shared corpus."""
+    corpus = get_corpus()
+    
+    for name, audit in AUDITS:
+        print()
+        print("#" * 60)
+        print(f"# {name}")
+        print("#" * 60)
+        audit()
+    
+    loaded = sum(1 for doc in corpus if doc.is_loaded())
+    print()
+    print("=== AUDIT SUITE SUMMARY ===")
+    print(f"Audits run: {len(AUDITS)}")
+    print(f"Pages in corpus: {len(corpus)}")
+    print(f"Pages read from disk: {loaded} (each at most once)")
+
+if __name__ == "__main__":
+    main()
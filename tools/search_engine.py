@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Search Engine Helpers
+
+Index-time and query-time helpers shared by tools/build_search_index.py, the
+Python search test harnesses and (mirrored in JavaScript) search/index.html.
+
+Inverted index format (search-inverted-index.json):
+    {
+      "version": 3,
+      "count": <number of items in search-index.json>,
+      "prefixLength": 2,
+      "terms": {"osprey": [3, 7], ...},       # term -> sorted item ids
+      "scores": {"osprey": [4.1, 2.7], ...},  # term -> BM25F score per posting
+      "prefixes": {"os": ["osprey", ...]},    # first letters -> terms
+      "ranking": {"k1": ..., "fields": ..., "b": ..., "avgLength": ...}
+    }
+
+Item ids are positions in search-index.json.
+
+Terms are normalised once, at index time, so queries cost one normalisation
+per term: lowercased, accent-folded (NFKD without combining marks, so "día"
+and "dia" are one term) and lightly stemmed by stem(), which only strips
+English and Spanish plural endings ("mochilas" -> "mochila", "accessories"
+-> "accessory", "opciones" -> "opcion"). Plurals are the common mismatch between
+what is typed and what is written, and a stemmer that stops there keeps a
+partly typed word a prefix of its indexed stem.
+
+Ranking is BM25F: a term's frequency in each field is weighted
+(FIELD_WEIGHTS) and normalised by that field's length relative to its
+average (FIELD_B), the weighted frequencies are summed, saturated with K1
+and multiplied by the term's IDF. Everything but the query is known at
+index time, so each posting carries its final score; answering a query is
+summing the scores of its terms' postings and keeping the best k in a heap
+(rank(), mirrored by rankSearch() in assets/script.js).
+
+Typo tolerance: a query term no indexed word starts with ("ospery") is
+corrected with a separate trigram index over the vocabulary:
+    {
+      "version": 1,
+      "terms": ["mochila", "osprey", ...],    # alphabetic terms of the index
+      "trigrams": {"^os": [1, ...], ...}      # trigram -> term positions
+    }
+Candidates are the terms sharing enough trigrams with the query term (each
+edit changes at most FUZZY_GRAMS_PER_EDIT of them); they are verified with a
+bounded Damerau-Levenshtein distance and the closest ones are searched
+instead, at FUZZY_WEIGHT.
+"""
+
+import re
+import math
+import heapq
+import unicodedata
+from collections import Counter
+from typing import Dict, List, Set, Tuple
+
+INDEX_VERSION = 3
+PREFIX_LENGTH = 2
+
+# Fields that make up the searchable haystack, in the same order as match()
+SEARCH_FIELDS = ['title', 'url', 'category', 'tags', 'excerpt']
+
+# BM25F parameters
+K1 = 1.2
+FIELD_WEIGHTS = {'title': 3.0, 'tags': 2.0, 'category': 1.5, 'excerpt': 1.0, 'url': 0.5}
+# Length normalisation per field (0 = none); tags and categories are short lists
+FIELD_B = {'title': 0.5, 'tags': 0.3, 'category': 0.0, 'excerpt': 0.75, 'url': 0.75}
+# A query term that only matches longer indexed terms (typing in progress) counts for less
+PREFIX_WEIGHT = 0.6
+SCORE_DIGITS = 2
+TOP_K = 20
+
+FUZZY_VERSION = 1
+# Shorter query terms are not corrected; longer ones allow a second edit
+FUZZY_MIN_LENGTH = 4
+FUZZY_TWO_EDITS_LENGTH = 8
+# A substitution changes 3 trigrams of a padded term, a transposition 4
+FUZZY_GRAMS_PER_EDIT = 4
+FUZZY_EXPANSIONS = 3
+FUZZY_WEIGHT = 0.5
+
+# Shorter words are never stemmed ("bus", "gas")
+STEM_MIN_LENGTH = 4
+# Singular words ending in s ("dress", "campus", "chassis")
+STEM_KEEP_ENDINGS = ('ss', 'us', 'is')
+# -es is a plural ending after these (boxes, watches, glasses); otherwise only the s goes
+STEM_ES_AFTER = ('x', 'z', 'ch', 'sh', 'ss')
+
+RE_TOKEN = re.compile(r'\w+', re.UNICODE)
+
+
+def fold_accents(text: str) -> str:
+    """Lowercase text and drop accents and other combining marks ("Día" -> "dia")."""
+    decomposed = unicodedata.normalize('NFKD', text.lower())
+    return ''.join(c for c in decomposed if not unicodedata.category(c).startswith('M'))
+
+
+def stem(term: str) -> str:
+    """Strip an English or Spanish plural ending from an accent-folded term."""
+    if len(term) < STEM_MIN_LENGTH or not term.isalpha() or not term.endswith('s'):
+        return term
+    if term.endswith('ies') and len(term) > STEM_MIN_LENGTH:
+        return term[:-3] + 'y'
+    if term.endswith('iones'):
+        return term[:-2]
+    if term.endswith('es') and term[:-2].endswith(STEM_ES_AFTER):
+        return term[:-2]
+    if term.endswith(STEM_KEEP_ENDINGS):
+        return term
+    return term[:-1]
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalised search terms (lowercase, accent-folded, stemmed)."""
+    return [stem(token) for token in RE_TOKEN.findall(fold_accents(text))]
+
+
+def item_text(item: dict) -> str:
+    """Join an item's searchable fields into one haystack string."""
+    return ' '.join([
+        item.get('title', ''),
+        item.get('url', ''),
+        item.get('category', ''),
+        ' '.join(item.get('tags', [])),
+        item.get('excerpt', ''),
+    ])
+
+
+def field_tokens(item: dict) -> Dict[str, List[str]]:
+    """Tokens of each searchable field of an item."""
+    return {
+        field: tokenize(' '.join(item.get(field, [])) if field == 'tags' else item.get(field, ''))
+        for field in SEARCH_FIELDS
+    }
+
+
+def build_inverted_index(items: List[dict]) -> dict:
+    """Build term -> postings (with BM25F scores) and prefix -> terms maps for a list of items."""
+    tokens = [field_tokens(item) for item in items]
+    avg_length = {
+        field: (sum(len(t[field]) for t in tokens) / len(tokens) if tokens else 0) or 1
+        for field in SEARCH_FIELDS
+    }
+
+    # Weighted, length-normalised term frequency per (term, item)
+    weighted: Dict[str, List[Tuple[int, float]]] = {}
+    for item_id, fields in enumerate(tokens):
+        tf: Dict[str, float] = {}
+        for field, words in fields.items():
+            norm = 1 - FIELD_B[field] + FIELD_B[field] * len(words) / avg_length[field]
+            for term, count in Counter(words).items():
+                tf[term] = tf.get(term, 0.0) + FIELD_WEIGHTS[field] * count / norm
+        for term, freq in tf.items():
+            weighted.setdefault(term, []).append((item_id, freq))
+
+    count = len(items)
+    terms: Dict[str, List[int]] = {}
+    scores: Dict[str, List[float]] = {}
+    for term in sorted(weighted):
+        postings = weighted[term]
+        idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+        terms[term] = [item_id for item_id, _ in postings]
+        scores[term] = [round(idf * freq * (K1 + 1) / (K1 + freq), SCORE_DIGITS) for _, freq in postings]
+
+    prefixes: Dict[str, List[str]] = {}
+    for term in terms:
+        prefixes.setdefault(term[:PREFIX_LENGTH], []).append(term)
+
+    return {
+        "version": INDEX_VERSION,
+        "count": count,
+        "prefixLength": PREFIX_LENGTH,
+        "terms": terms,
+        "scores": scores,
+        "prefixes": prefixes,
+        "ranking": {
+            "k1": K1,
+            "fields": FIELD_WEIGHTS,
+            "b": FIELD_B,
+            "avgLength": {field: round(avg, 2) for field, avg in avg_length.items()},
+        },
+    }
+
+
+def expand_term(index: dict, term: str) -> List[str]:
+    """Return every indexed term that starts with the given query term."""
+    prefix_length = index.get("prefixLength", PREFIX_LENGTH)
+    if len(term) >= prefix_length:
+        bucket = index["prefixes"].get(term[:prefix_length], [])
+    else:
+        bucket = [t for key, terms in index["prefixes"].items() if key.startswith(term) for t in terms]
+    return [t for t in bucket if t.startswith(term)]
+
+
+def term_postings(index: dict, term: str) -> Set[int]:
+    """Union of the posting lists of every term matching a query term prefix."""
+    ids: Set[int] = set()
+    for match in expand_term(index, term):
+        ids.update(index["terms"][match])
+    return ids
+
+
+def query_inverted_index(index: dict, q: str) -> List[int]:
+    """Return ids of items containing every query term (as a word prefix)."""
+    terms = tokenize(q or '')
+    if not terms:
+        return []
+
+    # Intersect the smallest posting sets first
+    sets = sorted((term_postings(index, t) for t in set(terms)), key=len)
+    result = sets[0]
+    for ids in sets[1:]:
+        if not result:
+            break
+        result = result & ids
+    return sorted(result)
+
+
+def search_items(items: List[dict], index: dict, q: str) -> List[dict]:
+    """Answer a query with the inverted index and return the matching items."""
+    return [items[i] for i in query_inverted_index(index, q)]
+
+
+def term_scores(index: dict, term: str) -> Dict[int, float]:
+    """Best score per item for a query term: its exact postings, or scaled-down prefix matches."""
+    best: Dict[int, float] = {}
+    for match in expand_term(index, term):
+        factor = 1.0 if match == term else PREFIX_WEIGHT
+        for item_id, score in zip(index["terms"][match], index["scores"][match]):
+            score *= factor
+            if score > best.get(item_id, 0.0):
+                best[item_id] = score
+    return best
+
+
+def fuzzy_scores(index: dict, fuzzy: dict, term: str) -> Dict[int, float]:
+    """Best score per item for the closest corrections of a misspelled query term."""
+    best: Dict[int, float] = {}
+    for match, _ in fuzzy_terms(fuzzy, term, indexed=index["terms"]):
+        for item_id, score in zip(index["terms"][match], index["scores"][match]):
+            score *= FUZZY_WEIGHT
+            if score > best.get(item_id, 0.0):
+                best[item_id] = score
+    return best
+
+
+def rank(index: dict, q: str, k: int = TOP_K, fuzzy: dict = None) -> List[Tuple[int, float]]:
+    """Top-k (item id, score) pairs for a query, best first (ties: lower id, i.e. newer, first).
+    
+    With a fuzzy index, terms matching nothing are replaced by their closest corrections.
+    """
+    totals: Dict[int, float] = {}
+    for term in set(tokenize(q or '')):
+        scores = term_scores(index, term)
+        if not scores and fuzzy:
+            scores = fuzzy_scores(index, fuzzy, term)
+        for item_id, score in scores.items():
+            totals[item_id] = totals.get(item_id, 0.0) + score
+    return heapq.nsmallest(k, totals.items(), key=lambda pair: (-pair[1], pair[0]))
+
+
+def rank_items(items: List[dict], index: dict, q: str, k: int = TOP_K, fuzzy: dict = None) -> List[dict]:
+    """Answer a query with BM25F ranking and return the top-k items."""
+    return [items[item_id] for item_id, _ in rank(index, q, k, fuzzy)]
+
+
+def trigrams(term: str) -> List[str]:
+    """Trigrams of a term padded with ^ and $ ("^os", "osp", ..., "ey$")."""
+    padded = f"^{term}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def build_fuzzy_index(terms) -> dict:
+    """Trigram -> term positions for the alphabetic terms of an inverted index."""
+    vocabulary = sorted(t for t in terms if len(t) >= FUZZY_MIN_LENGTH - 1 and t.isalpha())
+    grams: Dict[str, List[int]] = {}
+    for term_id, term in enumerate(vocabulary):
+        for gram in dict.fromkeys(trigrams(term)):
+            grams.setdefault(gram, []).append(term_id)
+    return {"version": FUZZY_VERSION, "terms": vocabulary, "trigrams": grams}
+
+
+def max_edits(term: str) -> int:
+    return 2 if len(term) >= FUZZY_TWO_EDITS_LENGTH else 1
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (a transposition is one edit), or limit + 1 if above limit."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2 = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if previous2 is not None and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return min(previous[-1], limit + 1)
+
+
+def fuzzy_terms(fuzzy: dict, term: str, limit: int = FUZZY_EXPANSIONS, indexed=None) -> List[Tuple[str, int]]:
+    """Indexed terms within max_edits() of a query term, closest first: [(term, distance)].
+    
+    The typo index covers the full vocabulary; pass the terms of the index being
+    searched (e.g. a language shard's) to only get corrections it can answer.
+    """
+    if len(term) < FUZZY_MIN_LENGTH:
+        return []
+    edits = max_edits(term)
+    grams = set(trigrams(term))
+    shared: Dict[int, int] = {}
+    for gram in grams:
+        for term_id in fuzzy["trigrams"].get(gram, ()):
+            shared[term_id] = shared.get(term_id, 0) + 1
+
+    min_shared = max(1, len(grams) - FUZZY_GRAMS_PER_EDIT * edits)
+    vocabulary = fuzzy["terms"]
+    matches = []
+    for term_id, count in shared.items():
+        candidate = vocabulary[term_id]
+        if count < min_shared or candidate == term or (indexed is not None and candidate not in indexed):
+            continue
+        distance = edit_distance(term, candidate, edits)
+        if distance <= edits:
+            matches.append((candidate, distance))
+    matches.sort(key=lambda pair: (pair[1], pair[0]))
+    return matches[:limit]
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Streaming Sitemap Parser
+
+Yields <loc> URLs from sitemap.xml incrementally with ElementTree.iterparse,
+clearing each entry once read so memory stays flat for sitemaps with tens of
+thousands of URLs. Sitemap index files (<sitemapindex>) are followed: each
+child sitemap is resolved to a local file next to the index (by the path of
+its URL) and streamed in turn.
+
+Usage:
+    from sitemap_parser import iter_sitemap_urls
+
+    for url in iter_sitemap_urls("sitemap.xml"):
+        print(url)
+
+Running this module directly prints URL counts per sitemap file:
+    python3 tools/sitemap_parser.py [sitemap.xml]
+"""
+
+import os
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Iterator, Optional, Set
+from urllib.parse import urlsplit
+
+
+def local_name(tag: str) -> str:
+    """Strip the XML namespace from a tag."""
+    return tag.rsplit('}', 1)[-1]
+
+
+def resolve_child_sitemap(loc: str, index_path: Path) -> Path:
+    """Map a child sitemap URL to a file beside the index (or under the site root)."""
+    path = urlsplit(loc).path.lstrip('/') if '://' in loc else loc
+    candidate = index_path.parent / path
+    if candidate.exists():
+        return candidate
+    return index_path.parent / os.path.basename(path)
+
+
+def iter_sitemap_urls(source, _seen: Optional[Set[Path]] = None) -> Iterator[str]:
+    """Yield page URLs from a sitemap or sitemap index, streaming each file."""
+    source = Path(source)
+    seen = _seen if _seen is not None else set()
+    resolved = source.resolve()
+    if resolved in seen:
+        return
+    seen.add(resolved)
+
+    children = []
+    context = ET.iterparse(source, events=('start', 'end'))
+    root = root_kind = None
+    for event, elem in context:
+        kind = local_name(elem.tag)
+        if event == 'start':
+            if root is None:
+                root, root_kind = elem, kind
+            continue
+        if kind == 'loc' and elem.text:
+            loc = elem.text.strip()
+            if root_kind == 'sitemapindex':
+                children.append(loc)
+            else:
+                yield loc
+        elif kind in ('url', 'sitemap'):
+            # Drop finished entries so the tree never grows
+            elem.clear()
+            root.clear()
+
+    for loc in children:
+        yield from iter_sitemap_urls(resolve_child_sitemap(loc, source), seen)
+
+
+def main():
+    """Print URL counts for a sitemap (following index files)."""
+    source = sys.argv[1] if len(sys.argv) > 1 else "sitemap.xml"
+    count = sum(1 for _ in iter_sitemap_urls(source))
+    print(f"{source}: {count} URLs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+Test Aho-Corasick Tag Matching
+
+This script checks the multi-pattern matcher against plain substring search
+and the tag vocabulary used by build_search_index.py.
+"""
+
+import random
+
+from aho_corasick import AhoCorasick
+from build_search_index import get_tag_matcher
+
+def test_aho_corasick():
+    """Test the matcher and the search tag vocabulary."""
+    print("=== TESTING AHO-CORASICK MATCHER ===")
+    
+    matcher = AhoCorasick({"he": "he", "she": "she", "his": "his", "hers": "hers"})
+    matches = sorted(matcher.iter_matches("ushers"))
+    print(f"Matches in 'ushers': {matches}")
+    assert matches == [(3, "he"), (3, "she"), (5, "hers")]
+    
+    rng = random.Random(7)
+    for _ in range(500):
+        patterns = {"".join(rng.choice("ab") for _ in range(rng.randint(1, 4))) for _ in range(6)}
+        text = "".join(rng.choice("abc") for _ in range(40))
+        found = AhoCorasick({p: p for p in patterns}).find_values(text)
+        assert found == {p for p in patterns if p in text}, (patterns, text)
+    print("✅ Matches agree with substring search on random inputs")
+    
+    tag_matcher, tag_rank = get_tag_matcher()
+    page = "the osprey daylite is a budget travel backpack under $100 from tory burch?"
+    tags = sorted(tag_matcher.find_values(page), key=tag_rank.__getitem__)
+    print(f"Tags: {tags}")
+    assert tags == ["osprey", "tory burch", "backpack", "travel", "affordable", "under 100"]
+    print("✅ Vocabulary phrases map to their tags in vocabulary order")
+
+if __name__ == "__main__":
+    test_aho_corasick()
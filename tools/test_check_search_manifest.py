@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Test Search Manifest Check
+
+This script builds search shards in a throwaway directory and checks that
+check_search_manifest() accepts them and reports tampered or stale files.
+"""
+
+import os
+import json
+import tempfile
+
+from build_search_index import write_shards
+from check_search_manifest import check_search_manifest
+
+ITEMS = [
+    {"title": "Osprey Daylite", "url": "/articles/backpacks.html", "category": "Backpacks", "tags": ["osprey"], "date": "2025-10-01", "excerpt": ""},
+    {"title": "Mochilas", "url": "/es/articulos/mochilas.html", "category": "General", "tags": [], "date": "2025-08-01", "excerpt": ""},
+]
+
+def test_check_search_manifest():
+    """Test consistency checks on the search manifest."""
+    print("=== TESTING SEARCH MANIFEST CHECK ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        shards_dir = os.path.join(tmp, 'search-shards')
+        with open(os.path.join(tmp, 'search-index.json'), 'w', encoding='utf-8') as f:
+            json.dump(ITEMS, f)
+        manifest = write_shards(ITEMS, out_dir=shards_dir)
+        assert check_search_manifest(tmp) == ([], [])
+        print("✅ Freshly built manifest is consistent")
+        
+        with open(os.path.join(tmp, 'search-index.json'), 'w', encoding='utf-8') as f:
+            json.dump(ITEMS[:1], f)
+        with open(os.path.join(shards_dir, manifest['shards']['es']['file']), 'a', encoding='utf-8') as f:
+            f.write(' ')
+        open(os.path.join(shards_dir, 'data', 'en.0badc0de.json'), 'w').write('{}')
+        errors, stale = check_search_manifest(tmp)
+        assert any('differs from search-index.json' in e for e in errors)
+        assert any(e.startswith('shard es:') and 'does not match its hash' in e for e in errors)
+        assert stale == ['data/en.0badc0de.json']
+        print("✅ Stale index, tampered shard and unreferenced files reported")
+        
+        os.remove(os.path.join(shards_dir, manifest['index']['file']))
+        errors, _ = check_search_manifest(tmp)
+        assert f"index: {manifest['index']['file']} is missing" in errors
+        print("✅ Missing files reported")
+
+if __name__ == "__main__":
+    test_check_search_manifest()
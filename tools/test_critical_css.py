@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test Critical CSS Inliner
+
+This script runs the critical CSS step on a throwaway site and checks the
+per-template subset, the async stylesheet markup, idempotency and the cache.
+"""
+
+import tempfile
+from pathlib import Path
+
+from critical_css import run
+
+CSS = """:root { --c: #333; }
+.hero { color: var(--c); }
+.footer { color: gray; }
+.article-body p { margin: 0; }
+@media (max-width: 600px) { .hero { padding: 0; } .footer { padding: 0; } }
+@keyframes fade { to { opacity: 1; } }
+"""
+
+def page(body, href="/assets/styles.css"):
+    return f'<html><head>\n    <link rel="stylesheet" href="{href}">\n</head><body>{body}</body></html>'
+
+def test_critical_css():
+    """Test inlining, idempotency and the per-template cache."""
+    print("=== TESTING CRITICAL CSS ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'assets').mkdir()
+        (root / 'assets' / 'styles.css').write_text(CSS, encoding='utf-8')
+        (root / 'articles' / 'a').mkdir(parents=True)
+        (root / 'index.html').write_text(page('<div class="hero">Hi</div>' + '<p>x</p>' * 200 + '<div class="footer"></div>'), encoding='utf-8')
+        (root / 'articles' / 'a' / 'index.html').write_text(
+            page('<div class="article-body"><p>Text</p></div>', href="../../assets/styles.css"), encoding='utf-8')
+        quiet = lambda *a: None
+
+        stats = run(tmp, backup_dir=str(root / '.backups'), log=quiet)
+        assert stats['changed'] == 2
+        home = (root / 'index.html').read_text(encoding='utf-8')
+        assert ('<style id="critical-css">:root{--c: #333;}.hero{color: var(--c);}'
+                '@media (max-width: 600px){.hero{padding: 0;}}</style>') in home
+        assert 'footer' not in home.split('</style>')[0] and '@keyframes' not in home
+        assert '<link rel="preload" href="/assets/styles.css" as="style"' in home
+        assert '<noscript><link rel="stylesheet" href="/assets/styles.css"></noscript>' in home
+        assert home.count('rel="stylesheet"') == 1
+        article = (root / 'articles' / 'a' / 'index.html').read_text(encoding='utf-8')
+        assert '.article-body p{margin: 0;}' in article and '.hero' not in article
+        assert 'href="../../assets/styles.css" as="style"' in article
+        print("✅ Per-template critical CSS inlined, stylesheet loaded asynchronously")
+
+        stats = run(tmp, backup_dir=str(root / '.backups'), log=quiet)
+        assert stats['changed'] == 0
+        assert all(t['cached'] for t in stats['templates'].values())
+        print("✅ Second run is a no-op served from the template cache")
+
+        (root / 'assets' / 'styles.css').write_text(CSS.replace('#333', '#000'), encoding='utf-8')
+        stats = run(tmp, backup_dir=str(root / '.backups'), log=quiet)
+        assert stats['changed'] == 2 and not stats['templates']['home']['cached']
+        assert '--c: #000' in (root / 'index.html').read_text(encoding='utf-8')
+        print("✅ Stylesheet change recomputes and updates the inlined CSS in place")
+
+if __name__ == "__main__":
+    test_critical_css()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test CSS Tools
+
+This script checks stylesheet parsing and serialization, the selector matcher
+and the above-the-fold cut-off of the light DOM.
+"""
+
+from css_tools import Document, page_template, parse_selector, parse_stylesheet, serialize
+
+CSS = """
+/* theme */
+:root { --c: #fff; }
+@import url("fonts.css");
+.nav a, .nav > .active { color: red; }
+@media (max-width: 768px) {
+    .nav { display: none; }
+    @supports (display: grid) { .grid { display: grid; } }
+}
+@keyframes spin { from { transform: rotate(0); } to { transform: rotate(360deg); } }
+a[href^="http"]::after { content: "{"; }
+"""
+
+HTML = """<!DOCTYPE html><html><head><title>t</title><style>.x{}</style></head><body>
+<nav class="nav"><a href="/">Home</a><a class="active" href="https://x">Out</a></nav>
+<ul><li>1</li><li class="two">2</li><li>3</li></ul>
+<p><img src="a.jpg"><br/><span data-role="Tag x">s</span></p>
+<div class="below"><input type="search" disabled></div>
+</body></html>"""
+
+def test_stylesheet():
+    """Test parsing and serialization."""
+    print("=== TESTING STYLESHEET PARSING ===")
+    rules = parse_stylesheet(CSS)
+    assert [r.at or r.selectors for r in rules] == [
+        [':root'], '@import url("fonts.css")', ['.nav a', '.nav > .active'], ['.nav'], ['.grid'],
+        '@keyframes spin', ['a[href^="http"]::after'],
+    ]
+    assert rules[4].media == ('@media (max-width: 768px)', '@supports (display: grid)')
+    assert rules[6].body == 'content: "{";'
+    css = serialize(rules)
+    assert '@media (max-width: 768px){.nav{display: none;}@supports (display: grid){.grid{display: grid;}}}' in css
+    assert serialize(parse_stylesheet(css)) == css
+    print("✅ Rules, nested @media/@supports and strings survive a round trip")
+
+def test_selectors():
+    """Test selector matching against a parsed page."""
+    print("=== TESTING SELECTOR MATCHING ===")
+    doc = Document(HTML)
+    expectations = {
+        ':root': 1, '.nav a': 2, '.nav > .active': 1, 'nav a:hover': 2, 'a[href^="http"]::after': 1,
+        'li:first-child': 1, 'li:nth-child(2n+1)': 2, 'li:nth-child(even)': 1, 'li:not(.two)': 2,
+        'li + li': 2, '.two ~ li': 1, 'ul > li:last-of-type': 1, 'span[data-role~="tag" i]': 1,
+        'img + br + span': 1, 'p > span:only-of-type': 1, 'input[type=search]:disabled': 1,
+        '.x': 0, 'title': 1, 'ul li.missing': 0, 'div > .nav': 0,
+    }
+    for selector, count in expectations.items():
+        assert len(doc.select(selector)) == count, (selector, doc.select(selector))
+    assert parse_selector('> a') is None and doc.uses('> a')
+    print(f"✅ {len(expectations)} selectors matched; unparseable selectors count as used")
+
+def test_fold_and_templates():
+    """Test the above-the-fold cut-off and template classification."""
+    print("=== TESTING FOLD AND TEMPLATES ===")
+    doc = Document(HTML, fold_elements=4)
+    assert doc.uses('.nav a', above_fold=True)
+    assert not doc.uses('li', above_fold=True) and doc.uses('li')
+    print("✅ Elements past the fold are excluded from above-the-fold matches")
+
+    assert page_template('index.html') == 'home'
+    assert page_template('es/index.html') == 'home'
+    assert page_template('articles/travel/index.html') == 'article'
+    assert page_template('es/categorias/carteras/index.html') == 'category'
+    assert page_template('quiz/bag-personality/index.html') == 'quiz'
+    assert page_template('search/index.html') == 'search'
+    assert page_template('about/index.html') == 'page'
+    print("✅ Pages classified by template")
+
+if __name__ == "__main__":
+    test_stylesheet()
+    test_selectors()
+    test_fold_and_templates()
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Test Asset Fingerprinting
+
+This script fingerprints the assets of a throwaway site and checks the
+manifest, the cascading hashes through CSS/JS references, the page rewrite and
+pruning of old copies.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+from fingerprint_assets import MANIFEST_PATH, run, source_path
+
+PAGE = """<html><head>
+<link rel="stylesheet" href="../assets/site.css?v=2">
+<link rel="icon" href="https://affordable-handbags.com/assets/icon.svg">
+</head><body>
+<img src="/assets/images/Big%20Bag.jpg" srcset="/assets/images/Big%20Bag.jpg 1x, /photos/other.jpg 2x">
+<div style="background: url(&quot;/assets/images/Big Bag.jpg&quot;)"></div>
+<a href="/assets/missing.css">x</a>
+<script src="/assets/app.js"></script>
+</body></html>"""
+
+def test_fingerprint_assets():
+    """Test fingerprinting, rewriting and pruning."""
+    print("=== TESTING ASSET FINGERPRINTING ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'assets' / 'images').mkdir(parents=True)
+        (root / 'assets' / 'images' / 'Big Bag.jpg').write_bytes(b'\xff\xd8jpeg')
+        (root / 'assets' / 'icon.svg').write_text('<svg></svg>', encoding='utf-8')
+        (root / 'assets' / 'site.css').write_text('.hero{background:url("images/Big Bag.jpg")}', encoding='utf-8')
+        (root / 'assets' / 'app.js').write_text("const icon = '/assets/icon.svg';", encoding='utf-8')
+        (root / 'about').mkdir()
+        (root / 'about' / 'index.html').write_text(PAGE, encoding='utf-8')
+        quiet = lambda *a: None
+
+        stats = run(tmp, backup_dir=str(root / '.backups'), log=quiet)
+        manifest = json.loads((root / MANIFEST_PATH).read_text(encoding='utf-8'))['assets']
+        assert sorted(manifest) == ['/assets/app.js', '/assets/icon.svg', '/assets/images/Big Bag.jpg', '/assets/site.css']
+        css_path = manifest['/assets/site.css']['path']
+        jpg_path = manifest['/assets/images/Big Bag.jpg']['path']
+        assert source_path(css_path) == '/assets/site.css'
+        css = (root / css_path.lstrip('/')).read_text(encoding='utf-8')
+        assert css == '.hero{background:url("%s")}' % jpg_path.replace(' ', '%20')
+        js = (root / manifest['/assets/app.js']['path'].lstrip('/')).read_text(encoding='utf-8')
+        assert manifest['/assets/icon.svg']['path'] in js
+        assert (root / 'assets' / 'site.css').read_text(encoding='utf-8').startswith('.hero{background:url("images/')
+        print("✅ Copies and manifest written; CSS/JS references fingerprinted before hashing")
+
+        page = (root / 'about' / 'index.html').read_text(encoding='utf-8')
+        jpg_url = jpg_path.replace(' ', '%20')
+        assert f'href="{css_path}"' in page
+        assert f'href="https://affordable-handbags.com{manifest["/assets/icon.svg"]["path"]}"' in page
+        assert f'<img src="{jpg_url}" srcset="{jpg_url} 1x, /photos/other.jpg 2x">' in page
+        assert f'url(&quot;{jpg_url}&quot;)' in page
+        assert 'href="/assets/missing.css"' in page
+        assert stats['references'] == 6
+        print("✅ Relative, absolute, encoded, srcset and inline url() references rewritten")
+
+        assert run(tmp, backup_dir=str(root / '.backups'), log=quiet)['references'] == 0
+        print("✅ Second run is a no-op")
+
+        old_css = root / css_path.lstrip('/')
+        for version in ('b', 'c'):
+            (root / 'assets' / 'images' / 'Big Bag.jpg').write_bytes(b'\xff\xd8jpeg' + version.encode())
+            stats = run(tmp, backup_dir=str(root / '.backups'), log=quiet)
+            assert stats['references'] == 4
+        manifest = json.loads((root / MANIFEST_PATH).read_text(encoding='utf-8'))['assets']
+        assert manifest['/assets/site.css']['path'] != css_path and not old_css.exists()
+        assert f'href="{manifest["/assets/site.css"]["path"]}"' in (root / 'about' / 'index.html').read_text(encoding='utf-8')
+        assert stats['pruned'] == 2
+        print("✅ Image change re-hashes the stylesheet; stale references updated, old copies pruned")
+
+if __name__ == "__main__":
+    test_fingerprint_assets()
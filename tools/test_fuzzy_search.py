@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Test Fuzzy Search
+
+This script checks the trigram typo index (build_fuzzy_index), the bounded
+edit distance, typo correction and the fuzzy fallback of search_engine.rank().
+"""
+
+import random
+
+from bench_search import fuzzy_benchmark, misspell
+from search_engine import build_fuzzy_index, build_inverted_index, edit_distance, fuzzy_terms, rank, trigrams
+from test_search_ranking import ITEMS
+
+def test_edit_distance():
+    """Test the bounded optimal string alignment distance."""
+    print("=== TESTING EDIT DISTANCE ===")
+    assert edit_distance('osprey', 'osprey', 1) == 0
+    assert edit_distance('ospery', 'osprey', 1) == 1
+    assert edit_distance('mochlia', 'mochila', 1) == 1
+    assert edit_distance('wallet', 'walet', 1) == 1 and edit_distance('tote', 'totes', 1) == 1
+    assert edit_distance('backpack', 'bakcpakc', 2) == 2
+    assert edit_distance('osprey', 'tote', 1) == 2 and edit_distance('a', 'abcdef', 2) == 3
+    print("✅ Transpositions count as one edit; distances above the limit stop at limit + 1")
+
+def test_fuzzy_terms():
+    """Test trigram candidates and typo correction."""
+    print("=== TESTING TYPO CORRECTION ===")
+    fuzzy = build_fuzzy_index(['osprey', 'mochila', 'mochilas', 'wallet', 'wallets', 'tote', 'bag', 'to', '2024'])
+    assert fuzzy['terms'] == ['bag', 'mochila', 'mochilas', 'osprey', 'tote', 'wallet', 'wallets']
+    assert trigrams('tote') == ['^to', 'tot', 'ote', 'te$']
+    assert fuzzy['trigrams']['^os'] == [fuzzy['terms'].index('osprey')]
+    print("✅ Vocabulary skips numbers and very short terms; trigrams point at term ids")
+
+    assert fuzzy_terms(fuzzy, 'ospery') == [('osprey', 1)]
+    assert fuzzy_terms(fuzzy, 'mochlia') == [('mochila', 1)]
+    assert fuzzy_terms(fuzzy, 'mochilsa') == [('mochila', 1), ('mochilas', 1)]
+    assert fuzzy_terms(fuzzy, 'mohcilsa') == [('mochila', 2), ('mochilas', 2)]
+    assert fuzzy_terms(fuzzy, 'walet') == [('wallet', 1)]
+    assert fuzzy_terms(fuzzy, 'bga') == [] and fuzzy_terms(fuzzy, 'zzzzzz') == []
+    print("✅ Misspellings corrected, closest first; short terms are never corrected")
+
+def test_fuzzy_rank():
+    """Test the fuzzy fallback of rank() and the recall harness."""
+    print("=== TESTING FUZZY RANKING ===")
+    index = build_inverted_index(ITEMS)
+    fuzzy = build_fuzzy_index(index['terms'])
+    assert rank(index, 'ospery') == []
+    typo = rank(index, 'ospery', fuzzy=fuzzy)
+    exact = dict(rank(index, 'osprey'))
+    assert [item_id for item_id, _ in typo] == [1, 2]
+    assert all(0 < score < exact[item_id] for item_id, score in typo)
+    assert [item_id for item_id, _ in rank(index, 'ospery daypack', fuzzy=fuzzy)][0] == 1
+    assert dict(rank(index, 'osprey', fuzzy=fuzzy)) == exact
+    print("✅ Terms without matches fall back to their corrections at a lower score")
+
+    # A typo index over the whole vocabulary, searched against one shard's index
+    full = build_fuzzy_index(['valet', 'wale', 'walef', 'wallet'])
+    assert [term for term, _ in fuzzy_terms(full, 'walet')] == ['valet', 'wale', 'walef']
+    assert fuzzy_terms(full, 'walet', indexed=index['terms']) == [('wallet', 1)]
+    assert [item_id for item_id, _ in rank(index, 'walet', fuzzy=full)] == [0]
+    print("✅ Corrections missing from the searched shard are skipped, not returned empty")
+
+    rng = random.Random(1)
+    assert all(edit_distance(misspell('backpack', rng), 'backpack', 1) == 1 for _ in range(50))
+    result = fuzzy_benchmark(list(index['terms']), [500], samples=50)[0]
+    assert result['size'] == 500 and result['recall'] >= 0.9
+    print(f"✅ Recall {result['recall']:.0%} on single-edit typos in a 500-term vocabulary")
+
+if __name__ == "__main__":
+    test_edit_distance()
+    test_fuzzy_terms()
+    test_fuzzy_rank()
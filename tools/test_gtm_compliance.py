@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test GTM Compliance Checker
+
+This script checks the verdicts of the read-only compliance checker on two
+throwaway pages and that unchanged pages are served from the verdict cache.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from gtm_compliance import check_site, count_signals
+from gtm_rules import gtm_body_block, gtm_head_block
+from html_corpus import get_corpus
+
+CLEAN = f"<html><head>\n{gtm_head_block()}</head><body>\n{gtm_body_block()}<p>Bags</p></body></html>"
+DIRTY = "<html><head><script>gtag('config', 'G-H1Q1KL01RP');</script></head><body></body></html>"
+
+def test_gtm_compliance():
+    """Test signal counts, verdicts and the cache."""
+    print("=== TESTING GTM COMPLIANCE CHECKER ===")
+
+    assert count_signals(CLEAN) == {'gtm_scripts': 1, 'gtm_noscripts': 1, 'gtag_calls': 0, 'ga4_references': 0}
+    assert count_signals(DIRTY) == {'gtm_scripts': 0, 'gtm_noscripts': 0, 'gtag_calls': 1, 'ga4_references': 1}
+    print("✅ Signals counted in one scan")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'index.html').write_text(CLEAN, encoding='utf-8')
+        (root / 'old.html').write_text(DIRTY, encoding='utf-8')
+
+        report = check_site(tmp)
+        assert not report['clean'] and report['failing'] == ['old.html']
+        assert report['stats'] == {'cached': 0, 'checked': 2, 'errors': 0}
+        assert (root / '.build-cache' / 'gtm-verdicts.json').exists()
+        print("✅ Non-compliant page reported")
+
+        get_corpus(tmp).refresh()
+        assert check_site(tmp)['stats']['cached'] == 2
+        print("✅ Unchanged pages served from cache")
+
+        (root / 'old.html').write_text(CLEAN, encoding='utf-8')
+        os.utime(root / 'old.html', ns=(0, 0))
+        get_corpus(tmp).refresh()
+        report = check_site(tmp)
+        assert report['clean'] and report['stats'] == {'cached': 1, 'checked': 1, 'errors': 0}
+        print("✅ Modified page re-checked")
+
+if __name__ == "__main__":
+    test_gtm_compliance()
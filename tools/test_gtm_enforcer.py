@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test GTM GA4 Enforcer
+
+This script runs the single-pass GTM rewriter on a throwaway page and checks
+the result, idempotency and the content-addressed backups.
+"""
+
+import tempfile
+from pathlib import Path
+
+from gtm_ga4_enforcer import GTM_BODY, GTM_HEAD, GTMEnforcer
+from html_corpus import HtmlCorpus
+
+PAGE = """<!DOCTYPE html>
+<html><head>
+<!-- Google tag (gtag.js) -->
+<script async src="https://www.googletagmanager.com/gtag/js?id=G-H1Q1KL01RP"></script>
+<!-- End Google tag (gtag.js) -->
+<script>window.dataLayer = window.dataLayer || []; gtag('js', new Date()); gtag('config', 'G-H1Q1KL01RP');</script>
+<script type="application/ld+json">{"image": "https://affordable-handbags.com/images/og-homepage.jpg"}</script>
+<title>Test</title>
+</head>
+<body class="page">
+<header><h1>Bags</h1></header>
+<script src="/assets/script.js"></script>
+</body></html>
+"""
+
+def test_gtm_enforcer():
+    """Test rewrite, idempotency and backups."""
+    print("=== TESTING GTM ENFORCER ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'index.html').write_text(PAGE, encoding='utf-8')
+        
+        enforcer = GTMEnforcer(backup_dir=str(root / '.backups'))
+        enforcer.log = lambda message, level="INFO": None
+        doc = HtmlCorpus(root).get('index.html')
+        assert enforcer.process_file(doc)
+        
+        result = (root / 'index.html').read_text(encoding='utf-8')
+        assert 'gtag' not in result and 'G-H1Q1KL01RP' not in result
+        assert result.count(GTM_HEAD) == 1 and result.count(GTM_BODY) == 1
+        assert '<head>\n' + GTM_HEAD in result
+        assert '<body class="page">\n' + GTM_BODY in result
+        assert 'og-homepage.jpg' in result and '/assets/script.js' in result
+        assert '<header><h1>Bags</h1></header>' in result
+        print("✅ gtag removed, canonical GTM inserted, unrelated markup kept")
+        
+        assert not enforcer.process_file(HtmlCorpus(root).get('index.html'))
+        print("✅ Second run makes no changes")
+        
+        records = enforcer.backups.entries('index.html')
+        assert len(records) == 1
+        assert enforcer.backups.load(records[0]['sha256']).decode('utf-8') == PAGE
+        assert not list(root.glob('*.bak_*'))
+        enforcer.backups.restore(root / 'index.html', records[0]['sha256'])
+        assert (root / 'index.html').read_text(encoding='utf-8') == PAGE
+        print("✅ Original stored once in the backup store and restorable")
+
+if __name__ == "__main__":
+    test_gtm_enforcer()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Test GTM Rule Engine
+
+This script applies the presets that replaced the old one-off GTM scripts to a
+sample page and checks which constructs each one removes, keeps or inserts.
+"""
+
+import tempfile
+from pathlib import Path
+
+from gtm_rules import PRESETS, RuleEngine, gtm_body_block, gtm_head_block, run
+
+GTM_HEAD = gtm_head_block()
+GTM_BODY = gtm_body_block()
+
+PAGE = f"""<!DOCTYPE html>
+<html><head>
+{GTM_HEAD}<!-- Google tag (gtag.js) -->
+<script async src="https://www.googletagmanager.com/gtag/js?id=G-H1Q1KL01RP"></script>
+<!-- End Google tag (gtag.js) -->
+<script>window.dataLayer = window.dataLayer || []; function gtag(){{dataLayer.push(arguments);}} gtag('js', new Date()); gtag('config', 'G-H1Q1KL01RP');</script>
+<!-- GA4 is configured in GTM (G-H1Q1KL01RP) -->
+{GTM_HEAD}<title>Test</title>
+</head>
+<body>
+<main><p>Bags</p></main>
+<script>document.querySelector('.buy').addEventListener('click', () => gtag('event', 'buy'));</script>
+<script src="/assets/script.js"></script>
+</body></html>
+"""
+
+# Inline setup that does not start the script: the old gtm_precise_cleanup.py
+# removed the setup lines and left the rest of the script
+MIXED_SCRIPT_PAGE = """<html><head>
+<script>
+// analytics
+console.log('ready');
+window.dataLayer = window.dataLayer || [];
+function gtag(){dataLayer.push(arguments);}
+gtag('js', new Date());
+gtag('config', 'G-H1Q1KL01RP');
+</script>
+</head><body></body></html>
+"""
+MIXED_SCRIPT_PRECISE = """<html><head>
+<script>
+// analytics
+console.log('ready');
+;
+gtag('config', 'G-H1Q1KL01RP');
+</script>
+</head><body></body></html>
+"""
+
+OTHER_HEAD = gtm_head_block("GTM-OTHER01")
+
+def test_gtm_rules():
+    """Test presets, idempotency and the corpus runner."""
+    print("=== TESTING GTM RULE ENGINE ===")
+
+    cleaned, counts = RuleEngine(PRESETS["precise"]).apply(PAGE)
+    assert 'gtag/js' not in cleaned and 'G-H1Q1KL01RP' not in cleaned and 'function gtag' not in cleaned
+    assert cleaned.count(GTM_HEAD) == 2
+    assert counts['remove-gtag-blocks'] == 1 and counts['remove-gtag-init-scripts'] == 1
+    assert counts['remove-ga4-comments'] == 1
+    assert "() => gtag('event', 'buy'));</script>" in cleaned
+    print("✅ precise: gtag.js setup removed; GTM blocks and site scripts calling gtag() left alone")
+
+    cleaned, counts = RuleEngine(PRESETS["precise"]).apply(MIXED_SCRIPT_PAGE)
+    assert cleaned == MIXED_SCRIPT_PRECISE
+    assert counts['remove-gtag-init-scripts'] == 0 and counts['remove-gtag-setup'] == 3
+    print("✅ precise: setup inside a kept script is removed as the old script did")
+
+    cleanup, _ = RuleEngine(PRESETS["cleanup"]).apply(PAGE)
+    assert 'gtag' not in cleanup and 'querySelector' not in cleanup
+    print("✅ cleanup: every script calling gtag() removed")
+
+    deduped, counts = RuleEngine(PRESETS["dedupe"]).apply(PAGE)
+    assert deduped.count(GTM_HEAD) == 1 and GTM_BODY not in deduped
+    assert counts['dedupe-gtm'] == 1
+    assert 'gtag/js' in deduped
+    print("✅ dedupe: one loader kept, gtag untouched")
+
+    no_gtm = MIXED_SCRIPT_PAGE
+    assert RuleEngine(PRESETS["dedupe"]).apply(no_gtm)[0] == no_gtm
+    other = PAGE.replace(GTM_HEAD, OTHER_HEAD + GTM_HEAD, 1)
+    deduped_other, _ = RuleEngine(PRESETS["dedupe"]).apply(other)
+    assert deduped_other.count(OTHER_HEAD) == 1 and deduped_other.count(GTM_HEAD) == 1
+    print("✅ dedupe: pages without GTM and other containers' blocks left alone")
+
+    complete, _ = RuleEngine(PRESETS["complete"]).apply(PAGE)
+    assert complete.count(GTM_HEAD) == 1 and complete.count(GTM_BODY) == 1
+    assert 'gtag' not in complete and '/assets/script.js' in complete
+    assert RuleEngine(PRESETS["complete"]).apply(complete)[0] == complete
+    print("✅ complete: canonical blocks only, second pass is a no-op")
+
+    try:
+        RuleEngine(["no-such-rule"])
+        assert False, "unknown rule accepted"
+    except ValueError:
+        print("✅ Unknown rule names are rejected")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'index.html').write_text(PAGE, encoding='utf-8')
+        stats = run(PRESETS["dedupe"], "test", "test_gtm_rules", root=str(root),
+                    backup_dir=str(root / '.backups'))
+        assert stats['changed'] == 1 and stats['errors'] == 0
+        assert (root / 'index.html').read_text(encoding='utf-8') == deduped
+        assert (root / '.backups' / 'index.jsonl').exists()
+        print("✅ Runner rewrites the page and records a backup")
+
+if __name__ == "__main__":
+    test_gtm_rules()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test Head Metadata Extraction
+
+This script checks the head-only parser on a real page and the EN<->ES
+alternate-graph verdicts on a small hand-built set of pages.
+"""
+
+from head_meta import check_alternate_graph, extract_head_meta
+
+SITE = "https://affordable-handbags.com"
+
+def page(url, canonical=None, **alternates):
+    return {"canonical": canonical or url, "alternates": alternates, "og_url": canonical or url, "robots": None}
+
+def test_head_meta():
+    """Test extraction and graph checks."""
+    print("=== TESTING HEAD METADATA ===")
+
+    with open('index.html', 'r', encoding='utf-8') as f:
+        meta = extract_head_meta(f.read())
+    assert meta["canonical"] == SITE + "/"
+    assert meta["og_url"] == SITE + "/"
+    assert meta["alternates"]["es"] == SITE + "/es/"
+    print("✅ Homepage canonical, og:url and hreflang extracted")
+
+    html = '<html><head><link rel="canonical" href="/a/"></head><body><link rel="canonical" href="/b/"></body></html>'
+    assert extract_head_meta(html)["canonical"] == "/a/"
+    print("✅ Parsing stops at </head>")
+
+    en, es, other = SITE + "/articles/wallets/", SITE + "/es/articulos/carteras/", SITE + "/articles/backpacks/"
+    pages = {
+        en: page(en, en=en, es=es),
+        es: page(es, es=es, en=en),
+        other: page(other, en=other, es=SITE + "/es/articulos/mochilas/"),
+    }
+    assert check_alternate_graph(pages) == [{
+        "url": other, "type": "broken_hreflang",
+        "detail": f"es -> {SITE}/es/articulos/mochilas/ is not a page of the site",
+    }]
+    print("✅ Symmetric pair passes, missing target reported as broken")
+
+    pages[es] = page(es, canonical=en, es=es)
+    kinds = sorted(issue["type"] for issue in check_alternate_graph(pages))
+    assert kinds == ["asymmetric_hreflang", "broken_hreflang", "canonical_mismatch"]
+    print("✅ Asymmetric pair and non-self canonical reported")
+
+    pages[es] = page(es, es=en, en=es)
+    issues = [issue for issue in check_alternate_graph(pages) if issue["url"] == en]
+    assert [issue["type"] for issue in issues] == ["asymmetric_hreflang"]
+    print("✅ Link back under the wrong language reported as asymmetric")
+
+if __name__ == "__main__":
+    test_head_meta()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test Shared HTML Corpus
+
+This script checks the canonical exclusion policy, the read-once caching and
+the handling of pages that are not UTF-8 in tools/html_corpus.py against a
+throwaway tree.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from html_corpus import HtmlCorpus
+
+def test_html_corpus():
+    """Test exclusion policy and caching."""
+    print("=== TESTING HTML CORPUS ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        pages = {
+            'index.html': '<title>Home</title>',
+            'articles/wallets.html': '<title>Wallets</title>',
+            'es/index.html': '<title>Inicio</title>',
+            'articles/wallets.html.bak_gtmfix': 'backup',
+            'tools/cmp-test.html': 'tool page',
+            'scripts/page.html': 'script page',
+            'node_modules/pkg/readme.html': 'dependency',
+            '.git/info.html': 'git',
+        }
+        for name, content in pages.items():
+            path = root / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content, encoding='utf-8')
+        
+        corpus = HtmlCorpus(root)
+        urls = [doc.url for doc in corpus]
+        print(f"Corpus URLs: {urls}")
+        assert urls == ['/articles/wallets.html', '/es/index.html', '/index.html']
+        print("✅ Backups, tools, scripts and node_modules are excluded")
+        
+        doc = corpus.get('articles/wallets.html')
+        assert not doc.is_loaded()
+        assert doc.text == '<title>Wallets</title>'
+        (root / 'articles/wallets.html').write_text('changed on disk', encoding='utf-8')
+        assert doc.text == '<title>Wallets</title>'
+        print("✅ Content is read once and cached")
+        
+        doc.write_text('<title>Updated</title>')
+        assert (root / 'articles/wallets.html').read_text(encoding='utf-8') == '<title>Updated</title>'
+        assert doc.lower == '<title>updated</title>'
+        assert not [n for n in os.listdir(root / 'articles') if n.endswith('.tmp' + str(os.getpid()))]
+        print("✅ Writes go through the cache and leave no temp files")
+        
+        (root / 'es/index.html').write_bytes('<title>Añadir</title>'.encode('latin-1'))
+        corpus = HtmlCorpus(root)
+        legacy = corpus.get('es/index.html')
+        try:
+            legacy.text
+            assert False, "latin-1 page decoded as UTF-8"
+        except UnicodeDecodeError:
+            pass
+        assert legacy.lenient_text == '<title>Aadir</title>'
+        logs = []
+        assert [d.url for d in corpus.decodable(logs.append)] == ['/articles/wallets.html', '/index.html']
+        assert len(logs) == 1 and 'es/index.html' in logs[0] and 'skipped' in logs[0]
+        print("✅ Pages in another encoding are reported and skipped by writers")
+
+if __name__ == "__main__":
+    test_html_corpus()
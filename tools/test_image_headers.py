@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test Image Dimension Injector
+
+This script checks header-only dimension parsing on hand-built image headers,
+the attribute injection rules and the hash-keyed dimension cache.
+"""
+
+import struct
+import tempfile
+from pathlib import Path
+
+from image_headers import DimensionCache, inject_attributes, read_dimensions, run
+
+def box(kind, body):
+    return struct.pack('>I4s', 8 + len(body), kind) + body
+
+def jpeg(width, height, orientation=1):
+    tiff = b'MM\0*' + struct.pack('>I', 8) + struct.pack('>H', 1) + struct.pack('>HHIHH', 0x0112, 3, 1, orientation, 0)
+    app1 = b'Exif\0\0' + tiff
+    return (b'\xff\xd8' + b'\xff\xe1' + struct.pack('>H', len(app1) + 2) + app1
+            + b'\xff\xc2' + struct.pack('>HBHH', 11, 8, height, width) + b'\0' * 6 + b'\xff\xd9')
+
+HEADERS = {
+    'a.png': (b'\x89PNG\r\n\x1a\n' + struct.pack('>I4sII', 13, b'IHDR', 300, 200) + b'\0' * 9, (300, 200)),
+    'a.gif': (b'GIF89a' + struct.pack('<HH', 16, 9) + b'\0' * 8, (16, 9)),
+    'x.webp': (b'RIFF\0\0\0\0WEBPVP8X' + b'\0' * 8 + (1199).to_bytes(3, 'little') + (799).to_bytes(3, 'little'), (1200, 800)),
+    'l.webp': (b'RIFF\0\0\0\0WEBPVP8L\0\0\0\0\x2f' + struct.pack('<I', 99 | (49 << 14)), (100, 50)),
+    'a.jpg': (jpeg(640, 480), (640, 480)),
+    'rotated.jpg': (jpeg(640, 480, orientation=6), (480, 640)),
+    'a.avif': (box(b'ftyp', b'avif\0\0\0\0') + box(b'meta', b'\0' * 4 + box(b'iprp', box(b'ipco',
+               box(b'ispe', b'\0' * 4 + struct.pack('>II', 160, 90)) + box(b'ispe', b'\0' * 4 + struct.pack('>II', 1600, 900))))),
+               (1600, 900)),
+    'icon.svg': (b'<?xml version="1.0"?><svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 24 12"></svg>', (24, 12)),
+}
+
+def test_read_dimensions():
+    """Test header parsing for every supported format."""
+    print("=== TESTING IMAGE HEADERS ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, (data, expected) in HEADERS.items():
+            path = Path(tmp) / name
+            path.write_bytes(data)
+            assert read_dimensions(path) == expected, (name, read_dimensions(path))
+        print(f"✅ {len(HEADERS)} headers parsed (PNG, GIF, WebP, JPEG + EXIF rotation, AVIF, SVG)")
+
+def test_inject_attributes():
+    """Test the attribute injection rules."""
+    print("=== TESTING ATTRIBUTE INJECTION ===")
+    sizes = {'/hero.jpg': (1200, 800), '/a.jpg': (600, 400)}
+    html = ('<img src="/hero.jpg" alt="Hero" loading="lazy">'
+            '<script>var t = "<img src=\'/a.jpg\'>";</script>'
+            '<img src="/a.jpg" alt="A" width="300"/>'
+            '<img src="/missing.jpg" alt="B" loading="eager">')
+    out, changed = inject_attributes(html, sizes.get)
+    assert out == ('<img src="/hero.jpg" alt="Hero" loading="eager" width="1200" height="800">'
+                   '<script>var t = "<img src=\'/a.jpg\'>";</script>'
+                   '<img src="/a.jpg" alt="A" width="300" height="200" loading="lazy" decoding="async" />'
+                   '<img src="/missing.jpg" alt="B" loading="eager" decoding="async">'), out
+    assert changed == 3
+    assert inject_attributes(out, sizes.get) == (out, 0)
+    print("✅ Hero stays eager, others lazy/async, aspect ratio kept, scripts skipped, idempotent")
+
+def test_run_and_cache():
+    """Test the batch pass and the hash-keyed cache."""
+    print("=== TESTING BATCH PASS ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'photos').mkdir()
+        (root / 'photos' / 'Big Bag.png').write_bytes(HEADERS['a.png'][0])
+        (root / 'photos' / 'Copy.png').write_bytes(HEADERS['a.png'][0])
+        (root / 'index.html').write_text('<img src="/photos/Big%20Bag.png"><img src="photos/Copy.png">', encoding='utf-8')
+        quiet = lambda *a: None
+
+        stats = run(tmp, backup_dir=str(root / '.backups'), log=quiet)
+        assert (stats['tags'], stats['read'], stats['cached']) == (2, 1, 1)
+        assert (root / 'index.html').read_text(encoding='utf-8') == (
+            '<img src="/photos/Big%20Bag.png" width="300" height="200">'
+            '<img src="photos/Copy.png" width="300" height="200" loading="lazy" decoding="async">')
+        print("✅ Page updated; identical files share one cache entry")
+
+        cache = DimensionCache(tmp)
+        assert cache.get('photos/Big Bag.png') == (300, 200)
+        assert cache.stats == {'read': 0, 'cached': 1, 'unknown': 0}
+        print("✅ Dimensions served from the cache on the next run")
+
+if __name__ == "__main__":
+    test_read_dimensions()
+    test_inject_attributes()
+    test_run_and_cache()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test Image Pipeline
+
+This script checks slug/hash naming, pruning of old variants and the
+<img> -> <picture> rewrite against a hand-made manifest. The encoding step runs only when Pillow is installed.
+"""
+
+import json
+import tempfile
+from pathlib import Path
+
+import image_pipeline
+from html_corpus import get_corpus
+from image_pipeline import hashed_name, optimize_images, prune_outputs, rewrite_html, rewrite_pages, slugify
+
+OPT = '/assets/images/optimized/'
+MANIFEST = {'version': 1, 'images': {
+    '/photos/Travelon Anti-Theft Bag.jpg': {
+        'width': 1500, 'height': 1000,
+        'sources': {
+            'webp': [[OPT + 'travelon-anti-theft-bag-1a2b3c4d-640.webp', 640],
+                     [OPT + 'travelon-anti-theft-bag-1a2b3c4d-1280.webp', 1280]],
+            'jpeg': [[OPT + 'travelon-anti-theft-bag-1a2b3c4d-640.jpg', 640],
+                     [OPT + 'travelon-anti-theft-bag-1a2b3c4d-1280.jpg', 1280]],
+        },
+    },
+}}
+
+def test_naming():
+    """Test slug-safe, content-hashed names."""
+    print("=== TESTING IMAGE NAMING ===")
+    assert slugify("Travelon Anti-Theft Signature Bag, Black (2)") == "travelon-anti-theft-signature-bag-black-2"
+    assert slugify("Bolso Niña Café") == "bolso-nina-cafe"
+    assert slugify("***") == "image"
+    assert hashed_name(Path("photos/Big Tote.JPG"), "abcdef0123456789") == "big-tote-abcdef01"
+    print("✅ Slugs are ASCII, lowercase and hashed")
+
+def test_prune():
+    """Test that variants of the current and previous build survive pruning."""
+    print("=== TESTING VARIANT PRUNING ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        out_dir = Path(tmp)
+        names = ['travelon-anti-theft-bag-1a2b3c4d-640.webp', 'travelon-anti-theft-bag-1a2b3c4d-1280.jpg',
+                 'travelon-anti-theft-bag-99999999-640.webp', 'old-tote-0badc0de-320.jpg', 'manifest.json']
+        for name in names:
+            (out_dir / name).write_bytes(b'x')
+        previous = {'version': 1, 'images': {'/photos/Travelon Anti-Theft Bag.jpg': {
+            'width': 640, 'height': 480,
+            'sources': {'webp': [[OPT + 'travelon-anti-theft-bag-99999999-640.webp', 640]]},
+        }}}
+        assert prune_outputs(out_dir, MANIFEST, previous) == 1
+        assert sorted(p.name for p in out_dir.iterdir()) == sorted(names[:3] + ['manifest.json'])
+        print("✅ Variants of this and the previous build kept, older ones removed")
+
+def test_rewrite():
+    """Test the <picture> rewrite and its idempotency."""
+    print("=== TESTING HTML REWRITE ===")
+    html = ('<p><img src="/photos/Travelon%20Anti-Theft%20Bag.jpg" alt="Bag &amp; strap" loading="lazy"></p>'
+            '<img src="/images/logo.png" alt="Logo">')
+    out, count = rewrite_html(html, MANIFEST)
+    assert count == 1
+    assert out.count('<picture>') == 1 and '<img src="/images/logo.png" alt="Logo">' in out
+    assert '<source type="image/webp" srcset="' + OPT + 'travelon-anti-theft-bag-1a2b3c4d-640.webp 640w' in out
+    assert 'src="' + OPT + 'travelon-anti-theft-bag-1a2b3c4d-1280.jpg"' in out
+    assert 'width="1500" height="1000"' in out
+    assert 'alt="Bag &amp; strap" loading="lazy"' in out
+    assert rewrite_html(out, MANIFEST) == (out, 0)
+    print("✅ Photo wrapped in <picture>, attributes kept, second run is a no-op")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        page = Path(tmp) / 'index.html'
+        page.write_text(html, encoding='utf-8')
+        assert rewrite_pages(MANIFEST, root=tmp, dry_run=True, log=lambda *a: None) == 1
+        assert page.read_text(encoding='utf-8') == html
+        assert rewrite_pages(MANIFEST, root=tmp, backup_dir=str(Path(tmp) / '.backups'), log=lambda *a: None) == 1
+        assert page.read_text(encoding='utf-8') == out
+        print("✅ Pages rewritten with backups, dry run leaves them alone")
+        
+        legacy = html.replace('Bag &amp; strap', 'Bolso pequeño').encode('latin-1')
+        page.write_bytes(legacy)
+        get_corpus(tmp).refresh()
+        logs = []
+        assert rewrite_pages(MANIFEST, root=tmp, backup_dir=str(Path(tmp) / '.backups'), log=logs.append) == 0
+        assert page.read_bytes() == legacy and 'not valid UTF-8' in logs[0]
+        print("✅ Pages that are not UTF-8 are reported and left byte-for-byte intact")
+
+def test_encode():
+    """Test encoding and the source-hash cache (needs Pillow)."""
+    print("=== TESTING IMAGE ENCODING ===")
+    if image_pipeline.Image is None:
+        assert optimize_images(log=lambda *a: None) is None
+        print("⚠️  Pillow not installed; encoding skipped gracefully")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        (Path(tmp) / 'photos').mkdir()
+        image_pipeline.Image.new('RGB', (800, 400), 'red').save(Path(tmp) / 'photos' / 'Red Bag.jpg')
+        exif = image_pipeline.Image.Exif()
+        exif[0x0112] = 6  # stored sideways, shown rotated 90 degrees
+        image_pipeline.Image.new('RGB', (600, 300), 'blue').save(Path(tmp) / 'photos' / 'Turned.jpg', exif=exif)
+        manifest = optimize_images(root=tmp, jobs=1, log=lambda *a: None)
+        entry = manifest['images']['/photos/Red Bag.jpg']
+        assert (entry['width'], entry['height']) == (800, 400)
+        assert [w for _, w in entry['sources']['jpeg']] == [320, 640, 800]
+        turned = manifest['images']['/photos/Turned.jpg']
+        assert (turned['width'], turned['height']) == (300, 600)
+        on_disk = json.loads((Path(tmp) / image_pipeline.MANIFEST_PATH).read_text(encoding='utf-8'))
+        assert on_disk == manifest
+        logs = []
+        optimize_images(root=tmp, jobs=1, log=logs.append)
+        assert logs[0].startswith("Sources: 2 (2 cached, 0 to encode)")
+        print("✅ Variants encoded upright without upscaling, second run served from cache")
+
+if __name__ == "__main__":
+    test_naming()
+    test_prune()
+    test_rewrite()
+    test_encode()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test Incremental Search Index Build
+
+This script checks that build_search_index.collect_entries() only re-extracts
+new and changed pages and drops deleted ones, and that a tag vocabulary edit or
+a missing output forces a rebuild.
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from build_search_index import (INDEX_PATH, INVERTED_INDEX_PATH, SHARDS_DIR, articles_from_manifest,
+                                collect_entries, load_manifest, outputs_exist, save_manifest, write_shards)
+from html_corpus import HtmlCorpus
+
+PAGE = '<html><head><title>{}</title><meta name="description" content="{}"></head><body></body></html>'
+
+def quiet(message):
+    pass
+
+def test_incremental_search_index():
+    """Test the incremental manifest merge."""
+    print("=== TESTING INCREMENTAL SEARCH INDEX ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'articles').mkdir()
+        for name in ['one', 'two', 'three']:
+            (root / 'articles' / f'{name}.html').write_text(PAGE.format(name.title(), 'Coach tote'), encoding='utf-8')
+        
+        manifest, stats = collect_entries(HtmlCorpus(root), {"files": {}}, log=quiet)
+        print(f"Full build: {stats}")
+        assert stats['added'] == 3
+        
+        manifest, stats = collect_entries(HtmlCorpus(root), manifest, incremental=True, log=quiet)
+        print(f"No-op rebuild: {stats}")
+        assert stats['unchanged'] == 3 and stats['added'] == stats['changed'] == 0
+        
+        two = root / 'articles' / 'two.html'
+        two.write_text(PAGE.format('Two Updated', 'Osprey backpack'), encoding='utf-8')
+        os.utime(two, ns=(0, 0))
+        (root / 'articles' / 'three.html').unlink()
+        (root / 'articles' / 'four.html').write_text(PAGE.format('Four', 'Wallet'), encoding='utf-8')
+        os.utime(root / 'articles' / 'one.html', ns=(1, 1))
+        
+        manifest, stats = collect_entries(HtmlCorpus(root), manifest, incremental=True, log=quiet)
+        print(f"Edited rebuild: {stats}")
+        assert stats == {'added': 1, 'changed': 1, 'unchanged': 1, 'removed': 1, 'failed': 0}
+        
+        titles = sorted(a['title'] for a in articles_from_manifest(manifest))
+        assert titles == ['Four', 'One', 'Two Updated']
+        print("✅ Only changed pages were re-extracted and the index was merged")
+        
+        serial, _ = collect_entries(HtmlCorpus(root), {"files": {}}, log=quiet)
+        parallel, _ = collect_entries(HtmlCorpus(root), {"files": {}}, log=quiet, jobs=2)
+        assert list(parallel['files'].items()) == list(serial['files'].items())
+        print("✅ --jobs extraction matches the serial build, in the same order")
+
+def test_incremental_invalidation():
+    """Test the vocabulary cache key and the output check that gate a skipped build."""
+    print("=== TESTING INCREMENTAL INVALIDATION ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'articles').mkdir()
+        (root / 'articles' / 'one.html').write_text(PAGE.format('One', 'Coach tote'), encoding='utf-8')
+        manifest, _ = collect_entries(HtmlCorpus(root), {"files": {}}, log=quiet)
+        path = str(root / 'manifest.json')
+        save_manifest(manifest, path)
+        assert load_manifest(path)['files'] == manifest['files']
+        
+        vocabulary = root / 'tags.json'
+        vocabulary.write_text('{"brands": ["coach", "kate spade"]}', encoding='utf-8')
+        assert load_manifest(path, vocabulary_path=str(vocabulary))['files'] == {}
+        print("✅ Editing the tag vocabulary invalidates every cached entry")
+        
+        articles = articles_from_manifest(manifest)
+        (root / INDEX_PATH).write_text('[]', encoding='utf-8')
+        (root / INVERTED_INDEX_PATH).write_text('{}', encoding='utf-8')
+        shards = write_shards(articles, out_dir=str(root / SHARDS_DIR))
+        assert outputs_exist(tmp)
+        (root / SHARDS_DIR / shards['articles']['es']['file']).unlink()
+        assert not outputs_exist(tmp)
+        shards = write_shards(articles, out_dir=str(root / SHARDS_DIR))
+        (root / SHARDS_DIR / shards['shards']['en']['file']).unlink()
+        assert not outputs_exist(tmp)
+        print("✅ A missing article module or hashed shard forces a rebuild")
+
+if __name__ == "__main__":
+    test_incremental_search_index()
+    test_incremental_invalidation()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test Link Graph
+
+This script builds the link graph of a throwaway site with a netlify.toml and
+checks the broken-link, orphan and redirect-chain queries and the cache.
+"""
+
+import tempfile
+from pathlib import Path
+
+from html_corpus import get_corpus
+from link_graph import LinkGraph
+
+NETLIFY = """
+[[redirects]]
+  from = "/old/"
+  to = "/older/"
+  status = 301
+
+[[redirects]]
+  from = "/older/"
+  to = "/articles/bags/"
+  status = 301
+
+[[redirects]]
+  from = "/articles/*.html"
+  to = "/articles/:splat/"
+  status = 301
+  force = true
+
+[[redirects]]
+  from = "/loop-a"
+  to = "/loop-b"
+  status = 301
+
+[[redirects]]
+  from = "/loop-b"
+  to = "/loop-a"
+  status = 301
+"""
+
+PAGES = {
+    'index.html': '<a href="/articles/bags/">Bags</a> <a href="/old/">Old</a> <a href="https://example.com/">x</a>'
+                  '<img src="/images/logo.png" srcset="/images/logo.png 1x, /images/logo@2x.png 2x">',
+    'articles/bags/index.html': '<a href="../../">Home</a> <a href="/articles/bags.html">self</a> <a href="/missing/">?</a>',
+    'articles/bags.html': '<p>Old copy</p>',
+    'articles/lonely.html': '<a href="/loop-a">loop</a><script>var s = "<a href=\'/nope/\'>";</script>',
+    'images/logo.png': '',
+}
+
+def test_link_graph():
+    """Test resolution, queries and the extraction cache."""
+    print("=== TESTING LINK GRAPH ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'netlify.toml').write_text(NETLIFY, encoding='utf-8')
+        for name, body in PAGES.items():
+            (root / name).parent.mkdir(parents=True, exist_ok=True)
+            (root / name).write_text(body, encoding='utf-8')
+
+        graph = LinkGraph(tmp).build()
+        broken = {(b['page'], b['href'], b['status']) for b in graph.broken_links()}
+        assert broken == {
+            ('articles/bags/index.html', '/missing/', 'broken'),
+            ('index.html', '/images/logo@2x.png', 'broken'),
+            ('articles/lonely.html', '/loop-a', 'loop'),
+        }, broken
+        print("✅ Broken links, missing srcset image and redirect loop reported")
+
+        assert graph.orphans() == ['articles/bags.html', 'articles/lonely.html']
+        print("✅ Orphans: page shadowed by a forced redirect and unlinked page")
+
+        chains = graph.redirected_links(min_hops=2)
+        assert [(c['page'], c['href'], c['hops']) for c in chains] == [('index.html', '/old/', 2)]
+        assert chains[0]['chain'][-1][1] == '/articles/bags/'
+        print("✅ Two-hop redirect chain found")
+
+        get_corpus(tmp).refresh()
+        again = LinkGraph(tmp).build()
+        assert again.stats == {'parsed': 0, 'cached': 4}
+        assert again.edges == graph.edges
+        print("✅ Second build reuses every cached extraction")
+
+if __name__ == "__main__":
+    test_link_graph()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test Live Crawler
+
+This script serves a throwaway site with a local http.server (a stand-in for
+the live site), crawls it from a sitemap and checks connection reuse and
+conditional revalidation against the response cache.
+"""
+
+import tempfile
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from live_crawler import LiveCrawler, rebase_url, sitemap_urls
+
+SITEMAP = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+{}
+</urlset>
+"""
+
+class KeepAliveHandler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+def test_live_crawler():
+    """Test sitemap seeding, pooling and the conditional request cache."""
+    print("=== TESTING LIVE CRAWLER ===")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        pages = [f"page{i}.html" for i in range(12)]
+        for name in pages:
+            (root / name).write_text(f"<html><body>{name}</body></html>", encoding='utf-8')
+        locs = "\n".join(f"<url><loc>https://affordable-handbags.com/{name}</loc></url>" for name in pages)
+        (root / 'sitemap.xml').write_text(SITEMAP.format(locs), encoding='utf-8')
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), partial(KeepAliveHandler, directory=tmp))
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            base = f"http://127.0.0.1:{server.server_address[1]}"
+            urls = [rebase_url(url, base) for url in sitemap_urls(str(root / 'sitemap.xml'))]
+            assert urls[0] == f"{base}/page0.html"
+            urls.append(f"{base}/missing.html")
+
+            cache_dir = str(root / '.build-cache' / 'live-crawl')
+            crawler = LiveCrawler(concurrency=3, cache_dir=cache_dir)
+            results = crawler.run(urls)
+            assert [r.url for r in results] == urls
+            assert all(r.ok for r in results[:-1]) and results[-1].status == 404
+            assert results[5].text == "<html><body>page5.html</body></html>"
+            assert crawler.pool.opened <= 3 < crawler.stats['requests']
+            print(f"✅ {len(urls)} URLs over {crawler.pool.opened} pooled connections")
+
+            again = LiveCrawler(concurrency=3, cache_dir=cache_dir)
+            results = again.run(urls[:-1])
+            assert again.stats['not_modified'] == len(pages)
+            assert all(r.from_cache and r.ok for r in results)
+            assert results[5].text == "<html><body>page5.html</body></html>"
+            print("✅ Second crawl revalidated every page with a 304")
+        finally:
+            server.shutdown()
+            server.server_close()
+
+if __name__ == "__main__":
+    test_live_crawler()
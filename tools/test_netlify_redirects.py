@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Test Netlify Redirect Table
+
+This script compiles the real netlify.toml and a small hand-written table and
+checks first-match lookup, splats, chains, loops and chain collapsing.
+"""
+
+import time
+
+from netlify_redirects import RedirectRule, RedirectTable, load_redirect_table
+
+def linear_match(rules, path):
+    """Reference first-match scan over the rule list."""
+    key = path.rstrip('/') or '/'
+    for rule in rules:
+        pattern = rule.source.rstrip('/') or '/'
+        if '*' in pattern:
+            before, _, after = pattern.partition('*')
+            if key.startswith(before) and key.endswith(after) and len(key) >= len(before) + len(after):
+                return rule, rule.target.replace(':splat', key[len(before):len(key) - len(after)])
+        elif pattern == key:
+            return rule, rule.target
+    return None
+
+def test_netlify_redirects():
+    """Test the compiled matcher against a linear scan and the chain tools."""
+    print("=== TESTING NETLIFY REDIRECTS ===")
+
+    table = load_redirect_table(['netlify.toml'])
+    assert len(table) > 100
+    paths = [r.source for r in table.rules] + [
+        '/articles/anything.html', '/es/articulos/algo.html', '/articles/x/', '/nope/', '/',
+    ]
+    for path in paths:
+        assert table.match(path) == linear_match(table.rules, path), path
+    assert table.match('/articles/some-page.html')[1] == '/articles/some-page/'
+    print(f"✅ Compiled lookup agrees with a linear scan on {len(paths)} paths")
+
+    started = time.perf_counter()
+    for _ in range(20):
+        for path in paths:
+            table.match(path)
+    print(f"   {20 * len(paths)} lookups in {(time.perf_counter() - started) * 1000:.1f}ms")
+
+    rules = [
+        RedirectRule(0, "/a/", "/b/"),
+        RedirectRule(1, "/b/", "/c/", 302),
+        RedirectRule(2, "/x", "/y"),
+        RedirectRule(3, "/y", "/x"),
+        RedirectRule(4, "/a/", "/ignored/"),
+        RedirectRule(5, "/old/*", "/new/:splat", force=True),
+        RedirectRule(6, "/old/page", "/never/"),
+    ]
+    table = RedirectTable(rules)
+    assert table.match('/old/page') == (rules[5], '/new/page')
+    assert [(r.source, w.target) for r, w in table.shadowed] == [("/a/", "/b/")]
+    chains = {c['rule'].source: c for c in table.chains()}
+    assert chains['/a/']['hops'] == [("/a/", "/b/", 301), ("/b/", "/c/", 302)]
+    assert chains['/x']['loop'] and chains['/y']['loop']
+    print("✅ Splat precedence, shadowed rule, chain and loop detected")
+
+    collapsed = {r.source: (r.target, r.status) for r in table.collapsed()}
+    assert collapsed['/a/'] == ("/c/", 302)
+    assert '/x' not in collapsed and '/y' not in collapsed
+    assert collapsed['/old/*'] == ("/new/:splat", 301)
+    print("✅ Collapsed table points /a/ straight at /c/ and drops the loop")
+
+if __name__ == "__main__":
+    test_netlify_redirects()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test Precompression
+
+This script precompresses a throwaway site and checks the siblings, the
+unchanged-file skip, the per-type report and the local verification server.
+"""
+
+import os
+import gzip
+import tempfile
+from pathlib import Path
+
+from precompress import CACHE_PATH, precompress, savings_by_type, verify
+
+def test_precompress():
+    """Test sibling output, skipping and verification."""
+    print("=== TESTING PRECOMPRESSION ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'assets').mkdir()
+        html = '<html><body>' + '<p>Bolsos asequibles</p>' * 200 + '</body></html>'
+        (root / 'index.html').write_text(html, encoding='utf-8')
+        (root / 'assets' / 'styles.css').write_text('.card{color:red}\n' * 100, encoding='utf-8')
+        (root / 'search-index.json').write_text('[' + ','.join(['{"title":"Tote"}'] * 100) + ']', encoding='utf-8')
+        (root / 'sitemap.xml').write_text('<urlset>' + '<url><loc>/a/</loc></url>' * 50 + '</urlset>', encoding='utf-8')
+        (root / 'tiny.js').write_text('init();', encoding='utf-8')
+        (root / 'package.json').write_text('{"name": "site"}' + ' ' * 1000, encoding='utf-8')
+        # Incompressible: a sibling larger than the original is not written
+        (root / 'noise.txt').write_bytes(os.urandom(2048))
+
+        result = precompress(tmp, jobs=2)
+        files = result['files']
+        assert sorted(files) == ['assets/styles.css', 'index.html', 'noise.txt', 'search-index.json', 'sitemap.xml']
+        assert result['compressed'] == 5 and (root / CACHE_PATH).exists()
+        assert gzip.decompress((root / 'index.html.gz').read_bytes()).decode('utf-8') == html
+        assert files['noise.txt']['gz'] == 0 and not (root / 'noise.txt.gz').exists()
+        assert not (root / 'tiny.js.gz').exists() and not (root / 'package.json.gz').exists()
+        print("✅ Siblings written for HTML, CSS, JSON and XML; tiny files and package.json skipped")
+
+        report = savings_by_type(files)
+        assert list(report) == ['css', 'html', 'json', 'txt', 'xml']
+        assert report['html']['gz'] < report['html']['bytes'] / 10
+        print("✅ Savings reported per file type")
+
+        result = precompress(tmp)
+        assert result['compressed'] == 0 and result['skipped'] == 5
+        (root / 'sitemap.xml.gz').unlink()
+        (root / 'index.html').write_text(html.replace('Bolsos', 'Carteras'), encoding='utf-8')
+        result = precompress(tmp)
+        assert result['compressed'] == 2
+        print("✅ Unchanged files skipped; edited files and missing siblings recompressed")
+
+        assert verify(tmp, result['files']) == []
+        (root / 'sitemap.xml.gz').write_bytes(gzip.compress(b'<urlset></urlset>'))
+        failures = verify(tmp, result['files'])
+        assert len(failures) == 1 and failures[0].startswith('sitemap.xml (gzip)')
+        print("✅ Local server serves the siblings with Content-Encoding; stale siblings detected")
+
+if __name__ == "__main__":
+    test_precompress()
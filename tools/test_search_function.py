@@ -7,6 +7,9 @@ This script tests the search functionality to see why "Osprey" isn't being found
 
 import json
 import re
+import time
+
+from search_engine import build_inverted_index, search_items
 
 def test_search_function():
     """Test the search matching logic."""
@@ -98,6 +101,35 @@ def test_search_function():
         results = match(index, term)
         print(f"'{term}': {len(results)} results")
     
+    # Compare the linear scan with the precompiled inverted index
+    print("\n=== TESTING INVERTED INDEX ===")
+    try:
+        with open('search-inverted-index.json', 'r', encoding='utf-8') as f:
+            inverted = json.load(f)
+        print(f"✅ Loaded inverted index with {len(inverted['terms'])} terms")
+    except Exception as e:
+        print(f"⚠️  search-inverted-index.json not available ({e}), building in memory")
+        inverted = build_inverted_index(index)
+    
+    if inverted.get('count') != len(index):
+        print(f"⚠️  Inverted index is stale ({inverted.get('count')} items vs {len(index)}), building in memory")
+        inverted = build_inverted_index(index)
+    
+    for term in ["osprey", "osp", "backpack", "travel wallet", "hiking"]:
+        start = time.perf_counter()
+        scanned = match(index, term)
+        scan_ms = (time.perf_counter() - start) * 1000
+        
+        start = time.perf_counter()
+        indexed = search_items(index, inverted, term)
+        index_ms = (time.perf_counter() - start) * 1000
+        
+        # The index matches word prefixes; the scan also matches mid-word substrings
+        missing = [it for it in indexed if it not in scanned]
+        assert not missing, f"Inverted index returned non-matching items for '{term}'"
+        print(f"'{term}': scan {len(scanned)} results ({scan_ms:.2f} ms), "
+              f"index {len(indexed)} results ({index_ms:.2f} ms)")
+    
     print("\n=== SEARCH ANALYSIS COMPLETE ===")
 
 if __name__ == "__main__":
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test Search Ranking
+
+This script checks the BM25F scores precomputed by build_inverted_index() and
+the heap-based top-k ranking in search_engine.rank().
+"""
+
+from bench_search import scale_items, scan
+from search_engine import build_inverted_index, fold_accents, rank, rank_items, stem, tokenize
+
+ITEMS = [
+    {"title": "Travel Wallets", "url": "/a.html", "category": "Wallets", "tags": ["wallet"], "excerpt": "Slim wallets for travel."},
+    {"title": "Osprey Daylite Backpack", "url": "/b.html", "category": "Backpacks", "tags": ["osprey", "hiking"], "excerpt": "A light daypack."},
+    {"title": "Hiking Gear", "url": "/c.html", "category": "General", "tags": [], "excerpt": "Boots, poles and an Osprey backpack among many other things for long trail days."},
+    {"title": "Totes", "url": "/d.html", "category": "Tote Bags", "tags": ["tote"], "excerpt": "Everyday totes."},
+]
+
+def test_bm25f_scores():
+    """Test field weights, IDF and length normalisation."""
+    print("=== TESTING BM25F SCORES ===")
+    index = build_inverted_index(ITEMS)
+    assert index['version'] == 3 and index['terms']['osprey'] == [1, 2]
+    title_score, excerpt_score = index['scores']['osprey']
+    assert title_score > excerpt_score
+    print("✅ A term in title and tags outscores the same term deep in a long excerpt")
+    
+    # 'backpack' and 'osprey' are in the same items, the rarer 'daylite' scores higher
+    assert index['scores']['daylite'][0] > index['scores']['backpack'][0]
+    assert set(index['ranking']['fields']) == {'title', 'url', 'category', 'tags', 'excerpt'}
+    print("✅ Rarer terms weigh more (IDF)")
+
+def test_rank_top_k():
+    """Test query scoring, prefixes and top-k."""
+    print("=== TESTING TOP-K RANKING ===")
+    index = build_inverted_index(ITEMS)
+    assert [item['url'] for item in rank_items(ITEMS, index, 'osprey backpack')] == ['/b.html', '/c.html']
+    assert [item_id for item_id, _ in rank(index, 'hiking')] == [2, 1]
+    print("✅ Best match first (title beats tags); items matching any term are ranked")
+    
+    exact = dict(rank(index, 'wallet'))
+    prefix = dict(rank(index, 'wall'))
+    assert 0 < prefix[0] < exact[0]
+    assert rank(index, 'zzz') == [] and rank(index, '') == []
+    print("✅ Prefix-only matches score lower than exact terms")
+    
+    catalogue = scale_items(ITEMS, 40)
+    big = build_inverted_index(catalogue)
+    top = rank(big, 'osprey backpack', k=3)
+    assert len(top) == 3 and [score for _, score in top] == sorted((s for _, s in top), reverse=True)
+    assert [item_id for item_id, _ in top] == [item_id for item_id, _ in rank(big, 'osprey backpack', k=100)[:3]]
+    assert all('osprey' in item_text.lower() or 'backpack' in item_text.lower()
+               for item_text in (catalogue[i]['title'] + catalogue[i]['excerpt'] for i, _ in top))
+    assert len(scan(catalogue, 'osprey')) == 20
+    print("✅ Heap top-k returns the same head as the full ranking")
+
+def test_normalization():
+    """Test accent folding and plural stemming at index and query time."""
+    print("=== TESTING TERM NORMALISATION ===")
+    assert fold_accents('Día Pañales Versátiles') == 'dia panales versatiles'
+    assert tokenize('Mochilas para el Día') == ['mochila', 'para', 'el', 'dia']
+    assert [stem(t) for t in ('accessories', 'watches', 'glasses', 'opciones', 'carteras', 'totes')] == \
+        ['accessory', 'watch', 'glass', 'opcion', 'cartera', 'tote']
+    assert [stem(t) for t in ('dress', 'campus', 'bus', 'this', '2025s')] == ['dress', 'campus', 'bus', 'this', '2025s']
+    print("✅ Accents folded; English and Spanish plurals stemmed, singular -s words kept")
+
+    items = [
+        {"title": "Mochilas para el Día", "url": "/es/a.html", "category": "Mochilas", "tags": ["mochilas"], "excerpt": "Opciones versátiles."},
+        {"title": "Travel Wallet", "url": "/b.html", "category": "Wallets", "tags": ["wallet"], "excerpt": "Slim."},
+    ]
+    index = build_inverted_index(items)
+    assert 'mochila' in index['terms'] and 'mochilas' not in index['terms'] and 'dia' in index['terms']
+    for query in ('mochila dia', 'MOCHILAS DÍA', 'versatil', 'opción'):
+        assert [item_id for item_id, _ in rank(index, query)] == [0], query
+    assert rank(index, 'wallets') == rank(index, 'wallet')
+    print("✅ Unaccented and singular queries find accented plural text")
+
+if __name__ == "__main__":
+    test_bm25f_scores()
+    test_rank_top_k()
+    test_normalization()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test Search Shards
+
+This script checks the per-language and per-category shards written by
+build_search_index.write_shards(), and the per-language article modules loaded
+by assets/script.js.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+
+from build_search_index import extract_article_data, write_article_modules, write_shards
+
+ITEMS = [
+    {"title": "Osprey Daylite", "url": "/articles/backpacks.html", "category": "Backpacks", "tags": ["osprey"], "date": "2025-10-01", "excerpt": ""},
+    {"title": "Coach Wristlet", "url": "/articles/wallets.html", "category": "Wallets", "tags": ["coach"], "date": "2025-09-01", "excerpt": ""},
+    {"title": "Mochilas", "url": "/es/articulos/mochilas.html", "category": "General", "tags": [], "date": "2025-08-01", "excerpt": ""},
+]
+
+def test_search_shards():
+    """Test shard layout, manifest and stale shard cleanup."""
+    print("=== TESTING SEARCH SHARDS ===")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        open(os.path.join(tmp, 'en.handbags.json'), 'w').write('{}')
+        
+        manifest = write_shards(ITEMS, out_dir=tmp, compress=True)
+        print(f"Shards: {sorted(manifest['shards'])}")
+        assert sorted(manifest['shards']) == ['en', 'en/backpacks', 'en/wallets', 'es', 'es/general']
+        assert manifest['shards']['en']['count'] == 2 and manifest['index']['count'] == 3
+        assert not os.path.exists(os.path.join(tmp, 'en.handbags.json'))
+        print("✅ Shards split by language and category, old unhashed shards removed")
+        
+        entry = manifest['shards']['es']
+        with open(os.path.join(tmp, entry['file']), encoding='utf-8') as f:
+            raw = f.read()
+        shard = json.loads(raw)
+        assert entry['file'] == f"data/es.{entry['hash']}.json"
+        assert entry['hash'] == hashlib.sha1(raw.encode('utf-8')).hexdigest()[:8]
+        assert '\n' not in raw and ': ' not in raw
+        assert [it['title'] for it in shard['items']] == ['Mochilas']
+        assert shard['index']['terms']['mochila'] == [0]
+        print("✅ Shards are minified, content-hashed and carry their own inverted index")
+        
+        with gzip.open(os.path.join(tmp, entry['file'] + '.gz'), 'rt', encoding='utf-8') as f:
+            assert f.read() == raw
+        print("✅ Precompressed .gz siblings match")
+        
+        first = manifest
+        second = write_shards(ITEMS[:2], out_dir=tmp)
+        third = write_shards(ITEMS[:1], out_dir=tmp)
+        assert os.path.exists(os.path.join(tmp, second['index']['file']))
+        assert not os.path.exists(os.path.join(tmp, first['index']['file']))
+        assert not os.path.exists(os.path.join(tmp, first['shards']['es']['file'] + '.gz'))
+        assert third['shards']['en']['file'] != first['shards']['en']['file']
+        print("✅ Files of the previous build are kept, older ones removed")
+
+ARTICLE = """<html><head><title>3 RFID Wallets 2025 | Bags &amp; Fashion</title>
+<meta name="description" content="Slim wallets.">
+<meta property="og:type" content="article">
+<meta property="og:image" content="https://affordable-handbags.com/photos/Slim Wallet.jpg">
+<script type="application/ld+json">{"datePublished": "2025-01-30"}</script>
+</head><body><span class="article-category">Wallets</span></body></html>"""
+
+def test_article_modules():
+    """Test the per-language article cards."""
+    print("=== TESTING ARTICLE MODULES ===")
+    
+    item = extract_article_data('articles/3-rfid-wallets-2025.html', ARTICLE)
+    assert item['category'] == 'Wallets' and item['date'] == '2025-01-30'
+    assert item['image'] == '/photos/Slim%20Wallet.jpg'
+    spanish = dict(item, url='/es/articulos/3-carteras-rfid-2025.html', category='Carteras')
+    duplicate = dict(item, url='/articles/3-rfid-wallets-2025/index.html')
+    print("✅ Article pages carry their lead image, publish date and category badge")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        entries = write_article_modules([item, duplicate, spanish] + ITEMS, out_dir=tmp)
+        assert {lang: entry['count'] for lang, entry in entries.items()} == {'en': 1, 'es': 1}
+        assert entries['en']['file'] == f"data/articles.en.{entries['en']['hash']}.json"
+        with open(os.path.join(tmp, entries['en']['file']), encoding='utf-8') as f:
+            module = json.load(f)
+        cards = module['items']
+        assert module['index']['count'] == 1 and module['index']['terms']['rfid'] == [0]
+        assert cards == [{
+            "title": "3 RFID Wallets 2025", "description": "Slim wallets.", "category": "Wallets",
+            "url": "/articles/3-rfid-wallets-2025.html", "image": "/photos/Slim%20Wallet.jpg",
+            "date": "January 30, 2025", "tags": item['tags'],
+        }]
+        with open(os.path.join(tmp, entries['es']['file']), encoding='utf-8') as f:
+            assert json.load(f)['items'][0]['date'] == '30 Enero 2025'
+        print("✅ One card per article and language; pages without a lead image left out")
+        
+        manifest = write_shards([item, spanish] + ITEMS, out_dir=tmp)
+        assert manifest['articles'] == entries
+        manifest = write_shards([item] + ITEMS, out_dir=tmp)
+        assert manifest['articles']['es']['count'] == 0
+        assert os.path.exists(os.path.join(tmp, entries['es']['file']))
+        print("✅ Article modules are listed in the shards manifest and kept for one more build")
+
+if __name__ == "__main__":
+    test_search_shards()
+    test_article_modules()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Sitemap Parser
+
+This script streams the real sitemap and a throwaway sitemap index with two
+child sitemaps, and checks the URLs come out in document order.
+"""
+
+import re
+import tempfile
+from pathlib import Path
+
+from sitemap_parser import iter_sitemap_urls
+
+URLSET = """<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+{}
+</urlset>
+"""
+
+INDEX = """<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://affordable-handbags.com/sitemap-en.xml</loc></sitemap>
+  <sitemap><loc>https://affordable-handbags.com/sitemaps/sitemap-es.xml</loc></sitemap>
+  <sitemap><loc>https://affordable-handbags.com/sitemap-index.xml</loc></sitemap>
+</sitemapindex>
+"""
+
+def urlset(urls):
+    return URLSET.format("\n".join(f"<url><loc>{url}</loc><priority>0.5</priority></url>" for url in urls))
+
+def test_sitemap_parser():
+    """Test plain sitemaps and sitemap index files."""
+    print("=== TESTING SITEMAP PARSER ===")
+
+    with open('sitemap.xml', 'r', encoding='utf-8') as f:
+        expected = re.findall(r'<loc>([^<]+)</loc>', f.read())
+    assert list(iter_sitemap_urls('sitemap.xml')) == expected
+    print(f"✅ sitemap.xml streamed: {len(expected)} URLs")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        en = [f"https://affordable-handbags.com/articles/page-{i}/" for i in range(5000)]
+        es = [f"https://affordable-handbags.com/es/articulos/pagina-{i}/" for i in range(3)]
+        (root / 'sitemap-en.xml').write_text(urlset(en), encoding='utf-8')
+        (root / 'sitemaps').mkdir()
+        (root / 'sitemaps' / 'sitemap-es.xml').write_text(urlset(es), encoding='utf-8')
+        (root / 'sitemap-index.xml').write_text(INDEX, encoding='utf-8')
+
+        assert list(iter_sitemap_urls(root / 'sitemap-index.xml')) == en + es
+        print("✅ Sitemap index followed (self-reference ignored)")
+
+if __name__ == "__main__":
+    test_sitemap_parser()
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Unused CSS / JS Report
+
+This script builds a throwaway site with a stylesheet and a script, and checks
+the JavaScript block splitter, per-template liveness and the emitted bundles.
+"""
+
+import tempfile
+from pathlib import Path
+
+from unused_assets import UsageReport, emit_bundles, mask_js, split_js_blocks
+
+CSS = """.nav { color: red; }
+.pager { display: flex; }
+.pager .page-btn.active { font-weight: bold; }
+.legacy-widget { display: none; }
+.fade { animation: fadeIn 1s; }
+@keyframes fadeIn { to { opacity: 1; } }
+@keyframes unusedSpin { to { transform: rotate(1turn); } }
+"""
+
+SCRIPT = """// ===== STARTUP =====
+document.addEventListener('DOMContentLoaded', function() {
+    initMenu();
+    setTimeout(initPagination, 100);
+});
+
+// ===== MENU =====
+function initMenu() {
+    const nav = document.querySelector('.nav');
+    if (nav) { nav.dataset.ready = `yes ${'}'}`; }
+}
+
+// ===== PAGINATION =====
+const perPage = 10;
+
+function initPagination() {
+    const cards = document.querySelectorAll('.card');
+    renderPager(Math.ceil(cards.length / perPage)); /* not a /regex/ */
+}
+
+function renderPager(pages) {
+    const pager = document.createElement('div');
+    pager.className = 'pager';
+    pager.innerHTML = '<button class="page-btn active">1</button>';
+}
+"""
+
+def page(body):
+    return ('<html><head><link rel="stylesheet" href="/assets/styles.css"></head><body>'
+            f'{body}<script src="/assets/script.js"></script></body></html>')
+
+def test_split_js_blocks():
+    """Test masking and top-level block splitting."""
+    print("=== TESTING SCRIPT BLOCKS ===")
+    masked, strings = mask_js(SCRIPT)
+    assert len(masked) == len(SCRIPT) and 'regex' not in masked and "'}'" not in masked
+    assert '<button class="page-btn active">1</button>' in strings
+    blocks = split_js_blocks(SCRIPT)
+    assert [(b.kind, b.name) for b in blocks] == [
+        ('statement', None), ('function', 'initMenu'), ('binding', 'perPage'),
+        ('function', 'initPagination'), ('function', 'renderPager'),
+    ]
+    assert blocks[1].section == 'MENU' and blocks[1].queries == ['.nav']
+    assert ''.join(b.text for b in blocks) == SCRIPT.rstrip('\n')
+    print("✅ Strings, template literals and comments masked; 5 top-level blocks found")
+
+def test_usage_report():
+    """Test per-template usage and bundles."""
+    print("=== TESTING USAGE REPORT ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'assets').mkdir()
+        (root / 'assets' / 'styles.css').write_text(CSS, encoding='utf-8')
+        (root / 'assets' / 'script.js').write_text(SCRIPT, encoding='utf-8')
+        (root / 'articles' / 'a').mkdir(parents=True)
+        (root / 'index.html').write_text(page('<nav class="nav fade"></nav>'), encoding='utf-8')
+        (root / 'articles' / 'a' / 'index.html').write_text(
+            page('<nav class="nav"></nav><div class="card"></div>'), encoding='utf-8')
+
+        report = UsageReport(tmp)
+        summary = report.summary()
+        home, article = summary['home'], summary['article']
+        assert home['js']['dead'] == ['perPage (line 14)', 'initPagination (line 16)', 'renderPager (line 21)']
+        assert article['js']['dead'] == []
+        print("✅ Pagination is dead on the home page and live on articles")
+
+        assert '.pager' not in ' '.join(report.rule_label(i) for i in report.templates['home']['used_rules'])
+        assert article['css']['dead'] == ['.legacy-widget', '.fade', '@keyframes fadeIn', '@keyframes unusedSpin']
+        dead_css, dead_js = report.dead_everywhere()
+        assert [report.rule_label(i) for i in dead_css] == ['.legacy-widget', '@keyframes unusedSpin']
+        assert dead_js == []
+        print("✅ Classes added by live script count as used; dead rules and keyframes reported")
+
+        written = emit_bundles(report, str(root / 'bundles'))
+        assert len(written) == 4
+        home_js = (root / 'bundles' / 'script.home.js').read_text(encoding='utf-8')
+        assert 'initMenu();' in home_js and 'initPagination' not in home_js and 'perPage' not in home_js
+        home_css = (root / 'bundles' / 'styles.home.css').read_text(encoding='utf-8')
+        assert home_css == '.nav{color: red;}.fade{animation: fadeIn 1s;}@keyframes fadeIn{to { opacity: 1; }}'
+        article_js = (root / 'bundles' / 'script.article.js').read_text(encoding='utf-8')
+        assert article_js == SCRIPT
+        print("✅ Per-template bundles keep only live rules and blocks")
+
+SEARCH_SCRIPT = """document.addEventListener('DOMContentLoaded', function() {
+    initMenu();
+});
+
+function initMenu() {
+    document.querySelector('.nav');
+}
+
+function searchTokens(text) {
+    return text.toLowerCase().split(' ');
+}
+
+function rankSearch(index, query) {
+    return searchTokens(query).map(term => index[term]);
+}
+"""
+
+def test_inline_script_roots():
+    """Test that script.js functions called from inline page scripts stay live."""
+    print("=== TESTING INLINE SCRIPT ROOTS ===")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / 'assets').mkdir()
+        (root / 'search').mkdir()
+        (root / 'assets' / 'styles.css').write_text(CSS, encoding='utf-8')
+        (root / 'assets' / 'script.js').write_text(SEARCH_SCRIPT, encoding='utf-8')
+        (root / 'index.html').write_text(page('<nav class="nav"></nav>'), encoding='utf-8')
+        (root / 'search' / 'index.html').write_text(page(
+            '<nav class="nav"></nav><script>'
+            "const hits = typeof rankSearch === 'function' ? rankSearch({}, 'tote') : [];"
+            '</script>'), encoding='utf-8')
+
+        summary = UsageReport(tmp).summary()
+        assert summary['search']['js']['dead'] == []
+        assert summary['home']['js']['dead'] == ['searchTokens (line 9)', 'rankSearch (line 13)']
+        print("✅ Functions called from an inline script (and what they call) are live on that template")
+
+if __name__ == "__main__":
+    test_split_js_blocks()
+    test_usage_report()
+    test_inline_script_roots()
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Unused CSS / JS Report
+
+assets/styles.css and assets/script.js ship to every page whether or not the
+page has search, pagination, filters or the quiz. This report finds what each
+page template actually uses:
+1. Every page is parsed once (tools/css_tools.py) into a usage index of its
+   tags, ids and classes
+2. script.js is split into top-level blocks (functions, bindings, statements).
+   A feature (a function called from a top-level statement, e.g. initSearch...)
+   is live on a page when one of the selectors it queries
+   (querySelector, getElementById, ...) exists there, or when it queries
+   nothing. Names of script.js used by a page's inline <script> blocks or
+   its other scripts are live there; everything reachable from live code is
+   live too
+3. A CSS rule is used when one of its selectors matches the page, or when its
+   classes/ids only appear through JavaScript the page runs (classList.add,
+   innerHTML templates, ...)
+Results are aggregated per template (home, article, category, quiz, search,
+page). With --emit, per-template bundles (styles.<template>.css and
+script.<template>.js) are written with only the live rules and blocks.
+
+Usage:
+    python3 tools/unused_assets.py [--template NAME] [--json] [--emit [DIR]]
+"""
+
+import os
+import re
+import json
+import argparse
+from pathlib import Path
+from typing import Dict, List, Set
+
+from css_tools import Document, TEMPLATES, page_template, parse_selector, parse_stylesheet, serialize
+from fingerprint_assets import source_path
+from html_corpus import get_corpus
+from link_graph import site_path
+
+STYLESHEET = 'assets/styles.css'
+SCRIPT = 'assets/script.js'
+BUNDLE_DIR = 'assets/bundles'
+
+# Keywords after which a '/' starts a regular expression literal
+JS_REGEX_KEYWORDS = {'return', 'typeof', 'instanceof', 'in', 'of', 'new', 'delete', 'void', 'throw',
+                     'case', 'do', 'else', 'yield', 'await'}
+JS_REGEX_PRECEDERS = set('(,=:[!&|?{};+-*%<>~^')
+
+RE_IDENTIFIER = re.compile(r'[A-Za-z_$][\w$]*')
+RE_JS_QUERY = re.compile(r'\b(querySelector(?:All)?|closest|matches|getElementById|getElementsByClassName)'
+                         r'\(\s*([\'"])((?:(?!\2).)+)\2')
+RE_JS_DECLARATION = re.compile(r'^(?:async\s+)?function\s*\*?\s*([A-Za-z_$][\w$]*)|^class\s+([A-Za-z_$][\w$]*)')
+RE_JS_BINDING = re.compile(r'^(?:const|let|var)\s+([A-Za-z_$][\w$]*)\s*=')
+RE_JS_SECTION = re.compile(r'^//\s*=+\s*(.+?)\s*=+\s*$', re.MULTILINE)
+RE_TOKEN = re.compile(r'-?[_a-zA-Z][\w-]*')
+
+
+# JavaScript blocks
+
+def mask_js(source: str):
+    """Source with comments, string/template text and regex bodies blanked (same offsets),
+    plus the list of string contents."""
+    out = list(source)
+    strings: List[str] = []
+    n = len(source)
+    templates: List[int] = []  # brace depth at each open ${
+    depth = 0
+    last = ''
+    i = 0
+
+    def blank(a, b):
+        for k in range(a, min(b, n)):
+            if out[k] != '\n':
+                out[k] = ' '
+
+    while i < n:
+        c = source[i]
+        nxt = source[i + 1:i + 2]
+        if c == '/' and nxt == '/':
+            j = source.find('\n', i)
+            j = n if j < 0 else j
+            blank(i, j)
+            i = j
+            continue
+        if c == '/' and nxt == '*':
+            j = source.find('*/', i + 2)
+            j = n if j < 0 else j + 2
+            blank(i, j)
+            i = j
+            continue
+        if c in '"\'':
+            j = i + 1
+            while j < n and source[j] != c and source[j] != '\n':
+                j += 2 if source[j] == '\\' else 1
+            strings.append(source[i + 1:j])
+            blank(i + 1, j)
+            i, last = j + 1, 'a'
+            continue
+        if c == '`' or (c == '}' and templates and templates[-1] == depth):
+            if c == '}':
+                templates.pop()
+            j = start = i + 1
+            while j < n and source[j] != '`' and not (source[j] == '$' and source[j + 1:j + 2] == '{'):
+                j += 2 if source[j] == '\\' else 1
+            strings.append(source[start:j])
+            blank(start, j)
+            if j < n and source[j] == '$':
+                templates.append(depth)
+                i, last = j + 2, '('
+            else:
+                i, last = j + 1, 'a'
+            continue
+        if c == '/' and (last == '' or last in JS_REGEX_PRECEDERS):
+            j, in_class = i + 1, False
+            while j < n and source[j] != '\n':
+                ch = source[j]
+                if ch == '\\':
+                    j += 2
+                    continue
+                if ch == '[':
+                    in_class = True
+                elif ch == ']':
+                    in_class = False
+                elif ch == '/' and not in_class:
+                    break
+                j += 1
+            blank(i + 1, j)
+            j += 1
+            while j < n and source[j].isalpha():
+                j += 1
+            i, last = j, 'a'
+            continue
+        if c.isalnum() or c in '_$':
+            m = RE_IDENTIFIER.match(source, i) if not c.isdigit() else None
+            j = m.end() if m else i + 1
+            if m:
+                last = '(' if m.group(0) in JS_REGEX_KEYWORDS else 'a'
+            else:
+                while j < n and (source[j].isalnum() or source[j] == '.'):
+                    j += 1
+                last = 'a'
+            i = j
+            continue
+        if c == '{':
+            depth += 1
+        elif c == '}':
+            depth -= 1
+        if not c.isspace():
+            last = c
+        i += 1
+    return ''.join(out), strings
+
+
+class JsBlock:
+    """A top-level function, binding or statement of a script."""
+
+    def __init__(self, source: str, masked: str, start: int, end: int, text_start: int, section: str):
+        self.code = masked[start:end]
+        self.text = source[text_start:end]
+        self.line = source.count('\n', 0, start) + 1
+        self.section = section
+        declaration = RE_JS_DECLARATION.match(self.code)
+        binding = RE_JS_BINDING.match(self.code)
+        if declaration:
+            self.kind, self.name = 'function', declaration.group(1) or declaration.group(2)
+        elif binding:
+            self.kind, self.name = 'binding', binding.group(1)
+        else:
+            self.kind, self.name = 'statement', None
+        self.identifiers = set(RE_IDENTIFIER.findall(self.code)) - {self.name}
+        self.queries = [('#' + m.group(3)) if m.group(1) == 'getElementById'
+                        else ('.' + m.group(3)) if m.group(1) == 'getElementsByClassName'
+                        else m.group(3)
+                        for m in RE_JS_QUERY.finditer(self.text)]
+        self.strings = mask_js(self.text)[1]
+
+    def __repr__(self) -> str:
+        return f"JsBlock({self.kind} {self.name or self.code[:40]!r}, line {self.line})"
+
+    @property
+    def label(self) -> str:
+        return self.name or ' '.join(self.code.split())[:50]
+
+
+def split_js_blocks(source: str) -> List[JsBlock]:
+    """Top-level blocks of a script, in order; each block's text includes its leading comments."""
+    masked, _ = mask_js(source)
+    sections = [(m.start(), m.group(1)) for m in RE_JS_SECTION.finditer(source)]
+    blocks: List[JsBlock] = []
+    depth, start, prev_end = 0, None, 0
+    for i, c in enumerate(masked):
+        if start is None:
+            if c.isspace():
+                continue
+            start = i
+        if c in '{([':
+            depth += 1
+        elif c in '})]':
+            depth -= 1
+        if depth != 0:
+            continue
+        ends_declaration = c == '}' and RE_JS_DECLARATION.match(masked[start:i + 1])
+        if c == ';' or ends_declaration:
+            section = next((name for pos, name in reversed(sections) if pos < start), '')
+            blocks.append(JsBlock(source, masked, start, i + 1, prev_end, section))
+            start, prev_end = None, i + 1
+    if start is not None and masked[start:].strip():
+        section = next((name for pos, name in reversed(sections) if pos < start), '')
+        blocks.append(JsBlock(source, masked, start, len(source), prev_end, section))
+    return blocks
+
+
+def call_lines(name: str) -> re.Pattern:
+    """Lines that only call name (directly or via setTimeout) and can be dropped with it."""
+    return re.compile(rf'^[ \t]*(?:{re.escape(name)}\(\)|setTimeout\({re.escape(name)},\s*\d+\));[^\S\n]*\n?',
+                      re.MULTILINE)
+
+
+class ScriptModel:
+    """Blocks of a script with the reference graph between them."""
+
+    def __init__(self, source: str):
+        self.source = source
+        self.blocks = split_js_blocks(source)
+        self.by_name = {b.name: b for b in self.blocks if b.name}
+        for block in self.blocks:
+            block.refs = {name for name in block.identifiers if name in self.by_name}
+        # Features: functions started from top-level statements
+        self.features = {name for b in self.blocks if b.kind == 'statement' for name in b.refs
+                         if self.by_name[name].kind == 'function'}
+
+    def feature_active(self, name: str, doc: Document) -> bool:
+        queries = self.by_name[name].queries
+        return not queries or any(doc.uses(q) for q in queries)
+
+    def live_blocks(self, docs: List[Document], page_scripts: List[str] = ()) -> Set[int]:
+        """Indexes of blocks that run on any of the pages.
+        
+        page_scripts are the pages' other JavaScript (inline blocks, other files);
+        the functions and bindings of this script they name are roots as well.
+        """
+        active = {name for name in self.features if any(self.feature_active(name, doc) for doc in docs)}
+        live: Set[int] = set()
+        todo = [i for i, b in enumerate(self.blocks) if b.kind == 'statement']
+        for text in page_scripts:
+            names = set(RE_IDENTIFIER.findall(mask_js(text)[0])) & set(self.by_name)
+            todo += [self.blocks.index(self.by_name[name]) for name in names]
+        while todo:
+            i = todo.pop()
+            if i in live:
+                continue
+            live.add(i)
+            block = self.blocks[i]
+            for name in block.refs:
+                if block.kind == 'statement' and name in self.features and name not in active:
+                    # Dropping the feature drops its call lines; keep it if it is used otherwise
+                    mentions = len(re.findall(rf'(?<![\w$.]){re.escape(name)}\b', block.code))
+                    if len(call_lines(name).findall(block.text)) >= mentions:
+                        continue
+                todo.append(self.blocks.index(self.by_name[name]))
+        return live
+
+    def bundle(self, live: Set[int]) -> str:
+        """Script with only the live blocks; calls to dropped features are removed."""
+        dropped = [b.name for i, b in enumerate(self.blocks) if i not in live and b.name in self.features]
+        parts = []
+        for i, block in enumerate(self.blocks):
+            if i not in live:
+                continue
+            text = block.text
+            if block.kind == 'statement':
+                for name in dropped:
+                    text = call_lines(name).sub('', text)
+            parts.append(text)
+        return ''.join(parts).lstrip('\n') + '\n'
+
+
+# Usage analysis
+
+def page_assets(doc: Document, page_url: str) -> Set[str]:
+    """Site paths of the stylesheets and scripts a page loads (fingerprints removed)."""
+    assets = set()
+    for link in doc.by_tag.get('link', []):
+        if 'stylesheet' in link.attrs.get('rel', '').lower() and link.attrs.get('href'):
+            assets.add(site_path(page_url, link.attrs['href']))
+    for script in doc.by_tag.get('script', []):
+        if script.attrs.get('src'):
+            assets.add(site_path(page_url, script.attrs['src']))
+    return {source_path(a) for a in assets if a}
+
+
+def string_tokens(strings) -> Set[str]:
+    """Class/id-like tokens of JavaScript strings (classList.add('x'), class="a b", ...)."""
+    return {t for s in strings for t in RE_TOKEN.findall(s)}
+
+
+def selector_names(parts) -> Set[str]:
+    return {name for _, compound in parts for name in (compound.classes | ({compound.id} if compound.id else set()))}
+
+
+def rule_used(rule, doc: Document, dom_names: Set[str], js_names: Set[str]) -> bool:
+    for selector in rule.selectors:
+        if doc.uses(selector):
+            return True
+        parts = parse_selector(selector)
+        names = selector_names(parts) if parts else set()
+        if names and names & js_names and names <= dom_names | js_names:
+            return True
+    return False
+
+
+class UsageReport:
+    """Per-template CSS rule and script block usage across the site."""
+
+    def __init__(self, root: str = "."):
+        root_path = Path(root)
+        self.css_text = (root_path / STYLESHEET).read_text(encoding='utf-8')
+        self.js_text = (root_path / SCRIPT).read_text(encoding='utf-8')
+        self.rules = parse_stylesheet(self.css_text)
+        self.script = ScriptModel(self.js_text)
+        self.templates: Dict[str, dict] = {}
+        # Usage index: class/id/tag -> pages using it
+        self.index: Dict[str, Set[str]] = {}
+
+        pages: Dict[str, list] = {name: [] for name in TEMPLATES}
+        for page in get_corpus(root):
+            doc = Document(page.lenient_text)
+            key = page.path.as_posix()
+            for name in list(doc.by_class) + ['#' + i for i in doc.by_id] + list(doc.by_tag):
+                self.index.setdefault(name, set()).add(key)
+            assets = page_assets(doc, page.url)
+            inline = re.findall(r'<script\b[^>]*>(.*?)</script>', page.lenient_text, re.DOTALL | re.IGNORECASE)
+            extra = []
+            for path in assets - {'/' + STYLESHEET, '/' + SCRIPT}:
+                local = root_path / path.lstrip('/')
+                if path.endswith('.js') and local.is_file():
+                    extra.append(local.read_text(encoding='utf-8', errors='replace'))
+            pages[page_template(key)].append({
+                'path': key, 'doc': doc, 'assets': assets, 'inline_js': inline, 'extra_js': extra,
+            })
+
+        for name, entries in pages.items():
+            css_pages = [e for e in entries if '/' + STYLESHEET in e['assets']]
+            js_pages = [e for e in entries if '/' + SCRIPT in e['assets']]
+            if not css_pages and not js_pages:
+                continue
+            live = self.script.live_blocks(
+                [e['doc'] for e in js_pages], [text for e in js_pages for text in e['inline_js'] + e['extra_js']]
+            ) if js_pages else set()
+            used = self.used_rules(css_pages, live)
+            self.templates[name] = {
+                'pages': [e['path'] for e in entries],
+                'css_pages': len(css_pages), 'js_pages': len(js_pages),
+                'used_rules': used, 'live_blocks': live,
+            }
+
+    def used_rules(self, entries, live: Set[int]) -> Set[int]:
+        live_strings = [s for i in live for s in self.script.blocks[i].strings]
+        used: Set[int] = set()
+        for entry in entries:
+            doc = entry['doc']
+            js_names = string_tokens(live_strings if '/' + SCRIPT in entry['assets'] else [])
+            for text in entry['inline_js'] + entry['extra_js']:
+                js_names |= string_tokens(mask_js(text)[1])
+            dom_names = set(doc.by_class) | set(doc.by_id)
+            for i, rule in enumerate(self.rules):
+                if i not in used and not rule.at and rule_used(rule, doc, dom_names, js_names):
+                    used.add(i)
+
+        # At-rules: @keyframes only if some used rule (or script) names the animation
+        used_text = ' '.join(self.rules[i].body or '' for i in used) + ' '.join(live_strings)
+        for i, rule in enumerate(self.rules):
+            if rule.at:
+                words = rule.at.split()
+                if not words[0].lower().endswith('keyframes') or (len(words) > 1 and words[1] in used_text):
+                    used.add(i)
+        return used
+
+    def css_bundle(self, template: str) -> str:
+        used = self.templates[template]['used_rules']
+        return serialize(rule for i, rule in enumerate(self.rules) if i in used)
+
+    def js_bundle(self, template: str) -> str:
+        return self.script.bundle(self.templates[template]['live_blocks'])
+
+    def summary(self) -> dict:
+        css_size = len(serialize(self.rules))
+        js_size = len(self.js_text)
+        result = {}
+        for name, t in self.templates.items():
+            dead_rules = [i for i in range(len(self.rules)) if i not in t['used_rules']]
+            dead_blocks = [i for i in range(len(self.script.blocks)) if i not in t['live_blocks']]
+            result[name] = {
+                'pages': len(t['pages']),
+                'css': {'used': len(t['used_rules']), 'total': len(self.rules),
+                        'bytes': len(self.css_bundle(name)), 'full_bytes': css_size,
+                        'dead': [self.rule_label(i) for i in dead_rules]} if t['css_pages'] else None,
+                'js': {'live': len(t['live_blocks']), 'total': len(self.script.blocks),
+                       'bytes': len(self.js_bundle(name)), 'full_bytes': js_size,
+                       'dead': [self.block_label(i) for i in dead_blocks]} if t['js_pages'] else None,
+            }
+        return result
+
+    def dead_everywhere(self):
+        rules = set(range(len(self.rules)))
+        blocks = set(range(len(self.script.blocks)))
+        for t in self.templates.values():
+            if t['css_pages']:
+                rules -= t['used_rules']
+            if t['js_pages']:
+                blocks -= t['live_blocks']
+        return sorted(rules), sorted(blocks)
+
+    def rule_label(self, i: int) -> str:
+        rule = self.rules[i]
+        label = rule.at or ', '.join(rule.selectors)
+        return f"{' '.join(rule.media)} {{ {label} }}" if rule.media else label
+
+    def block_label(self, i: int) -> str:
+        block = self.script.blocks[i]
+        return f"{block.label} (line {block.line})"
+
+
+def emit_bundles(report: UsageReport, out_dir: str) -> List[str]:
+    os.makedirs(out_dir, exist_ok=True)
+    written = []
+    for name, t in report.templates.items():
+        if t['css_pages']:
+            path = os.path.join(out_dir, f"styles.{name}.css")
+            Path(path).write_text(report.css_bundle(name), encoding='utf-8')
+            written.append(path)
+        if t['js_pages']:
+            path = os.path.join(out_dir, f"script.{name}.js")
+            Path(path).write_text(report.js_bundle(name), encoding='utf-8')
+            written.append(path)
+    return written
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Report unused CSS rules and script.js blocks per page template")
+    parser.add_argument('--template', choices=TEMPLATES, help='List the dead rules and blocks of one template')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--emit', nargs='?', const=BUNDLE_DIR, help=f'Write per-template bundles (default: {BUNDLE_DIR})')
+    args = parser.parse_args()
+
+    report = UsageReport()
+    summary = report.summary()
+    dead_rules, dead_blocks = report.dead_everywhere()
+
+    if args.json:
+        print(json.dumps({
+            'templates': summary,
+            'dead_everywhere': {'css': [report.rule_label(i) for i in dead_rules],
+                                'js': [report.block_label(i) for i in dead_blocks]},
+        }, indent=2, ensure_ascii=False))
+    else:
+        print("=== UNUSED CSS / JS REPORT ===")
+        print(f"{STYLESHEET}: {len(report.rules)} rules | {SCRIPT}: {len(report.script.blocks)} top-level blocks")
+        print(f"Usage index: {len(report.index)} tags/ids/classes across "
+              f"{sum(len(t['pages']) for t in report.templates.values())} pages\n")
+        for name, data in summary.items():
+            print(f"📄 {name} ({data['pages']} pages)")
+            if data['css']:
+                css = data['css']
+                print(f"   CSS: {css['used']}/{css['total']} rules used, {css['bytes']:,} of {css['full_bytes']:,} bytes")
+            if data['js']:
+                js = data['js']
+                print(f"   JS:  {js['live']}/{js['total']} blocks live, {js['bytes']:,} of {js['full_bytes']:,} bytes")
+                features = sorted(b.split(' ')[0] for b in js['dead'] if b.split(' ')[0] in report.script.features)
+                if features:
+                    print(f"        dead features: {', '.join(features)}")
+            if args.template == name:
+                for label in (data['css'] or {}).get('dead', []):
+                    print(f"   ✂️  css {label}")
+                for label in (data['js'] or {}).get('dead', []):
+                    print(f"   ✂️  js  {label}")
+
+        print(f"\n🗑️  Dead on every page: {len(dead_rules)} CSS rules, {len(dead_blocks)} script blocks")
+        for i in dead_blocks:
+            print(f"   js  {report.block_label(i)}")
+        for i in dead_rules[:None if args.template else 20]:
+            print(f"   css {report.rule_label(i)}")
+        if len(dead_rules) > 20 and not args.template:
+            print(f"   ... {len(dead_rules) - 20} more (use --template or --json)")
+
+    if args.emit:
+        for path in emit_bundles(report, args.emit):
+            print(f"✅ Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
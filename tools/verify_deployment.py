@@ -9,65 +9,40 @@ Usage:
     python3 tools/verify_deployment.py
 """
 
-import os
-import re
 from pathlib import Path
 
-def verify_file(file_path: Path) -> dict:
+from gtm_compliance import check_site, count_signals, is_clean
+
+def verify_file(file_path: Path, content: str = None) -> dict:
     """Verify a single HTML file for clean GTM implementation."""
-    try:
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            content = f.read()
-    except Exception as e:
-        return {"error": str(e)}
-    
-    # Check for GTM script
-    gtm_script_count = len(re.findall(r'googletagmanager\.com/gtm\.js', content, re.IGNORECASE))
-    
-    # Check for GTM noscript
-    gtm_noscript_count = len(re.findall(r'googletagmanager\.com/ns\.html', content, re.IGNORECASE))
-    
-    # Check for gtag (should be 0)
-    gtag_count = len(re.findall(r'gtag\(', content, re.IGNORECASE))
-    
-    # Check for GA4 ID (should be 0)
-    ga4_id_count = len(re.findall(r'G-H1Q1KL01RP', content))
+    if content is None:
+        try:
+            with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
+                content = f.read()
+        except Exception as e:
+            return {"error": str(e)}
     
-    return {
-        "gtm_scripts": gtm_script_count,
-        "gtm_noscripts": gtm_noscript_count,
-        "gtag_calls": gtag_count,
-        "ga4_references": ga4_id_count,
-        "is_clean": gtm_script_count == 1 and gtm_noscript_count == 1 and gtag_count == 0 and ga4_id_count == 0
-    }
+    counts = count_signals(content)
+    return dict(counts, is_clean=is_clean(counts))
 
 def main():
     """Main verification function."""
     print("=== GTM Deployment Verification ===")
     print()
     
-    # Find all HTML files
-    html_files = []
-    for root, dirs, files in os.walk("."):
-        dirs[:] = [d for d in dirs if d not in {'.git', 'node_modules', 'dist', 'build', '.next', 'out', 'tools'}]
-        for file in files:
-            if file.endswith('.html') and not file.startswith('.'):
-                html_files.append(Path(root) / file)
+    # Verdicts come from the cached compliance checker
+    report = check_site()
     
-    print(f"Verifying {len(html_files)} HTML files...")
+    print(f"Verifying {report['total']} HTML files...")
     print()
     
-    clean_files = 0
-    total_files = 0
+    clean_files = report['clean_files']
+    total_files = report['total']
     
-    for file_path in sorted(html_files):
-        total_files += 1
-        result = verify_file(file_path)
-        
+    for file_path, result in report['pages'].items():
         if "error" in result:
             print(f"❌ {file_path} - ERROR: {result['error']}")
         elif result["is_clean"]:
-            clean_files += 1
             print(f"✅ {file_path} - CLEAN")
         else:
             print(f"⚠️  {file_path} - ISSUES:")